@@ -7,7 +7,44 @@ applies each finding as a tracked change or comment in the source docx, and
 writes the result to an output docx.
 
 Usage:
-    python apply_copyedits.py <source.docx> <findings.jsonl> <output.docx>
+    python apply_copyedits.py <source.docx> <findings.jsonl> [...] <output.docx>
+        [--author NAME ...] [--deterministic] [--date YYYY-MM-DDTHH:MM:SSZ]
+        [--cache-dir DIR] [--workers N] [--journal edits.jsonl]
+        [--shared-comments first] [--max-bytes N] [--max-entries N] [--max-elements N]
+        [--match-seconds S] [--wall-seconds S]
+
+A .pptx source is handled by pptx_edits.py: the same findings format and
+matching, applied to slide and speaker-notes text (see that module).
+
+Several findings files (e.g. separate style, inclusive-language and factual
+passes, or several reviewers) are merged in one pass: every finding is
+matched against the original text, overlapping edits are reconciled (earlier
+files win), and each file's edits carry its --author name.
+
+--deterministic makes the output byte-reproducible: identical inputs give an
+identical .docx. Revision and comment dates come from --date, else from
+SOURCE_DATE_EPOCH, else a fixed 1980-01-01 timestamp; comment durableIds are
+derived from the input hashes; ZIP entries get fixed metadata. --cache-dir
+implies --deterministic and returns the stored output when the same source,
+findings and tool version were seen before.
+
+--shared-comments first groups tracked changes that share a rationale: the
+first in the document gets the full comment and the others none, so an
+edit-heavy document does not carry hundreds of identical comments.
+
+Budgets keep one pathological upload from stalling a batch worker.
+--max-bytes and --max-entries refuse a package whose directory declares too
+much, and stop extraction once the bytes or entries actually written pass
+the limit; --max-elements caps the XML elements parsed (a part past it is
+left as it is, unsearched); --match-seconds skips a finding whose search
+runs too long, even within one paragraph; --wall-seconds stops applying findings once the time
+is up. A run cut short still writes its output, reports what was skipped,
+and is not cached.
+
+--journal writes one JSON line per finding recording where it landed: its
+status, the part, paragraph index and w14:paraId of each edit, the
+character offsets in the original paragraph text, the revision and comment
+IDs assigned, and which search variant matched (see journal_entries).
 
 Requirements:
     - Python 3.8+
@@ -19,14 +56,23 @@ prefixes (it rewrites w:del to ns0:del, etc.), which causes Word to report
 "unreadable content." lxml preserves prefixes exactly.
 """
 
+import argparse
 import copy
+import difflib
+import hashlib
 import json
 import os
-import random
 import re
+import shutil
 import subprocess
 import sys
+import time
 import zipfile
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
 
 # ─── Ensure lxml is available ───────────────────────────────────────────────
 try:
@@ -50,6 +96,12 @@ XML_NS = "http://www.w3.org/XML/1998/namespace"
 AUTHOR = "Claude"
 RSID = "00AA0001"
 
+# Part of the result cache key; bump whenever output for the same inputs changes
+TOOL_VERSION = "2.5"
+
+# zlib level for written packages; 6 is zlib's default, and zipfile's
+DEFAULT_COMPRESS_LEVEL = 6
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  ENSURE COMMENTS.XML FILE EXISTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -116,7 +168,7 @@ def ensure_comments_infrastructure(work_dir, src_docx):
 #  PARSE FINDINGS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def parse_findings(findings_path):
+def parse_findings(findings_path, parts=None):
     """Parse a JSONL findings file into a list of dicts.
 
     Each line must be a valid JSON object with keys:
@@ -126,7 +178,18 @@ def parse_findings(findings_path):
         old_text    — (tracked_change) exact text to replace
         new_text    — (tracked_change) replacement text
         anchor_text — (comment_only) exact text to attach the comment to
+
+    Optional keys:
+        all_occurrences — true to apply the finding to every whole-word
+                          occurrence instead of only the first
+        part            — limit all_occurrences to one of `parts`: by default
+                          "document", "footnotes" or "endnotes"; a deck
+                          passes its own (see pptx_edits.DECK_PARTS)
+        section         — limit all_occurrences to the body section under
+                          the heading with this text
     """
+    if parts is None:
+        parts = tuple(n for n, _ in STORY_PARTS)
     findings = []
     with open(findings_path, "r", encoding="utf-8") as f:
         for i, line in enumerate(f, 1):
@@ -161,6 +224,13 @@ def parse_findings(findings_path):
                     print(f"  WARNING: line {i} comment_only missing anchor_text, skipping")
                     continue
 
+            if not isinstance(finding.get('all_occurrences', False), bool):
+                print(f"  WARNING: line {i} all_occurrences must be true or false, skipping")
+                continue
+            if finding.get('part') not in (None,) + tuple(parts):
+                print(f"  WARNING: line {i} unknown part '{finding['part']}', skipping")
+                continue
+
             findings.append(finding)
 
     return findings
@@ -198,20 +268,18 @@ def normalize_for_search(text):
     return variants
 
 
-def find_text_in_paragraph(para, search_text):
-    """Find runs containing search_text when concatenated.
+def build_text_map(para):
+    """Map the matchable text of a paragraph onto its runs.
 
-    Returns list of (run_element, text_element, local_start, local_end) or None.
-    Tries encoding variants if the literal text isn't found.
+    Returns (text_map, full_text), where text_map is a list of
+    (run_element, text_element, start, end) offsets into full_text. Runs
+    inside existing w:del/w:ins are skipped, and only the first w:t of each
+    run contributes text — this is exactly the text findings are matched
+    against, so every reader of the document should go through here.
     """
-    runs = para.findall(f'.//{{{W}}}r')
-    if not runs:
-        return None
-
-    # Build text map from runs NOT inside existing del/ins
     text_map = []
     pos = 0
-    for run in runs:
+    for run in para.findall(f'.//{{{W}}}r'):
         parent = run.getparent()
         if parent.tag in (f'{{{W}}}del', f'{{{W}}}ins'):
             continue
@@ -225,10 +293,28 @@ def find_text_in_paragraph(para, search_text):
     full_text = ''.join(
         t.text for _, t, _, _ in text_map if t is not None and t.text
     )
+    return text_map, full_text
+
+
+def paragraph_text(para):
+    """Return the matchable text of a paragraph (see build_text_map)."""
+    return build_text_map(para)[1]
+
+
+def find_text_in_paragraph(para, search_text, start=0):
+    """Find runs containing search_text when concatenated.
+
+    Returns list of (run_element, text_element, local_start, local_end) or None.
+    Tries encoding variants if the literal text isn't found. Only matches at
+    or after character offset `start` of the paragraph text are considered.
+    """
+    text_map, full_text = build_text_map(para)
+    if not text_map:
+        return None
 
     # Try the search text and its encoding variants
     for variant in normalize_for_search(search_text):
-        idx = full_text.find(variant)
+        idx = full_text.find(variant, start)
         if idx != -1:
             end_idx = idx + len(variant)
             affected = []
@@ -254,113 +340,251 @@ def set_space_preserve(elem):
         elem.set(f'{{{XML_NS}}}space', 'preserve')
 
 
-def apply_tracked_change(para, old_text, new_text, change_id, date):
-    """Insert w:del + w:ins into a paragraph, replacing old_text with new_text.
+# Word-level tokens: words, whitespace runs, and single punctuation marks
+DIFF_TOKEN_RE = re.compile(r'\w+|\s+|[^\w\s]')
+
 
-    Returns True on success, False if old_text not found.
+def diff_text(old, new):
+    """Token-level diff of old vs new, in character offsets.
+
+    Returns a list of (tag, i1, i2, j1, j2) opcodes as from difflib, where
+    i/j index into old/new. Whitespace-only stretches left unchanged between
+    two changes are folded into a single change, so "a b c" -> "x y z" is one
+    replacement rather than three interleaved with single spaces.
     """
-    affected = find_text_in_paragraph(para, old_text)
-    if affected is None:
-        return False
+    a = DIFF_TOKEN_RE.findall(old)
+    b = DIFF_TOKEN_RE.findall(new)
+    a_off = [0]
+    for tok in a:
+        a_off.append(a_off[-1] + len(tok))
+    b_off = [0]
+    for tok in b:
+        b_off.append(b_off[-1] + len(tok))
+
+    ops = [
+        [tag, a_off[i1], a_off[i2], b_off[j1], b_off[j2]]
+        for tag, i1, i2, j1, j2 in
+        difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+    ]
+
+    merged = []
+    for k, op in enumerate(ops):
+        fold = (
+            op[0] == 'equal'
+            and 0 < k < len(ops) - 1
+            and not old[op[1]:op[2]].strip()
+        )
+        if merged and merged[-1][0] != 'equal' and (op[0] != 'equal' or fold):
+            merged[-1][2] = op[2]
+            merged[-1][4] = op[4]
+        else:
+            merged.append(list(op))
+    for op in merged:
+        if op[0] != 'equal':
+            op[0] = ('insert' if op[1] == op[2]
+                     else 'delete' if op[3] == op[4] else 'replace')
+    return [tuple(op) for op in merged]
 
-    first_run = affected[0][0]
-    last_run = affected[-1][0]
-    rpr = get_run_props(first_run)
 
-    parent = first_run.getparent()
+def _run_piece(run, t_elem, text, keep_before, keep_after, deleted=False):
+    """Copy a run, keeping only `text` in its first w:t.
+
+    Children before/after the w:t (tabs, breaks, note references) are kept
+    only on the run's first/last piece so they are never duplicated.
+    Deleted pieces get w:delText instead of w:t.
+    """
+    piece = copy.deepcopy(run)
+    t_new = piece.find(f'{{{W}}}t')
+    children = list(piece)
+    t_pos = children.index(t_new)
+    for i, child in enumerate(children):
+        if child.tag == f'{{{W}}}rPr':
+            continue
+        if (i < t_pos and not keep_before) or (i > t_pos and not keep_after):
+            piece.remove(child)
+    t_new.text = text
+    set_space_preserve(t_new)
+    if deleted:
+        for t in piece.iter(f'{{{W}}}t'):
+            t.tag = f'{{{W}}}delText'
+        for instr in piece.iter(f'{{{W}}}instrText'):
+            instr.tag = f'{{{W}}}delInstrText'
+        piece.set(f'{{{W}}}rsidDel', RSID)
+    return piece
+
+
+def apply_tracked_change(para, old_text, new_text, change_id, date, start=0,
+                         author=AUTHOR):
+    """Replace old_text with new_text in a paragraph as tracked changes.
+
+    Only the tokens that differ are wrapped in w:del/w:ins; unchanged context
+    stays as ordinary runs with its original formatting. Revision IDs are
+    assigned sequentially from change_id and attributed to `author`.
+
+    Returns the list of revision IDs used (in document order), or None if
+    old_text was not found or the matched text already equals new_text.
+    `start` is passed to find_text_in_paragraph to target a later occurrence.
+    """
+    affected = find_text_in_paragraph(para, old_text, start)
+    if affected is None:
+        return None
 
-    # If parent is not w:p (e.g., w:hyperlink), move the edit to the grandparent
-    # paragraph. OOXML requires del/ins as children of w:p.
-    target_parent = parent
-    if parent.tag != f'{{{W}}}p':
-        grandparent = parent.getparent()
-        if grandparent is not None and grandparent.tag == f'{{{W}}}p':
-            target_parent = grandparent
-        # If nested deeper, we still try — Word may tolerate it in some cases
-
-    insert_pos = list(target_parent).index(
-        first_run if target_parent is parent else parent
+    # Diff the text actually in the document (old_text may have matched
+    # through a dash or quote variant)
+    spans = []
+    pos = 0
+    for run, t_elem, ls, le in affected:
+        length = le - ls if t_elem is not None and t_elem.text else 0
+        spans.append((run, t_elem, ls, le, pos, pos + length))
+        pos += length
+    doc_text = ''.join(
+        t.text[ls:le] for _, t, ls, le, _, _ in spans if t is not None and t.text
     )
+    ops = diff_text(doc_text, new_text)
+    if all(op[0] == 'equal' for op in ops):
+        return None
 
-    new_elements = []
+    # The revisions replace the runs in place, inside the first run's own
+    # container: w:ins/w:del are legal in w:hyperlink, w:smartTag and
+    # w:sdtContent as well as w:p, and moving them out would reorder text
+    first_run = affected[0][0]
+    parent = first_run.getparent()
+    insert_pos = list(parent).index(first_run)
+
+    # ── Cut every run into pieces at the diff boundaries ──
+    # items: (key, run, t_elem, text) in document order, where key is the
+    # opcode index, or 'pre'/'post' for run text outside the matched span.
+    # Runs with no matchable text (tabs, note references) have t_elem None.
+    items = []
+    for run, t_elem, ls, le, gs, ge in spans:
+        if gs == ge:
+            k = next(k for k, op in enumerate(ops) if op[1] <= gs < op[2])
+            items.append((k, run, None, None))
+            continue
+        if ls > 0:
+            items.append(('pre', run, t_elem, t_elem.text[:ls]))
+        for k, (_, i1, i2, _, _) in enumerate(ops):
+            a, b = max(gs, i1), min(ge, i2)
+            if a < b:
+                items.append((k, run, t_elem, t_elem.text[ls + a - gs:ls + b - gs]))
+        if le < len(t_elem.text):
+            items.append(('post', run, t_elem, t_elem.text[le:]))
+
+    def run_at(offset):
+        """The run holding the character at offset in doc_text."""
+        for run, _, _, _, gs, ge in spans:
+            if gs <= offset < ge:
+                return run
+        return first_run
+
+    # ── Plan the replacement sequence ──
+    # ('keep', run, t_elem, text) — unchanged text, as a piece of its run
+    # ('move', run)               — a non-text run, moved as-is
+    # ('del', [(run, t_elem, text), ...]) / ('ins', rPr, text)
+    plan = [('keep', r, t, text) for key, r, t, text in items if key == 'pre']
+    for k, (tag, i1, i2, j1, j2) in enumerate(ops):
+        op_items = [item for item in items if item[0] == k]
+        if tag == 'equal':
+            for _, run, t_elem, text in op_items:
+                plan.append(('move', run) if t_elem is None
+                            else ('keep', run, t_elem, text))
+            continue
+        # Non-text runs inside a deleted stretch stay, just outside the w:del
+        plan.extend(('move', run) for _, run, t_elem, _ in op_items if t_elem is None)
+        if tag in ('delete', 'replace'):
+            plan.append(('del', [(run, t_elem, text) for _, run, t_elem, text in op_items
+                                 if t_elem is not None]))
+        if tag in ('insert', 'replace'):
+            # Inserted text takes the formatting of the text it replaces, or
+            # of the text just before a pure insertion
+            source = run_at(i1 if tag == 'replace' else max(i1 - 1, 0))
+            plan.append(('ins', get_run_props(source), new_text[j1:j2]))
+    plan.extend(('keep', r, t, text) for key, r, t, text in items if key == 'post')
+
+    # Adjacent unchanged pieces of the same run become a single run again
+    merged = []
+    for step in plan:
+        if (step[0] == 'keep' and merged and merged[-1][0] == 'keep'
+                and merged[-1][1] is step[1]):
+            merged[-1] = ('keep', step[1], step[2], merged[-1][3] + step[3])
+        else:
+            merged.append(step)
+
+    total = {}
+    for step in merged:
+        if step[0] == 'keep':
+            pieces = [step[1:]]
+        elif step[0] == 'del':
+            pieces = step[1]
+        else:
+            continue
+        for run, _, _ in pieces:
+            total[id(run)] = total.get(id(run), 0) + 1
+    emitted = {}
+
+    def make_piece(run, t_elem, text, deleted=False):
+        n = emitted.get(id(run), 0)
+        emitted[id(run)] = n + 1
+        return _run_piece(run, t_elem, text, n == 0, n == total[id(run)] - 1, deleted)
+
+    def revision(tag, rev_id):
+        elem = etree.Element(f'{{{W}}}{tag}')
+        elem.set(f'{{{W}}}id', str(rev_id))
+        elem.set(f'{{{W}}}author', author)
+        elem.set(f'{{{W}}}date', date)
+        return elem
 
-    # ── Prefix run (text before the match in the first run) ──
-    first_t = affected[0][1]
-    prefix_offset = affected[0][2]
-    if prefix_offset > 0 and first_t is not None and first_t.text:
-        prefix_run = copy.deepcopy(first_run)
-        pt = prefix_run.find(f'{{{W}}}t')
-        pt.text = first_t.text[:prefix_offset]
-        set_space_preserve(pt)
-        new_elements.append(prefix_run)
-
-    # ── w:del ──
-    del_elem = etree.Element(f'{{{W}}}del')
-    del_elem.set(f'{{{W}}}id', str(change_id))
-    del_elem.set(f'{{{W}}}author', AUTHOR)
-    del_elem.set(f'{{{W}}}date', date)
-
-    del_run = etree.SubElement(del_elem, f'{{{W}}}r')
-    if rpr is not None:
-        del_run.append(copy.deepcopy(rpr))
-    del_run.set(f'{{{W}}}rsidDel', RSID)
-    del_text = etree.SubElement(del_run, f'{{{W}}}delText')
-    del_text.text = old_text
-    set_space_preserve(del_text)
-    new_elements.append(del_elem)
-
-    # ── w:ins ──
-    ins_elem = etree.Element(f'{{{W}}}ins')
-    ins_elem.set(f'{{{W}}}id', str(change_id + 1))
-    ins_elem.set(f'{{{W}}}author', AUTHOR)
-    ins_elem.set(f'{{{W}}}date', date)
-
-    ins_run = etree.SubElement(ins_elem, f'{{{W}}}r')
-    if rpr is not None:
-        ins_run.append(copy.deepcopy(rpr))
-    ins_run.set(f'{{{W}}}rsidR', RSID)
-    ins_text = etree.SubElement(ins_run, f'{{{W}}}t')
-    ins_text.text = new_text
-    set_space_preserve(ins_text)
-    new_elements.append(ins_elem)
-
-    # ── Suffix run (text after the match in the last run) ──
-    last_t = affected[-1][1]
-    suffix_offset = affected[-1][3]
-    if last_t is not None and last_t.text and suffix_offset < len(last_t.text):
-        suffix_run = copy.deepcopy(last_run)
-        st = suffix_run.find(f'{{{W}}}t')
-        st.text = last_t.text[suffix_offset:]
-        set_space_preserve(st)
-        new_elements.append(suffix_run)
+    new_elements = []
+    ids = []
+    for step in merged:
+        if step[0] == 'keep':
+            new_elements.append(make_piece(*step[1:]))
+        elif step[0] == 'move':
+            new_elements.append(step[1])
+        elif step[0] == 'del':
+            del_elem = revision('del', change_id + len(ids))
+            ids.append(change_id + len(ids))
+            for run, t_elem, text in step[1]:
+                del_elem.append(make_piece(run, t_elem, text, deleted=True))
+            new_elements.append(del_elem)
+        else:
+            ins_elem = revision('ins', change_id + len(ids))
+            ids.append(change_id + len(ids))
+            ins_run = etree.SubElement(ins_elem, f'{{{W}}}r')
+            if step[1] is not None:
+                ins_run.append(step[1])
+            ins_run.set(f'{{{W}}}rsidR', RSID)
+            ins_text = etree.SubElement(ins_run, f'{{{W}}}t')
+            ins_text.text = step[2]
+            set_space_preserve(ins_text)
+            new_elements.append(ins_elem)
 
     # ── Remove original runs and insert new elements ──
-    if target_parent is parent:
-        # Normal case: runs are direct children of w:p
-        for run, _, _, _ in affected:
-            parent.remove(run)
-        for i, elem in enumerate(new_elements):
-            target_parent.insert(insert_pos + i, elem)
-    else:
-        # Runs were inside a container (e.g., w:hyperlink).
-        # Remove the runs from the container, move del/ins to the paragraph.
-        for run, _, _, _ in affected:
-            parent.remove(run)
-        for i, elem in enumerate(new_elements):
-            target_parent.insert(insert_pos + 1 + i, elem)
+    for run, _, _, _, _, _ in spans:
+        run.getparent().remove(run)
+    for i, elem in enumerate(new_elements):
+        parent.insert(insert_pos + i, elem)
 
-    return True
+    return ids
 
 
-def add_comment_anchor(para, anchor_text, comment_id):
+def add_comment_anchor(para, anchor_text, comment_id, start=0):
     """Wrap anchor_text in commentRangeStart/End + commentReference."""
-    affected = find_text_in_paragraph(para, anchor_text)
+    affected = find_text_in_paragraph(para, anchor_text, start)
     if affected is None:
         return False
 
     first_run = affected[0][0]
     last_run = affected[-1][0]
     parent = first_run.getparent()
+    if last_run.getparent() is not parent:
+        # The anchor straddles a container (e.g. ends inside a hyperlink):
+        # put the markers around the paragraph-level elements holding it
+        while first_run.getparent() is not para:
+            first_run = first_run.getparent()
+        while last_run.getparent() is not para:
+            last_run = last_run.getparent()
+        parent = para
 
     start_pos = list(parent).index(first_run)
     crs = etree.Element(f'{{{W}}}commentRangeStart')
@@ -383,28 +607,32 @@ def add_comment_anchor(para, anchor_text, comment_id):
     return True
 
 
-def add_comment_anchor_around_change(para, del_id, ins_id, comment_id):
-    """Add comment anchors wrapping an existing del/ins pair in a paragraph."""
-    del_elem = None
-    ins_elem = None
-    for child in para:
-        if child.tag == f'{{{W}}}del' and child.get(f'{{{W}}}id') == str(del_id):
-            del_elem = child
-        if child.tag == f'{{{W}}}ins' and child.get(f'{{{W}}}id') == str(ins_id):
-            ins_elem = child
+def find_revision(para, rev_id):
+    """Return the w:del or w:ins in para (at any depth) with the given w:id, or None."""
+    for elem in para.iter(f'{{{W}}}del', f'{{{W}}}ins'):
+        if elem.get(f'{{{W}}}id') == str(rev_id):
+            return elem
+    return None
+
 
-    if del_elem is None or ins_elem is None:
+def add_comment_anchor_around_change(para, first_id, last_id, comment_id):
+    """Add comment anchors spanning the revisions first_id..last_id in a paragraph."""
+    first_elem = find_revision(para, first_id)
+    last_elem = find_revision(para, last_id)
+    if first_elem is None or last_elem is None:
         return False
+    # apply_tracked_change puts all revisions of one edit in one container
+    parent = first_elem.getparent()
 
-    del_pos = list(para).index(del_elem)
+    first_pos = list(parent).index(first_elem)
     crs = etree.Element(f'{{{W}}}commentRangeStart')
     crs.set(f'{{{W}}}id', str(comment_id))
-    para.insert(del_pos, crs)
+    parent.insert(first_pos, crs)
 
-    ins_pos = list(para).index(ins_elem)
+    last_pos = list(parent).index(last_elem)
     cre = etree.Element(f'{{{W}}}commentRangeEnd')
     cre.set(f'{{{W}}}id', str(comment_id))
-    para.insert(ins_pos + 1, cre)
+    parent.insert(last_pos + 1, cre)
 
     ref_run = etree.Element(f'{{{W}}}r')
     ref_rpr = etree.SubElement(ref_run, f'{{{W}}}rPr')
@@ -412,18 +640,23 @@ def add_comment_anchor_around_change(para, del_id, ins_id, comment_id):
     ref_style.set(f'{{{W}}}val', 'CommentReference')
     cref = etree.SubElement(ref_run, f'{{{W}}}commentReference')
     cref.set(f'{{{W}}}id', str(comment_id))
-    para.insert(ins_pos + 2, ref_run)
+    parent.insert(last_pos + 2, ref_run)
 
     return True
 
 
-def create_comment_element(comment_id, date, text):
+def author_initials(author):
+    """Initials shown on a comment: first letters of up to three words."""
+    return ''.join(w[0] for w in author.split())[:3].upper()
+
+
+def create_comment_element(comment_id, date, text, author=AUTHOR):
     """Build a <w:comment> element for comments.xml."""
     comment = etree.Element(f'{{{W}}}comment')
     comment.set(f'{{{W}}}id', str(comment_id))
-    comment.set(f'{{{W}}}author', AUTHOR)
+    comment.set(f'{{{W}}}author', author)
     comment.set(f'{{{W}}}date', date)
-    comment.set(f'{{{W}}}initials', 'C')
+    comment.set(f'{{{W}}}initials', author_initials(author))
 
     p = etree.SubElement(comment, f'{{{W}}}p')
     p.set(f'{{{W14}}}paraId', format(0x80000000 + comment_id, '08X'))
@@ -447,66 +680,1324 @@ def create_comment_element(comment_id, date, text):
     return comment
 
 
+SHARED_COMMENT_MODES = ('first',)
+
+
+def share_rationales(changes, mode):
+    """Plan the rationale comments of tracked changes that repeat one.
+
+    changes are applied change edits with a comment, in document order.
+    Changes by the same author whose findings give the same rationale form
+    a group (an all_occurrences note on one of them does not split it). The
+    first of a group gets the full comment, noting how many later changes
+    it covers, and the rest get none, so comments.xml and its sidecar parts
+    grow with the number of distinct rationales, not of changes. mode is
+    one of SHARED_COMMENT_MODES.
+
+    Returns [(edit, text, leader)] in document order: text is the comment
+    to add (None for none) and leader the first edit of the group.
+    """
+    def rationale(edit):
+        return edit['author'], edit['result']['finding']['comment']
+
+    groups = {}
+    for edit in changes:
+        groups.setdefault(rationale(edit), []).append(edit)
+    plan = []
+    for edit in changes:
+        group = groups[rationale(edit)]
+        leader = group[0]
+        text = None
+        if edit is leader:
+            text = edit['comment']
+            if len(group) > 1:
+                more = len(group) - 1
+                text += f" (Also covers {more} later change{'s' if more > 1 else ''} like this one.)"
+        plan.append((edit, text, leader))
+    return plan
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  DOCUMENT INDEX
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Parts searched for findings, in search order. The short name is used in
+# paragraph locators such as "document:41" (the 42nd w:p in document.xml).
+STORY_PARTS = [
+    ('document', 'word/document.xml'),
+    ('footnotes', 'word/footnotes.xml'),
+    ('endnotes', 'word/endnotes.xml'),
+]
+
+HEADING_STYLE_RE = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
+
+
+def heading_styles(styles_root):
+    """Map paragraph styleIds to heading levels (Title = 0, Heading N = N)."""
+    levels = {}
+    if styles_root is None:
+        return levels
+    for style in styles_root.findall(f'{{{W}}}style'):
+        if style.get(f'{{{W}}}type') != 'paragraph':
+            continue
+        style_id = style.get(f'{{{W}}}styleId', '')
+        name_elem = style.find(f'{{{W}}}name')
+        name = name_elem.get(f'{{{W}}}val', '') if name_elem is not None else ''
+        m = HEADING_STYLE_RE.match(name) or HEADING_STYLE_RE.match(style_id)
+        if m:
+            levels[style_id] = int(m.group(1))
+        elif name.lower() == 'title' or style_id == 'Title':
+            levels[style_id] = 0
+    return levels
+
+
+def heading_level(para, styles):
+    """Return the heading level of a paragraph, or None for body text.
+
+    Uses the paragraph style (resolved through heading_styles) and falls back
+    to direct w:outlineLvl formatting.
+    """
+    ppr = para.find(f'{{{W}}}pPr')
+    if ppr is None:
+        return None
+    pstyle = ppr.find(f'{{{W}}}pStyle')
+    if pstyle is not None:
+        level = styles.get(pstyle.get(f'{{{W}}}val', ''))
+        if level is not None:
+            return level
+    outline = ppr.find(f'{{{W}}}outlineLvl')
+    if outline is not None:
+        try:
+            level = int(outline.get(f'{{{W}}}val', '9'))
+        except ValueError:
+            return None
+        # Level 9 means "body text" in OOXML
+        return level + 1 if level < 9 else None
+    return None
+
+
+def build_outline(paragraphs):
+    """Outline index of a read_story_paragraphs() list, in one pass.
+
+    Returns one dict per heading of the document part, in document order:
+        para   — index of the heading in paragraphs
+        level  — heading level (Title = 0)
+        text   — heading text
+        number — outline numbering label, if the paragraphs carry one
+        end    — index just past the heading's section, which runs up to
+                 the next heading at the same or a higher level
+        parent — outline position of the enclosing heading, or None
+    Only the part, text and level of each paragraph are read.
+    """
+    outline = []
+    open_sections = []
+    for i, para in enumerate(paragraphs):
+        if para['part'] != 'document':
+            # Notes follow the body; they are in no section
+            for n in open_sections:
+                outline[n]['end'] = i
+            open_sections = []
+            continue
+        level = para['level']
+        if level is None:
+            continue
+        while open_sections and outline[open_sections[-1]]['level'] >= level:
+            outline[open_sections.pop()]['end'] = i
+        outline.append({
+            'para': i,
+            'level': level,
+            'text': para['text'],
+            'number': para.get('number'),
+            'end': None,
+            'parent': open_sections[-1] if open_sections else None,
+        })
+        open_sections.append(len(outline) - 1)
+    for n in open_sections:
+        outline[n]['end'] = len(paragraphs)
+    return outline
+
+
+def section_indices(outline, heading):
+    """Paragraph indices of every section headed by `heading`.
+
+    Headings match ignoring case and surrounding space; a section includes
+    its heading and subsections.
+    """
+    wanted = heading.strip().lower()
+    selected = set()
+    for entry in outline:
+        if entry['text'].strip().lower() == wanted:
+            selected.update(range(entry['para'], entry['end']))
+    return sorted(selected)
+
+
+def heading_path(outline, index):
+    """Texts of the headings whose sections contain paragraph `index`,
+    outermost first."""
+    path = []
+    n = next((n for n in range(len(outline) - 1, -1, -1)
+              if outline[n]['para'] <= index < outline[n]['end']), None)
+    while n is not None:
+        path.append(outline[n]['text'].strip())
+        n = outline[n]['parent']
+    return path[::-1]
+
+
+def body_outline(paras, styles):
+    """build_outline() of the body's w:p elements, in one pass.
+
+    Only heading paragraphs have their text read; the entry indices are
+    positions in paras.
+    """
+    entries = []
+    for para in paras:
+        level = heading_level(para, styles)
+        entries.append({'part': 'document', 'level': level,
+                        'text': paragraph_text(para) if level is not None else ''})
+    return build_outline(entries)
+
+
+def search_patterns(search_text, whole_word=False):
+    """Compile search_text and its encoding variants (see normalize_for_search).
+
+    With whole_word, a match may not start or end inside a word — only where
+    the text itself starts/ends with a word character.
+    """
+    patterns = []
+    for variant in normalize_for_search(search_text):
+        pattern = re.escape(variant)
+        if whole_word and re.match(r'\w', variant):
+            pattern = r'(?<!\w)' + pattern
+        if whole_word and re.search(r'\w$', variant):
+            pattern += r'(?!\w)'
+        patterns.append((variant, re.compile(pattern)))
+    return patterns
+
+
+def find_in_text(text, patterns, deadline=None):
+    """Non-overlapping (start, matched_text) hits of any pattern, in order.
+
+    With a deadline (a time.time() value), gives up between matches once it
+    has passed and returns None, so one huge paragraph cannot overrun it.
+    """
+    found = []
+    for variant, pattern in patterns:
+        if variant not in text:
+            continue
+        for m in pattern.finditer(text):
+            if deadline is not None and time.time() > deadline:
+                return None
+            found.append((m.start(), m.group()))
+    hits = []
+    last_end = 0
+    for start, matched in sorted(found):
+        if start >= last_end:
+            hits.append((start, matched))
+            last_end = start + len(matched)
+    return hits
+
+
+def find_all_occurrences(paras, search_text):
+    """Find every whole-word occurrence of search_text in a list of paragraphs.
+
+    Encoding variants (see normalize_for_search) are matched too. Returns
+    (para, start, matched_text) tuples in document order; occurrences within
+    a paragraph never overlap.
+    """
+    patterns = search_patterns(search_text, whole_word=True)
+    return [
+        (para, start, matched)
+        for para in paras
+        for start, matched in find_in_text(paragraph_text(para), patterns)
+    ]
+
+
+def is_toc_entry(para):
+    """True for a table-of-contents line.
+
+    Either the paragraph has a TOC style, or it is an internal hyperlink
+    whose last run is a tab and a page number (tables of contents written
+    by Google Docs and older Word templates carry no style).
+    """
+    style = para.find(f'{{{W}}}pPr/{{{W}}}pStyle')
+    if style is not None and style.get(f'{{{W}}}val', '').upper().startswith('TOC'):
+        return True
+    link = para.find(f'{{{W}}}hyperlink')
+    if link is None or link.get(f'{{{W}}}anchor') is None:
+        return False
+    runs = link.findall(f'{{{W}}}r')
+    if not runs or runs[-1].find(f'{{{W}}}tab') is None:
+        return False
+    t = runs[-1].find(f'{{{W}}}t')
+    return t is not None and (t.text or '').strip().isdigit()
+
+
+def toc_paragraphs(paras):
+    """Indices of the table-of-contents lines among a part's w:p elements.
+
+    A line is one by is_toc_entry(), or because it shows text from the
+    result of a TOC field, which is how Word generates tables of contents
+    whatever their styles. paras must be in document order.
+    """
+    found = set()
+    fields = []  # one flag per open field: is it a TOC field?
+    for i, para in enumerate(paras):
+        for node in para.iter(f'{{{W}}}fldChar', f'{{{W}}}instrText', f'{{{W}}}t'):
+            if node.tag == f'{{{W}}}fldChar':
+                kind = node.get(f'{{{W}}}fldCharType')
+                if kind == 'begin':
+                    fields.append(False)
+                elif kind == 'end' and fields:
+                    fields.pop()
+            elif node.tag == f'{{{W}}}instrText':
+                if fields and (node.text or '').strip().upper().startswith('TOC'):
+                    fields[-1] = True
+            elif node.text and any(fields):
+                found.add(i)
+        if i not in found and is_toc_entry(para):
+            found.add(i)
+    return found
+
+
+def read_story_paragraphs(docx_path):
+    """Read every paragraph of the story parts straight from a docx.
+
+    Returns a list of dicts with keys:
+        locator — "<part>:<index>", index counting all w:p in the part
+        part    — short part name from STORY_PARTS
+        text    — matchable paragraph text (see build_text_map)
+        level   — heading level, or None for body text
+        toc     — True for a table-of-contents line (see toc_paragraphs)
+    Paragraphs are returned in document order, parts in STORY_PARTS order.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    paragraphs = []
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        styles_root = None
+        if 'word/styles.xml' in names:
+            styles_root = etree.fromstring(z.read('word/styles.xml'), parser)
+        styles = heading_styles(styles_root)
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            paras = list(root.iter(f'{{{W}}}p'))
+            toc = toc_paragraphs(paras)
+            for i, para in enumerate(paras):
+                paragraphs.append({
+                    'locator': f'{part}:{i}',
+                    'part': part,
+                    'text': paragraph_text(para),
+                    'level': heading_level(para, styles),
+                    'toc': i in toc,
+                })
+    return paragraphs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BUILD FINDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Template and boilerplate sections the SKILL says never to edit
+PROTECTED_SECTIONS = (
+    'acknowledgments', 'acknowledgements', 'about bellwether',
+    'about the authors', 'creative commons',
+)
+
+
+def reviewable_paragraphs(paragraphs):
+    """Drop protected sections from a read_story_paragraphs() list.
+
+    Returns (index, paragraph) pairs, index being the position in the input
+    list, for every non-empty paragraph outside a protected section.
+    """
+    protected = set()
+    for entry in build_outline(paragraphs):
+        if entry['text'].strip().lower() in PROTECTED_SECTIONS:
+            protected.update(range(entry['para'], entry['end']))
+    return [(i, para) for i, para in enumerate(paragraphs)
+            if i not in protected and para['text'].strip()]
+
+
+def expand_to_words(text, start, end, words):
+    """Widen text[start:end] by up to `words` whole words on each side."""
+    if words <= 0:
+        return start, end
+    left = [m.start() for m in re.finditer(r'\S+', text[:start])]
+    new_start = left[-words] if len(left) >= words else 0
+    right = [m.end() for m in re.finditer(r'\S+', text[end:])]
+    new_end = end + right[words - 1] if len(right) >= words else len(text)
+    return new_start, new_end
+
+
+def unique_span(text, start, end, corpus, words):
+    """Widen a span by context words until it occurs only once in corpus.
+
+    corpus is the text of every paragraph joined with newlines. The span
+    stops growing at the paragraph edges, even if still not unique.
+    """
+    while True:
+        span_start, span_end = expand_to_words(text, start, end, words)
+        if corpus.count(text[span_start:span_end]) <= 1:
+            return span_start, span_end
+        if span_start == 0 and span_end == len(text):
+            return span_start, span_end
+        words += 2
+
+
+def build_findings(paragraphs, matches, context_words=2):
+    """Turn raw matches into findings records in the findings.jsonl schema.
+
+    paragraphs — list from read_story_paragraphs()
+    matches    — dicts with keys:
+                   para     — index into paragraphs
+                   start/end — character span of the issue in the paragraph
+                   new      — replacement for the span (tracked change), or
+                              None for a comment-only finding
+                   category, comment
+    Tracked changes get `context_words` words of context on each side,
+    widened until the old_text is unique in the document; matches whose
+    context overlaps are combined into one finding so no two findings touch
+    the same text. Comment-only anchors are the bare span when unique.
+    Findings are returned in document order, comments before the edits of
+    the same paragraph.
+    """
+    corpus = '\n'.join(p['text'] for p in paragraphs)
+    by_para = {}
+    for m in matches:
+        by_para.setdefault(m['para'], []).append(m)
+
+    findings = []
+    for pi in sorted(by_para):
+        text = paragraphs[pi]['text']
+        para_matches = sorted(by_para[pi], key=lambda m: (m['start'], m['end']))
+
+        for m in para_matches:
+            if m['new'] is not None:
+                continue
+            a, b = unique_span(text, m['start'], m['end'], corpus, 0)
+            findings.append({
+                'anchor_text': text[a:b],
+                'type': 'comment_only',
+                'category': m['category'],
+                'comment': m['comment'],
+            })
+
+        clusters = []
+        for m in para_matches:
+            if m['new'] is None:
+                continue
+            a, b = unique_span(text, m['start'], m['end'], corpus, context_words)
+            if clusters and a < clusters[-1]['end']:
+                last = clusters[-1]
+                if m['start'] < last['matches'][-1]['end']:
+                    continue  # two rules claim the same characters; keep the first
+                last['end'] = max(last['end'], b)
+                last['matches'].append(m)
+            else:
+                clusters.append({'start': a, 'end': b, 'matches': [m]})
+
+        for cluster in clusters:
+            old = text[cluster['start']:cluster['end']]
+            new = []
+            pos = cluster['start']
+            for m in cluster['matches']:
+                new.append(text[pos:m['start']])
+                new.append(m['new'])
+                pos = m['end']
+            new.append(text[pos:cluster['end']])
+            comments = []
+            for m in cluster['matches']:
+                if m['comment'] not in comments:
+                    comments.append(m['comment'])
+            findings.append({
+                'old_text': old,
+                'new_text': ''.join(new),
+                'type': 'tracked_change',
+                'category': cluster['matches'][0]['category'],
+                'comment': ' '.join(comments),
+            })
+    return findings
+
+
+def write_findings(findings, findings_path, append=False):
+    """Write findings as JSONL, one object per line."""
+    with open(findings_path, "a" if append else "w", encoding="utf-8") as f:
+        for finding in findings:
+            f.write(json.dumps(finding, ensure_ascii=False) + "\n")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RESOLVE FINDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def change_span(matched, new_text):
+    """The part of a replacement that actually changes.
+
+    Returns (a, b, new_sub): matched[a:b] becomes new_sub, with unchanged
+    context on either side trimmed off. A pure insertion keeps one
+    neighbouring token so the span is never empty. Returns None if matched
+    already reads new_text.
+    """
+    ops = [op for op in diff_text(matched, new_text) if op[0] != 'equal']
+    if not ops:
+        return None
+    a, b, j1, j2 = ops[0][1], ops[-1][2], ops[0][3], ops[-1][4]
+    if a == b:
+        tokens = [m.span() for m in DIFF_TOKEN_RE.finditer(matched)]
+        if a > 0:
+            before = next(ts for ts, te in tokens if te == a)
+            j1 -= a - before
+            a = before
+        else:
+            after = tokens[0][1]
+            j2 += after
+            b = after
+    return a, b, new_text[j1:j2]
+
+
+# Below this many findings a process pool costs more than it saves
+PARALLEL_MIN_FINDINGS = 500
+
+
+def find_hits(texts, target, whole_word=False, indices=None, deadline=None):
+    """Every non-overlapping (para index, start, matched_text) hit of target.
+
+    indices limits the search to those paragraphs (None = all). With a
+    deadline (a time.time() value), the search gives up between paragraphs
+    and between matches once it has passed, and returns None.
+    """
+    patterns = search_patterns(target, whole_word)
+    if indices is None:
+        indices = range(len(texts))
+    hits = []
+    for pi in indices:
+        if deadline is not None and time.time() > deadline:
+            return None
+        found = find_in_text(texts[pi], patterns, deadline)
+        if found is None:
+            return None
+        hits.extend((pi, start, matched) for start, matched in found)
+    return hits
+
+
+def export_texts(texts):
+    """Copy paragraph texts into a shared memory block.
+
+    Layout: paragraph count (int64), then count + 1 byte offsets (int64),
+    then the UTF-8 texts back to back. The caller must close() and unlink()
+    the returned block.
+    """
+    data = [t.encode('utf-8') for t in texts]
+    offsets = array('q', [0])
+    for d in data:
+        offsets.append(offsets[-1] + len(d))
+    header = array('q', [len(texts)]).tobytes() + offsets.tobytes()
+    block = shared_memory.SharedMemory(create=True, size=max(len(header) + offsets[-1], 1))
+    block.buf[:len(header)] = header
+    block.buf[len(header):len(header) + offsets[-1]] = b''.join(data)
+    return block
+
+
+def import_texts(name):
+    """Read paragraph texts back from a block written by export_texts."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        count = array('q', bytes(block.buf[:8]))[0]
+        offsets = array('q', bytes(block.buf[8:8 * (count + 2)]))
+        base = 8 * (count + 2)
+        raw = bytes(block.buf[base:base + offsets[-1]])
+    finally:
+        block.close()
+    return [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+
+
+_worker_texts = None
+
+
+def _init_match_worker(name):
+    global _worker_texts
+    _worker_texts = import_texts(name)
+
+
+def _timed_hits(texts, job, limits):
+    """find_hits for one job under limits (see Budget.limits)."""
+    seconds, wall_deadline = limits
+    deadlines = [d for d in (time.time() + seconds if seconds is not None else None,
+                             wall_deadline)
+                 if d is not None]
+    return find_hits(texts, *job, deadline=min(deadlines) if deadlines else None)
+
+
+def _match_chunk(chunk):
+    jobs, limits = chunk
+    return [_timed_hits(_worker_texts, job, limits) for job in jobs]
+
+
+def match_findings(texts, jobs, workers=1, limits=(None, None)):
+    """Run find_hits for each (target, whole_word, indices) job.
+
+    With several workers and enough jobs, the paragraph texts are exported
+    once to shared memory and the jobs are split across worker processes;
+    otherwise everything runs here. Results are in job order either way;
+    a job cut off by limits (seconds per job, wall deadline) gives None.
+    """
+    if workers <= 1 or len(jobs) < PARALLEL_MIN_FINDINGS:
+        return [_timed_hits(texts, job, limits) for job in jobs]
+    block = export_texts(texts)
+    try:
+        # A few chunks per worker evens out uneven finding costs
+        size = -(-len(jobs) // (workers * 4))
+        chunks = [(jobs[i:i + size], limits) for i in range(0, len(jobs), size)]
+        with ProcessPoolExecutor(workers, initializer=_init_match_worker,
+                                 initargs=(block.name,)) as pool:
+            return [hits for chunk in pool.map(_match_chunk, chunks) for hits in chunk]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def resolve_findings(texts, batches, scope, workers=1, budget=None):
+    """Locate every finding in the original text before anything is changed.
+
+    texts   — matchable text of every searchable paragraph, in search order
+    batches — [(author, findings)]; earlier batches win overlapping edits
+    scope   — function(finding) returning the paragraph indices to search,
+              or None for all paragraphs
+    workers — processes for the match phase (see match_findings)
+    budget  — a Budget whose match time and wall-time limits apply; a
+              finding cut off by them is skipped, with the reason
+
+    Tracked changes claim only the characters they change, so two findings
+    may share context. A finding whose changed span overlaps an earlier claim
+    moves on to its next occurrence; if there is none, an identical claim
+    makes it a duplicate and a different one a conflict, which is kept as a
+    comment suggesting the edit.
+
+    Returns (edits, results). Each edit is a dict with keys kind ('change' or
+    'comment'), para, start, old, new, comment, author, matched (the whole
+    occurrence found) and result; edits do not overlap and carry
+    original-text offsets. Each result is a dict with
+    keys author, finding, status ('applied', 'duplicate', 'conflict',
+    'skipped' or 'failed'), edits and, when skipped, reason.
+    """
+    claimed = {}  # para index -> [(start, end, new_sub)]
+    edits = []
+    results = []
+
+    def add_edit(result, kind, pi, start, old, new, comment, matched):
+        edit = {'kind': kind, 'para': pi, 'start': start, 'old': old, 'new': new,
+                'comment': comment, 'author': result['author'], 'matched': matched,
+                'result': result}
+        result['edits'].append(edit)
+        edits.append(edit)
+
+    # Matching only reads the original text, so it can run in parallel;
+    # claiming spans below is order-dependent and stays sequential
+    jobs = [
+        (finding['old_text' if finding['type'] == 'tracked_change' else 'anchor_text'],
+         finding.get('all_occurrences', False), scope(finding))
+        for _, findings in batches for finding in findings
+    ]
+    limits = budget.limits if budget is not None else (None, None)
+    all_hits = iter(match_findings(texts, jobs, workers, limits))
+
+    for author, findings in batches:
+        for finding in findings:
+            result = {'author': author, 'finding': finding, 'status': 'failed', 'edits': []}
+            results.append(result)
+            is_change = finding['type'] == 'tracked_change'
+            every = finding.get('all_occurrences', False)
+            hits = next(all_hits)
+            if hits is None:
+                result['status'] = 'skipped'
+                result['reason'] = budget.match_reason()
+                continue
+
+            if not is_change:
+                for pi, start, matched in (hits if every else hits[:1]):
+                    add_edit(result, 'comment', pi, start, matched, None, finding['comment'],
+                             matched)
+                if hits:
+                    result['status'] = 'applied'
+                continue
+
+            new_text = finding.get('new_text', '')
+            taken = []
+            duplicate = False
+            conflict = None
+            for pi, start, matched in hits:
+                span = change_span(matched, new_text)
+                if span is None:
+                    continue
+                a, b, new_sub = span
+                claim = (start + a, start + b, new_sub)
+                clash = [c for c in claimed.get(pi, []) if claim[0] < c[1] and c[0] < claim[1]]
+                if not clash:
+                    claimed.setdefault(pi, []).append(claim)
+                    taken.append((pi, claim, matched))
+                    if not every:
+                        break
+                elif claim in clash:
+                    duplicate = True
+                elif conflict is None:
+                    conflict = (pi, start, matched)
+
+            if taken:
+                result['status'] = 'applied'
+                comment = finding['comment']
+                if len(taken) > 1:
+                    comment += f" (Applied to all {len(taken)} occurrences.)"
+                # The rationale goes on the first occurrence only
+                for n, (pi, (cs, ce, new_sub), matched) in enumerate(taken):
+                    add_edit(result, 'change', pi, cs, texts[pi][cs:ce], new_sub,
+                             comment if n == 0 else None, matched)
+            elif duplicate:
+                result['status'] = 'duplicate'
+            elif conflict is not None:
+                result['status'] = 'conflict'
+                pi, start, matched = conflict
+                add_edit(result, 'comment', pi, start, matched, None,
+                         f"{finding['comment']} Suggested edit not applied because it "
+                         f"overlaps another edit: \"{new_text}\"", matched)
+    return edits, results
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EDIT JOURNAL
+# ═══════════════════════════════════════════════════════════════════════════
+
+def journal_entries(results, origins, locators, para_ids):
+    """One journal record per finding, in findings order.
+
+    results   — from resolve_findings, after the edits were applied (each
+                edit carries ok, and revision_ids / comment_id if assigned)
+    origins   — (findings file, index of the finding in that file) per result
+    locators  — (part, paragraph index within the part) per paragraph; the
+                index counts every w:p of the part, as resolve_changes.py does
+    para_ids  — w14:paraId per paragraph, or None where Word wrote none
+
+    Each record has file, index, author, status, type, category, target
+    (old_text or anchor_text) and edits, plus reason for a finding a budget
+    skipped or truncated. Each edit has kind ('change' or
+    'comment'), part, paragraph, para_id, start and end (offsets of the
+    changed or anchored text in the original paragraph text), old, new,
+    matched (the whole occurrence found), variant (index into
+    normalize_for_search(target); 0 is the text as written), revision_ids,
+    comment_id (with --shared-comments first, a change sharing an earlier
+    rationale records that comment's ID) and applied.
+    """
+    entries = []
+    for result, (path, n) in zip(results, origins):
+        finding = result['finding']
+        target = finding['old_text' if finding['type'] == 'tracked_change' else 'anchor_text']
+        variants = normalize_for_search(target)
+        edits = []
+        for edit in result['edits']:
+            part, index = locators[edit['para']]
+            edits.append({
+                'kind': edit['kind'],
+                'part': part,
+                'paragraph': index,
+                'para_id': para_ids[edit['para']],
+                'start': edit['start'],
+                'end': edit['start'] + len(edit['old']),
+                'old': edit['old'],
+                'new': edit['new'],
+                'matched': edit['matched'],
+                'variant': variants.index(edit['matched']) if edit['matched'] in variants else None,
+                'revision_ids': edit.get('revision_ids', []),
+                'comment_id': edit.get('comment_id'),
+                'applied': edit['ok'],
+            })
+        entries.append({
+            'file': path,
+            'index': n,
+            'author': result['author'],
+            'status': result['status'],
+            'type': finding['type'],
+            'category': finding.get('category', ''),
+            'target': target,
+            'edits': edits,
+        })
+        if result['status'] in ('skipped', 'truncated'):
+            entries[-1]['reason'] = result['reason']
+    return entries
+
+
+def write_journal(entries, journal_path):
+    """Write journal records as JSONL."""
+    with open(journal_path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def read_journal(journal_path):
+    """Read a journal written by write_journal."""
+    with open(journal_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  OUTPUT PACKAGE AND RESULT CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# 1980-01-01T00:00:00Z, the earliest timestamp a ZIP entry can hold
+DETERMINISTIC_EPOCH = 315532800
+
+# Where the checkers keep compiled references (lexicon, word list, style rules)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'bw_copyeditor')
+
+
+def revision_datetime(date=None, deterministic=False):
+    """The UTC datetime stamped on every revision, comment and ZIP entry.
+
+    An explicit date ("2025-06-01" or "2025-06-01T09:30:00Z") wins. In
+    deterministic mode SOURCE_DATE_EPOCH comes next, then the fixed epoch;
+    otherwise it is now, whatever the environment says. Raises ValueError
+    for a malformed date.
+    """
+    if date:
+        value = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).replace(microsecond=0)
+    if not deterministic:
+        return datetime.now(timezone.utc).replace(microsecond=0)
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    return datetime.fromtimestamp(int(epoch) if epoch else DETERMINISTIC_EPOCH, timezone.utc)
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def job_key(src_docx, batches, date, shared_comments=None,
+            compress_level=DEFAULT_COMPRESS_LEVEL):
+    """Cache key for one run: tool version, source bytes, findings, date,
+    the --shared-comments mode and the compression level.
+
+    batches is [(author, findings)], as passed to resolve_findings. Findings
+    are hashed in parsed form, so reformatting the JSONL files (whitespace,
+    key order) does not change the key.
+    """
+    h = hashlib.sha256()
+    h.update(TOOL_VERSION.encode())
+    h.update(file_sha256(src_docx).encode())
+    h.update(json.dumps(batches, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    h.update(date.encode())
+    if shared_comments:
+        h.update(shared_comments.encode())
+    if compress_level != DEFAULT_COMPRESS_LEVEL:
+        h.update(f'level {compress_level}'.encode())
+    return h.hexdigest()
+
+
+def durable_id(seed, para_id, taken):
+    """A comment durableId derived from a seed and the comment's paraId.
+
+    Word requires durableIds below 0x7FFFFFFF and unique within the
+    document; `taken` holds the ones already used and is updated.
+    """
+    n = 0
+    while True:
+        digest = hashlib.sha256(f'{seed}:{para_id}:{n}'.encode()).hexdigest()
+        value = format(int(digest[:8], 16) % 0x7FFFFFFE + 1, '08X')
+        if value not in taken:
+            taken.add(value)
+            return value
+        n += 1
+
+
+# Entries are made on Unix (create_system 3) with mode rw-------, as zipfile
+# writes them there
+ZIP_CREATE_SYSTEM = 3
+ZIP_FILE_ATTR = 0o600 << 16
+
+
+def serialize_part(tree):
+    """A modified part's bytes, as tree.write() would put them on disk."""
+    return etree.tostring(tree, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _deflate_entry(data, level):
+    """(size, CRC-32, raw deflate stream) of one entry's bytes."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return len(data), zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+
+def fixed_zipinfo(name, date_time):
+    """A deflated entry's ZipInfo with the fixed timestamp and attributes."""
+    info = zipfile.ZipInfo(name, date_time=date_time)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = ZIP_CREATE_SYSTEM
+    info.external_attr = ZIP_FILE_ATTR
+    return info
+
+
+def write_zip(output, entries, level=DEFAULT_COMPRESS_LEVEL, workers=1):
+    """Write (ZipInfo, load) entries to output in order.
+
+    load() returns the entry's bytes. Loading and deflating run on a pool
+    of `workers` threads (lxml and zlib both release the GIL); zipfile then
+    writes each precompressed entry as writestr() would, since it has no
+    public call for data that is already compressed. Entries other than
+    stored ones are deflated at `level`.
+
+    ZIP64 records are never written: a package that would need them raises
+    zipfile.LargeZipFile.
+    """
+    def build(entry):
+        info, load = entry
+        data = load()
+        if info.compress_type == zipfile.ZIP_STORED:
+            return len(data), zlib.crc32(data), data
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return _deflate_entry(data, level)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        built = list(pool.map(build, entries))
+    for (info, _), (size, _, data) in zip(entries, built):
+        if max(size, len(data)) >= zipfile.ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{info.filename} is too large for a package without ZIP64")
+
+    with zipfile.ZipFile(output, 'w', allowZip64=False) as zf:
+        for (info, _), (size, crc, data) in zip(entries, built):
+            info.file_size, info.compress_size, info.CRC = size, len(data), crc
+            info.flag_bits = 0
+            if not info.external_attr:
+                info.external_attr = ZIP_FILE_ATTR
+            info.header_offset = zf.fp.tell()
+            if info.header_offset >= zipfile.ZIP64_LIMIT:
+                raise zipfile.LargeZipFile("the package is too large without ZIP64")
+            zf.fp.write(info.FileHeader(False))
+            zf.fp.write(data)
+            zf.start_dir = zf.fp.tell()
+            zf.filelist.append(info)
+            zf.NameToInfo[info.filename] = info
+
+
+def write_package(output_docx, work_dir, names, date_time, parts=None,
+                  level=DEFAULT_COMPRESS_LEVEL, workers=1):
+    """Zip work_dir into output_docx, entries in `names` order.
+
+    parts maps entry names to modified trees, serialized here rather than
+    written to work_dir first. Entries go through write_zip, so serializing
+    and deflating run on `workers` threads. Every entry gets the same
+    timestamp and attributes, so the archive depends only on the part
+    contents and the compression level.
+    """
+    parts = parts or {}
+    names = [n for n in names if n in parts or os.path.isfile(os.path.join(work_dir, n))]
+
+    def loader(name):
+        if name in parts:
+            return lambda: serialize_part(parts[name])
+
+        def read():
+            with open(os.path.join(work_dir, name), 'rb') as f:
+                return f.read()
+        return read
+
+    write_zip(output_docx, [(fixed_zipinfo(n, date_time), loader(n)) for n in names],
+              level, workers)
+
+
+def summarize_results(results):
+    """Print the outcome of each finding once its edits were applied.
+
+    Findings none of whose edits could be applied are marked failed.
+    Returns (applied count, failed findings).
+    """
+    applied = 0
+    failed = []
+    for result in results:
+        finding = result['finding']
+        target = finding.get('old_text' if finding['type'] == 'tracked_change' else 'anchor_text', '')
+        done = sum(1 for e in result['edits'] if e['ok'])
+        if result['status'] == 'duplicate':
+            print(f"  DUPLICATE of an earlier edit: {target[:60]}")
+            applied += 1
+        elif result['status'] == 'conflict' and done:
+            print(f"  CONFLICT, left as a comment: {target[:60]}")
+            applied += 1
+        elif not done and result.get('reason'):
+            result['status'] = 'skipped'
+            failed.append(finding)
+            print(f"  SKIPPED ({result['reason']}): {target[:60]}")
+        elif not done:
+            result['status'] = 'failed'
+            failed.append(finding)
+            print(f"  FAILED: {target[:70]}...")
+        else:
+            if result.get('reason'):
+                # Some occurrences went in before the budget ran out
+                result['status'] = 'truncated'
+                print(f"  CUT SHORT ({result['reason']}) after {done} of "
+                      f"{len(result['edits'])} occurrence(s): {target[:60]}")
+            elif finding.get('all_occurrences'):
+                print(f"  Applied to {done} occurrence(s): {target[:60]}")
+            applied += 1
+
+    print(f"\nApplied: {applied}/{len(results)}")
+    if failed:
+        print(f"Failed:  {len(failed)}")
+    return applied, failed
+
+
+def finding_origins(findings_paths, batches):
+    """(findings file, index in file) for every finding, in resolve order."""
+    return [(path, n) for path, (_, batch) in zip(findings_paths, batches)
+            for n in range(len(batch))]
+
+
+def report_failures(failed):
+    """Print the findings that must be applied by hand."""
+    if not failed:
+        return
+    print(f"\n{'='*60}")
+    print(f"WARNING: {len(failed)} finding(s) could not be applied:")
+    for f in failed:
+        anchor = f.get('old_text', f.get('anchor_text', f.get('fix_raw', '?')))
+        print(f"  - [{f.get('category','')}] {anchor[:80]}")
+    print("These must be applied manually.")
+    print(f"{'='*60}")
+
+
+def cache_lookup(cache_dir, key, output_docx):
+    """Copy a cached result to output_docx; return its report, or None."""
+    cached_docx = os.path.join(cache_dir, key + ".docx")
+    cached_report = os.path.join(cache_dir, key + ".json")
+    if not (os.path.isfile(cached_docx) and os.path.isfile(cached_report)):
+        return None
+    with open(cached_report, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    shutil.copyfile(cached_docx, output_docx)
+    return report
+
+
+def cache_store(cache_dir, key, output_docx, report):
+    """Store output_docx and its report under key (atomic per file)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    for suffix, write in (
+        (".docx", lambda tmp: shutil.copyfile(output_docx, tmp)),
+        (".json", lambda tmp: _write_json(tmp, report)),
+    ):
+        final = os.path.join(cache_dir, key + suffix)
+        tmp = f"{final}.{os.getpid()}.tmp"
+        write(tmp)
+        os.replace(tmp, final)
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BUDGETS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class BudgetExceeded(Exception):
+    """A package or part is over one of the run's budgets."""
+
+
+class Budget:
+    """Resource limits for one run (None = unlimited), and what they cut.
+
+    max_bytes     — total uncompressed size of the package
+    max_entries   — entries in the package
+    max_elements  — XML elements parsed across the story parts
+    match_seconds — time the search for one finding may take
+    wall_seconds  — time for the whole run; once it is up, remaining
+                    findings are skipped and the output is written with
+                    the edits already made
+    """
+
+    def __init__(self, max_bytes=None, max_elements=None, match_seconds=None,
+                 wall_seconds=None, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_elements = max_elements
+        self.match_seconds = match_seconds
+        self.deadline = time.time() + wall_seconds if wall_seconds is not None else None
+        self.elements = 0
+        self.notes = []  # what was cut, for the report
+
+    @property
+    def limits(self):
+        """(seconds per finding, wall deadline), as match_findings takes them."""
+        return self.match_seconds, self.deadline
+
+    def out_of_time(self):
+        return self.deadline is not None and time.time() > self.deadline
+
+    def match_reason(self):
+        """Why a finding's search was cut off."""
+        if self.out_of_time():
+            return "wall-time budget used up"
+        return f"search took over {self.match_seconds:g}s"
+
+    def check_package(self, path):
+        """Raise BudgetExceeded if the ZIP directory puts the package past
+        max_entries or max_bytes.
+
+        This refuses an oversized package before anything is read. The
+        sizes are only what the directory declares: extract() counts the
+        bytes it writes as well, and zipfile reads no entry past its
+        declared size (the .pptx path reads entries in place).
+        """
+        if self.max_bytes is None and self.max_entries is None:
+            return
+        with zipfile.ZipFile(path) as z:
+            infos = z.infolist()
+        self._check_entries(len(infos))
+        self._check_bytes(sum(info.file_size for info in infos))
+
+    def _check_entries(self, count):
+        if self.max_entries is not None and count > self.max_entries:
+            raise BudgetExceeded(
+                f"package has more entries than --max-entries {self.max_entries:,}"
+            )
+
+    def _check_bytes(self, size):
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise BudgetExceeded(
+                f"package expands past --max-bytes {self.max_bytes:,}"
+            )
+
+    def extract(self, path, work_dir):
+        """Extract the package into work_dir under max_entries and max_bytes.
+
+        Entries are streamed to disk and counted as they are written, so a
+        package whose directory understates its size or entry count is
+        stopped part way with BudgetExceeded. Entry names are made relative
+        to work_dir, as zipfile.extractall makes them.
+        """
+        with zipfile.ZipFile(path) as z:
+            if self.max_bytes is None and self.max_entries is None:
+                z.extractall(work_dir)
+                return
+            written = 0
+            for count, info in enumerate(z.infolist(), 1):
+                self._check_entries(count)
+                name = os.path.splitdrive(info.filename.replace('\\', '/'))[1]
+                parts = [p for p in name.split('/') if p not in ('', '.', '..')]
+                if not parts:
+                    continue
+                target = os.path.join(work_dir, *parts)
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with z.open(info) as src, open(target, 'wb') as dst:
+                    for block in iter(lambda: src.read(1 << 16), b''):
+                        written += len(block)
+                        self._check_bytes(written)
+                        dst.write(block)
+
+    def parse(self, source, parser, name=None):
+        """Parse an XML part, counting its elements against max_elements.
+
+        source is a path or a file object; name labels the part in the
+        error (default: the path's file name). Raises BudgetExceeded as
+        soon as the running count passes the limit, before the rest of the
+        part is read.
+        """
+        if self.max_elements is None:
+            return etree.parse(source, parser)
+        context = etree.iterparse(source, events=('start',), remove_blank_text=False)
+        count = self.elements
+        for _ in context:
+            count += 1
+            if count > self.max_elements:
+                raise BudgetExceeded(
+                    f"{name or os.path.basename(source)} takes the element count past "
+                    f"--max-elements {self.max_elements:,}"
+                )
+        self.elements = count
+        return context.root.getroottree()
+
+    def parse_or_skip(self, source, parser, name=None):
+        """parse(), or None with a report note for a part over the limit."""
+        try:
+            return self.parse(source, parser, name)
+        except BudgetExceeded as e:
+            self.notes.append(f"{name or os.path.basename(source)} not searched: {e}")
+            return None
+
+
+def note_skipped(budget, results):
+    """Add the count of findings a budget cut off to its report notes."""
+    skipped = sum(1 for r in results if r['status'] == 'skipped')
+    if skipped:
+        budget.notes.append(f"{skipped} finding(s) skipped; they are listed with the failures")
+    truncated = sum(1 for r in results if r['status'] == 'truncated')
+    if truncated:
+        budget.notes.append(f"{truncated} finding(s) applied to only some occurrences; "
+                            "the journal lists the edits made")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  MAIN
 # ═══════════════════════════════════════════════════════════════════════════
 
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: python apply_copyedits.py <source.docx> <findings.jsonl> <output.docx>")
-        sys.exit(1)
-
-    src_docx = sys.argv[1]
-    findings_path = sys.argv[2]
-    output_docx = sys.argv[3]
+    arg_parser = argparse.ArgumentParser(
+        description="Apply findings.jsonl to a .docx as tracked changes and comments."
+    )
+    arg_parser.add_argument("source", help="source .docx")
+    arg_parser.add_argument("findings", nargs="+",
+                            help="findings.jsonl; several files are merged in one pass")
+    arg_parser.add_argument("output", help="output .docx")
+    arg_parser.add_argument("--author", action="append", default=[],
+                            help=f"author for each findings file, in order (default {AUTHOR})")
+    arg_parser.add_argument("--deterministic", action="store_true",
+                            help="byte-reproducible output (fixed dates, IDs and ZIP metadata)")
+    arg_parser.add_argument("--date",
+                            help="timestamp for revisions and comments, e.g. 2025-06-01T09:30:00Z")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="processes for matching large findings sets (default: all cores)")
+    arg_parser.add_argument("--cache-dir",
+                            help="reuse and store results here (implies --deterministic)")
+    arg_parser.add_argument("--journal",
+                            help="write a JSONL record of where each finding was applied")
+    arg_parser.add_argument("--shared-comments", choices=SHARED_COMMENT_MODES,
+                            help="one full comment per repeated rationale, on its first "
+                                 "change; later changes with it get none")
+    arg_parser.add_argument("--compress-level", type=int, choices=range(10),
+                            default=DEFAULT_COMPRESS_LEVEL, metavar="0-9",
+                            help="deflate level for the output package "
+                                 f"(default {DEFAULT_COMPRESS_LEVEL}; 1 is fastest)")
+    arg_parser.add_argument("--max-bytes", type=int,
+                            help="refuse packages that expand to more than this many bytes")
+    arg_parser.add_argument("--max-entries", type=int,
+                            help="refuse packages with more than this many entries")
+    arg_parser.add_argument("--max-elements", type=int,
+                            help="most XML elements to parse across the story parts")
+    arg_parser.add_argument("--match-seconds", type=float,
+                            help="skip a finding whose search takes longer than this")
+    arg_parser.add_argument("--wall-seconds", type=float,
+                            help="stop applying findings after this long and write what is done")
+    args = arg_parser.parse_args()
+
+    src_docx = args.source
+    output_docx = args.output
+    deterministic = args.deterministic or bool(args.cache_dir)
 
     if not os.path.exists(src_docx):
         print(f"Error: source file not found: {src_docx}")
         sys.exit(1)
-    if not os.path.exists(findings_path):
-        print(f"Error: findings file not found: {findings_path}")
+    for findings_path in args.findings:
+        if not os.path.exists(findings_path):
+            print(f"Error: findings file not found: {findings_path}")
+            sys.exit(1)
+    if len(args.author) > len(args.findings):
+        print(f"Error: {len(args.author)} --author names for {len(args.findings)} findings file(s)")
+        sys.exit(1)
+    authors = args.author + [AUTHOR] * (len(args.findings) - len(args.author))
+    try:
+        when = revision_datetime(args.date, deterministic)
+    except ValueError:
+        print(f"Error: invalid --date: {args.date}")
+        sys.exit(1)
+    date = when.strftime('%Y-%m-%dT%H:%M:%SZ')
+    budget = Budget(args.max_bytes, args.max_elements, args.match_seconds, args.wall_seconds,
+                    args.max_entries)
+    try:
+        budget.check_package(src_docx)
+    except BudgetExceeded as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
     # ── Parse findings ──
-    findings = parse_findings(findings_path)
-    tc_count = sum(1 for f in findings if f['type'] == 'tracked_change')
-    co_count = sum(1 for f in findings if f['type'] == 'comment_only')
-    print(f"Parsed {len(findings)} findings ({tc_count} tracked changes, {co_count} comments)")
+    is_deck = src_docx.lower().endswith('.pptx')
+    if is_deck:
+        from pptx_edits import DECK_PARTS, apply_pptx
+    batches = []
+    for findings_path, author in zip(args.findings, authors):
+        batch = parse_findings(findings_path, DECK_PARTS if is_deck else None)
+        tc_count = sum(1 for f in batch if f['type'] == 'tracked_change')
+        co_count = sum(1 for f in batch if f['type'] == 'comment_only')
+        source = f" from {findings_path} ({author})" if len(args.findings) > 1 else ""
+        print(f"Parsed {len(batch)} findings{source} "
+              f"({tc_count} tracked changes, {co_count} comments)")
+        batches.append((author, batch))
+    findings = [f for _, batch in batches for f in batch]
+
+    # ── Result cache ──
+    key = (job_key(src_docx, batches, date, args.shared_comments, args.compress_level)
+           if deterministic else None)
+    if args.cache_dir:
+        report = cache_lookup(args.cache_dir, key, output_docx)
+        if report is not None:
+            print(f"Cache hit ({key[:12]}): applied {report['applied']}/{len(findings)}")
+            print(f"Output: {output_docx} ({os.path.getsize(output_docx):,} bytes)")
+            if args.journal:
+                # The key covers the findings, not the files they came from
+                for entry, (path, _) in zip(report['journal'],
+                                            finding_origins(args.findings, batches)):
+                    entry['file'] = path
+                write_journal(report['journal'], args.journal)
+                print(f"Journal: {args.journal}")
+            report_failures(report['failed'])
+            return len(report['failed'])
+
+    # ── PowerPoint decks: same matching, comments instead of revisions ──
+    if is_deck:
+        results, locators = apply_pptx(src_docx, output_docx, batches, when, args.workers,
+                                       budget, args.compress_level)
+        applied, failed = summarize_results(results)
+        note_skipped(budget, results)
+        journal = journal_entries(results, finding_origins(args.findings, batches),
+                                  locators, [None] * len(locators))
+        return finish_output(args, key, applied, failed, journal, budget)
 
     # ── Extract docx ──
     work_dir = output_docx + ".work"
     if os.path.exists(work_dir):
-        import shutil
         shutil.rmtree(work_dir)
     os.makedirs(work_dir)
 
-    with zipfile.ZipFile(src_docx, 'r') as z:
-        z.extractall(work_dir)
+    try:
+        budget.extract(src_docx, work_dir)
+    except BudgetExceeded as e:
+        shutil.rmtree(work_dir)
+        print(f"Error: {e}")
+        sys.exit(1)
 
     # ── Parse XML files ──
     parser = etree.XMLParser(remove_blank_text=False)
 
     doc_path = os.path.join(work_dir, "word", "document.xml")
-    doc_tree = etree.parse(doc_path, parser)
-    doc_root = doc_tree.getroot()
 
     # Ensure comments.xml and its relationships/content types exist
     # (no-ops if everything is already in place)
     ensure_comments_infrastructure(work_dir, src_docx)
 
     comments_path = os.path.join(work_dir, "word", "comments.xml")
-    comments_tree = etree.parse(comments_path, parser)
-    comments_root = comments_tree.getroot()
 
+    # Parts over the element budget are left as they are: an unsearched body
+    # gets no edits, and without comments.xml no comments can be added
+    doc_tree = budget.parse_or_skip(doc_path, parser)
+    comments_tree = budget.parse_or_skip(comments_path, parser)
+    if comments_tree is None:
+        budget.notes.append("no comments or rationales were added")
     footnotes_path = os.path.join(work_dir, "word", "footnotes.xml")
-    footnotes_tree = None
-    if os.path.exists(footnotes_path):
-        footnotes_tree = etree.parse(footnotes_path, parser)
-
     endnotes_path = os.path.join(work_dir, "word", "endnotes.xml")
-    endnotes_tree = None
-    if os.path.exists(endnotes_path):
-        endnotes_tree = etree.parse(endnotes_path, parser)
+    notes_trees = []
+    for path in (footnotes_path, endnotes_path):
+        tree = None
+        if os.path.exists(path):
+            tree = budget.parse_or_skip(path, parser)
+        notes_trees.append(tree)
+    footnotes_tree, endnotes_tree = notes_trees
 
     # ── Find safe starting ID ──
     max_id = 100
@@ -522,104 +2013,152 @@ def main():
                     pass
     next_id = max_id + 100
 
-    # ── Generate timestamp ──
-    from datetime import datetime, timezone
-    date = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-
     # ── Collect all searchable paragraphs ──
-    doc_paras = doc_root.findall(f'.//{{{W}}}p')
+    doc_paras = doc_tree.getroot().findall(f'.//{{{W}}}p') if doc_tree else []
     fn_paras = (footnotes_tree.getroot().findall(f'.//{{{W}}}p')
                 if footnotes_tree else [])
     en_paras = (endnotes_tree.getroot().findall(f'.//{{{W}}}p')
                 if endnotes_tree else [])
+    all_paras = doc_paras + fn_paras + en_paras
+    part_paras = {'document': doc_paras, 'footnotes': fn_paras, 'endnotes': en_paras}
+
+    # Heading styles, for findings scoped to a section
+    styles_path = os.path.join(work_dir, "word", "styles.xml")
+    styles = heading_styles(
+        etree.parse(styles_path, parser).getroot()
+        if os.path.exists(styles_path) else None
+    )
 
-    # ── Apply findings ──
-    applied = 0
-    failed = []
+    # ── Resolve every finding against the original text ──
+    index = {para: i for i, para in enumerate(all_paras)}
+    part_indices = {
+        part: [index[p] for p in paras] for part, paras in part_paras.items()
+    }
+    # Body paragraphs come first in all_paras, so body positions are indices
+    outline = body_outline(doc_paras, styles)
+    toc = toc_paragraphs(doc_paras)
+    scopes = {}
+
+    def scope(finding):
+        """Paragraph indices a finding may match in (None = all).
+
+        Findings applied everywhere skip table-of-contents lines, which
+        repeat the headings and are regenerated by Word. Scopes are worked
+        out once per (part, section).
+        """
+        if not finding.get('all_occurrences'):
+            return None
+        key = (finding.get('part'), finding.get('section'))
+        if key not in scopes:
+            part, section = key
+            indices = part_indices[part] if part else range(len(all_paras))
+            if section:
+                selected = set(section_indices(outline, section))
+                indices = [i for i in indices if i in selected]
+            scopes[key] = [i for i in indices if i not in toc]
+        return scopes[key]
+
+    texts = [paragraph_text(p) for p in all_paras]
+    edits, results = resolve_findings(texts, batches, scope, args.workers, budget)
+
+    # ── Apply edits ──
     new_comments = []
 
-    for finding in findings:
-        ftype = finding['type']
-        found = False
-
-        if ftype == 'tracked_change':
-            old_text = finding.get('old_text', '')
-            new_text = finding.get('new_text', '')
-            if not old_text:
-                failed.append(finding)
-                continue
-
-            # Search in document, then footnotes, then endnotes
-            for para_list in [doc_paras, fn_paras, en_paras]:
-                for para in para_list:
-                    if find_text_in_paragraph(para, old_text) is not None:
-                        success = apply_tracked_change(
-                            para, old_text, new_text, next_id, date
-                        )
-                        if success:
-                            # Add rationale comment
-                            comment_id = next_id + 2
-                            ce = create_comment_element(
-                                comment_id, date, finding['comment']
-                            )
-                            new_comments.append(ce)
-
-                            # Anchor comment around the del/ins pair
-                            target_para = para
-                            # If the del was moved to grandparent, find it
-                            if para.find(f'{{{W}}}del[@{{{W}}}id="{next_id}"]') is None:
-                                # Search parent paragraph
-                                for p in doc_paras + fn_paras + en_paras:
-                                    if p.find(f'{{{W}}}del[@{{{W}}}id="{next_id}"]') is not None:
-                                        target_para = p
-                                        break
-
-                            add_comment_anchor_around_change(
-                                target_para, next_id, next_id + 1, comment_id
-                            )
-
-                            next_id += 3
-                            applied += 1
-                            found = True
-                            break
-                if found:
-                    break
-
-        elif ftype == 'comment_only':
-            anchor = finding.get('anchor_text', '')
-            if not anchor:
-                failed.append(finding)
-                continue
-
-            for para_list in [doc_paras, fn_paras, en_paras]:
-                for para in para_list:
-                    if find_text_in_paragraph(para, anchor) is not None:
-                        comment_id = next_id
-                        success = add_comment_anchor(para, anchor, comment_id)
-                        if success:
-                            ce = create_comment_element(
-                                comment_id, date, finding['comment']
-                            )
-                            new_comments.append(ce)
-                            next_id += 1
-                            applied += 1
-                            found = True
-                            break
-                if found:
-                    break
-
-        if not found:
-            failed.append(finding)
-            anchor = finding.get('old_text', finding.get('anchor_text', '?'))
-            print(f"  FAILED: {anchor[:70]}...")
-
-    print(f"\nApplied: {applied}/{len(findings)}")
-    if failed:
-        print(f"Failed:  {len(failed)}")
+    def out_of_time(edit):
+        """True, marking the edit's finding skipped, once the wall time is up."""
+        if not budget.out_of_time():
+            return False
+        edit['result']['reason'] = "wall-time budget used up"
+        return True
+
+    def add_change(edit):
+        """Apply one tracked change, plus its rationale comment if given."""
+        nonlocal next_id
+        if out_of_time(edit):
+            return False
+        para = all_paras[edit['para']]
+        ids = apply_tracked_change(para, edit['old'], edit['new'], next_id, date,
+                                   edit['start'], edit['author'])
+        if not ids:
+            return False
+        next_id += len(ids)
+        edit['revision_ids'] = ids
+        if edit['comment'] is not None and not args.shared_comments \
+                and comments_tree is not None:
+            add_rationale(edit, edit['comment'])
+        return True
+
+    def add_rationale(edit, text):
+        """Add a rationale comment anchored around an applied change."""
+        nonlocal next_id
+        comment_id = next_id
+        new_comments.append(create_comment_element(comment_id, date, text, edit['author']))
+        edit['comment_id'] = comment_id
+
+        # Anchor comment around the changed span
+        ids = edit['revision_ids']
+        add_comment_anchor_around_change(all_paras[edit['para']], ids[0], ids[-1], comment_id)
+        next_id += 1
+
+    def add_comment(edit):
+        """Anchor one comment-only finding."""
+        nonlocal next_id
+        if out_of_time(edit):
+            return False
+        if comments_tree is None:
+            edit['result']['reason'] = "comments.xml over the element budget"
+            return False
+        if not add_comment_anchor(all_paras[edit['para']], edit['old'], next_id, edit['start']):
+            return False
+        new_comments.append(
+            create_comment_element(next_id, date, edit['comment'], edit['author'])
+        )
+        edit['comment_id'] = next_id
+        next_id += 1
+        return True
+
+    # Comment anchors never change the text, so they go in first. Changes
+    # then run last to first in each paragraph, which leaves the original
+    # offsets of every edit still to be made intact.
+    for edit in edits:
+        if edit['kind'] == 'comment':
+            edit['ok'] = add_comment(edit)
+    changes = [e for e in edits if e['kind'] == 'change']
+    for edit in sorted(changes, key=lambda e: (e['para'], e['start']), reverse=True):
+        edit['ok'] = add_change(edit)
+
+    # Shared rationales go on once every change is in, so the first
+    # occurrence in the document is known
+    if args.shared_comments and comments_tree is not None:
+        rationales = sorted((e for e in changes if e['ok'] and e['comment'] is not None),
+                            key=lambda e: (e['para'], e['start']))
+        for edit, text, leader in share_rationales(rationales, args.shared_comments):
+            if text is None:
+                edit['comment_id'] = leader['comment_id']
+            else:
+                add_rationale(edit, text)
+
+    applied, failed = summarize_results(results)
+    note_skipped(budget, results)
+    origins = finding_origins(args.findings, batches)
+    locators = [(part, i) for part, paras in part_paras.items() for i in range(len(paras))]
+    para_ids = [p.get(f'{{{W14}}}paraId') for p in all_paras]
+    journal = journal_entries(results, origins, locators, para_ids)
 
     # ── Update comments.xml ──
     for ce in new_comments:
-        comments_root.append(ce)
+        comments_tree.getroot().append(ce)
+
+    # Modified parts, serialized when the package is written
+    parts = {}
+    if doc_tree is not None:
+        parts['word/document.xml'] = doc_tree
+    if comments_tree is not None:
+        parts['word/comments.xml'] = comments_tree
+    if footnotes_tree is not None:
+        parts['word/footnotes.xml'] = footnotes_tree
+    if endnotes_tree is not None:
+        parts['word/endnotes.xml'] = endnotes_tree
 
     # ── Update commentsExtended.xml ──
     ce_path = os.path.join(work_dir, "word", "commentsExtended.xml")
@@ -638,7 +2177,7 @@ def main():
                     ex = etree.SubElement(ce_root, f'{{{W15}}}commentEx')
                     ex.set(f'{{{W15}}}paraId', para_id)
                     ex.set(f'{{{W15}}}done', '0')
-        ce_tree.write(ce_path, xml_declaration=True, encoding='UTF-8', standalone=True)
+        parts['word/commentsExtended.xml'] = ce_tree
 
     # ── Update commentsIds.xml ──
     ci_path = os.path.join(work_dir, "word", "commentsIds.xml")
@@ -649,6 +2188,12 @@ def main():
             e.get(f'{{{W16CID}}}paraId')
             for e in ci_root.findall(f'{{{W16CID}}}commentId')
         }
+        taken = {
+            e.get(f'{{{W16CID}}}durableId')
+            for e in ci_root.findall(f'{{{W16CID}}}commentId')
+        }
+        # Seeded from the job hash in deterministic mode, randomly otherwise
+        seed = key if deterministic else os.urandom(8).hex()
         for c in new_comments:
             p = c.find(f'{{{W}}}p')
             if p is not None:
@@ -656,9 +2201,8 @@ def main():
                 if para_id and para_id not in existing:
                     cid = etree.SubElement(ci_root, f'{{{W16CID}}}commentId')
                     cid.set(f'{{{W16CID}}}paraId', para_id)
-                    cid.set(f'{{{W16CID}}}durableId',
-                            format(random.randint(0, 0xFFFFFFFF), '08X'))
-        ci_tree.write(ci_path, xml_declaration=True, encoding='UTF-8', standalone=True)
+                    cid.set(f'{{{W16CID}}}durableId', durable_id(seed, para_id, taken))
+        parts['word/commentsIds.xml'] = ci_tree
 
     # ── Update people.xml ──
     people_path = os.path.join(work_dir, "word", "people.xml")
@@ -669,29 +2213,16 @@ def main():
             p.get(f'{{{W15}}}author')
             for p in people_root.findall(f'{{{W15}}}person')
         ]
-        if AUTHOR not in existing_authors:
+        for author in dict.fromkeys(authors):
+            if author in existing_authors:
+                continue
             person = etree.SubElement(people_root, f'{{{W15}}}person')
-            person.set(f'{{{W15}}}author', AUTHOR)
+            person.set(f'{{{W15}}}author', author)
             presence = etree.SubElement(person, f'{{{W15}}}presenceInfo')
             presence.set(f'{{{W15}}}providerId', 'None')
-            presence.set(f'{{{W15}}}userId', 'claude-copyeditor')
-        people_tree.write(
-            people_path, xml_declaration=True, encoding='UTF-8', standalone=True
-        )
-
-    # ── Write modified XML files ──
-    doc_tree.write(doc_path, xml_declaration=True, encoding='UTF-8', standalone=True)
-    comments_tree.write(
-        comments_path, xml_declaration=True, encoding='UTF-8', standalone=True
-    )
-    if footnotes_tree is not None:
-        footnotes_tree.write(
-            footnotes_path, xml_declaration=True, encoding='UTF-8', standalone=True
-        )
-    if endnotes_tree is not None:
-        endnotes_tree.write(
-            endnotes_path, xml_declaration=True, encoding='UTF-8', standalone=True
-        )
+            presence.set(f'{{{W15}}}userId',
+                         'claude-copyeditor' if author == AUTHOR else author)
+        parts['word/people.xml'] = people_tree
 
     # ── Repackage as docx ──
     print("\nRepackaging...")
@@ -706,28 +2237,48 @@ def main():
     if 'word/comments.xml' not in orig_names:
         orig_names.append('word/comments.xml')
 
-    with zipfile.ZipFile(output_docx, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for name in orig_names:
-            local = os.path.join(work_dir, name)
-            if os.path.isfile(local):
-                zf.write(local, name)
+    zip_time = max(when, datetime.fromtimestamp(DETERMINISTIC_EPOCH, timezone.utc))
+    write_package(output_docx, work_dir, orig_names, zip_time.timetuple()[:6], parts,
+                  args.compress_level, args.workers)
 
     # Clean up work directory
-    import shutil
     shutil.rmtree(work_dir)
 
+    return finish_output(args, key, applied, failed, journal, budget)
+
+
+def finish_output(args, key, applied, failed, journal, budget=None):
+    """Validate the written package, store it, write the journal and report.
+
+    A run cut short by its budget is reported and not cached. Returns the
+    number of failed findings (the exit code).
+    """
+    output_docx = args.output
     size = os.path.getsize(output_docx)
     print(f"Output: {output_docx} ({size:,} bytes)")
 
-    if failed:
-        print(f"\n{'='*60}")
-        print(f"WARNING: {len(failed)} finding(s) could not be applied:")
-        for f in failed:
-            anchor = f.get('old_text', f.get('anchor_text', f.get('fix_raw', '?')))
-            print(f"  - [{f.get('category','')}] {anchor[:80]}")
-        print("These must be applied manually.")
-        print(f"{'='*60}")
-
+    # ── Structural check of the finished package ──
+    from validate_docx import validate_docx
+    problems = validate_docx(output_docx)
+    errors = [p for p in problems if p.severity == 'error']
+    print(f"Validation: {'OK' if not errors else f'{len(errors)} error(s)'}")
+    for p in errors[:20]:
+        print(f"  ERROR: {p.part}: {p.message}")
+
+    partial = budget is not None and budget.notes
+    if partial:
+        print("Budget reached; output is partial:")
+        for note in budget.notes:
+            print(f"  - {note}")
+
+    if args.cache_dir and not partial:
+        cache_store(args.cache_dir, key, output_docx,
+                    {'applied': applied, 'failed': failed, 'journal': journal})
+    if args.journal:
+        write_journal(journal, args.journal)
+        print(f"Journal: {args.journal}")
+
+    report_failures(failed)
     return len(failed)
 
 
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+chunk_document.py — Split a long .docx into reviewable chunks and merge the
+per-chunk findings back into a single findings.jsonl.
+
+Long reports are too big to review in one pass. The `split` command breaks the
+document into heading-bounded chunks, each under a token budget, with a few
+paragraphs of overlap so edits near a boundary have context. Every paragraph
+in a chunk is prefixed with its locator (e.g. "[document:41]"), so chunks can
+be reviewed concurrently and each reviewer writes its own findings file.
+
+The `merge` command combines the per-chunk findings files in document order,
+drops duplicates found in the overlap regions, widens targets whose text
+recurs elsewhere in the document until they are unique, and writes one
+findings.jsonl ready for apply_copyedits.py.
+
+Usage:
+    python chunk_document.py split <source.docx> <chunk_dir> [--max-tokens N] [--overlap N]
+    python chunk_document.py merge <chunk_dir> <findings.jsonl>
+
+split writes <chunk_dir>/chunk_001.md, chunk_002.md, ... and manifest.json.
+Findings for chunk_001.md go in <chunk_dir>/chunk_001.findings.jsonl.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from apply_copyedits import (
+    build_outline, heading_path, normalize_for_search, parse_findings,
+    read_story_paragraphs, unique_span, write_findings,
+)
+
+# Rough chars-per-token ratio for English prose
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = 8000
+DEFAULT_OVERLAP = 2
+
+MANIFEST_NAME = "manifest.json"
+
+
+def estimate_tokens(text):
+    """Cheap token estimate; only needs to be consistent, not exact."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SPLIT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def split_sections(paragraphs):
+    """Group paragraphs into sections that start at each heading.
+
+    Each notes part (footnotes, endnotes) always starts a new section so that
+    body text and notes never share a chunk.
+    """
+    starts = {entry['para'] for entry in build_outline(paragraphs)}
+    sections = []
+    current = []
+    for i, para in enumerate(paragraphs):
+        starts_section = (
+            i in starts
+            or (current and current[-1]['part'] != para['part'])
+        )
+        if starts_section and current:
+            sections.append(current)
+            current = []
+        current.append(para)
+    if current:
+        sections.append(current)
+    return sections
+
+
+def _tokens(paras):
+    return sum(estimate_tokens(p['text']) for p in paras)
+
+
+def build_chunks(paragraphs, max_tokens=DEFAULT_MAX_TOKENS, overlap=DEFAULT_OVERLAP):
+    """Pack heading-bounded sections into chunks under max_tokens.
+
+    Returns a list of chunks; each chunk is a list of (para, is_overlap)
+    pairs. Overlap paragraphs repeat the tail of the previous chunk (within
+    the same part) and count toward the budget. A section that does not fit
+    a chunk of its own, overlap included, is split at paragraph boundaries;
+    the overlap is cut short only where one paragraph alone nearly fills the
+    budget.
+    """
+    # Empty paragraphs carry no reviewable text
+    paragraphs = [p for p in paragraphs if p['text'].strip()]
+
+    chunks = []
+    tails = []
+    core = []
+    tokens = 0
+    pending = split_sections(paragraphs)[::-1]
+    while pending:
+        piece = pending.pop()
+        piece_tokens = _tokens(piece)
+        new_part = core and core[-1]['part'] != piece[0]['part']
+        if core and (new_part or tokens + piece_tokens > max_tokens):
+            chunks.append(core)
+            core = []
+        if not core:
+            # Reserve room for the overlap carried over from the last chunk
+            tail = _overlap_tail(chunks, piece[0]['part'], overlap)
+            if _tokens(tail) + piece_tokens > max_tokens:
+                if len(piece) > 1:
+                    pending.extend([p] for p in reversed(piece))
+                    continue
+                while tail and _tokens(tail) + piece_tokens > max_tokens:
+                    tail = tail[1:]
+            tails.append(tail)
+            tokens = _tokens(tail)
+        core.extend(piece)
+        tokens += piece_tokens
+    if core:
+        chunks.append(core)
+
+    return [[(p, True) for p in tail] + [(p, False) for p in core]
+            for tail, core in zip(tails, chunks)]
+
+
+def _overlap_tail(chunks, part, overlap):
+    """Last `overlap` paragraphs of the previous chunk, if in the same part."""
+    if not chunks or overlap <= 0:
+        return []
+    return [p for p in chunks[-1][-overlap:] if p['part'] == part]
+
+
+def render_chunk(chunk, number, total, path=()):
+    """Render one chunk as markdown with a locator before every paragraph.
+
+    path is the outline path (see apply_copyedits.heading_path) of the
+    chunk's first paragraph, so a chunk that starts mid-section says where.
+    """
+    core = [p for p, is_overlap in chunk if not is_overlap]
+    lines = [
+        f"<!-- Chunk {number} of {total}: {core[0]['locator']} to "
+        f"{core[-1]['locator']}. The bracketed locator before each paragraph "
+        f"is not document text; do not copy it into findings. -->",
+        "",
+    ]
+    if path:
+        lines[1:1] = [f"<!-- Section: {' > '.join(path)} -->"]
+    for para, is_overlap in chunk:
+        # Title (level 0) renders like a level-1 heading
+        marker = "#" * max(para['level'], 1) + " " if para['level'] is not None else ""
+        note = " <!-- overlap with previous chunk -->" if is_overlap else ""
+        lines.append(f"[{para['locator']}] {marker}{para['text']}{note}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def split_document(src_docx, chunk_dir, max_tokens=DEFAULT_MAX_TOKENS,
+                   overlap=DEFAULT_OVERLAP):
+    """Write chunk markdown files and manifest.json to chunk_dir."""
+    paragraphs = read_story_paragraphs(src_docx)
+    chunks = build_chunks(paragraphs, max_tokens, overlap)
+    outline = build_outline(paragraphs)
+    position = {p['locator']: i for i, p in enumerate(paragraphs)}
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    manifest = {
+        "source": os.path.basename(src_docx),
+        "max_tokens": max_tokens,
+        "overlap": overlap,
+        "order": [p['locator'] for p in paragraphs],
+        "chunks": [],
+    }
+    for i, chunk in enumerate(chunks, 1):
+        stem = f"chunk_{i:03d}"
+        first = next(p for p, is_overlap in chunk if not is_overlap)
+        path = heading_path(outline, position[first['locator']])
+        with open(os.path.join(chunk_dir, stem + ".md"), "w", encoding="utf-8") as f:
+            f.write(render_chunk(chunk, i, len(chunks), path))
+        manifest["chunks"].append({
+            "id": i,
+            "file": stem + ".md",
+            "findings": stem + ".findings.jsonl",
+            "section": path,
+            "tokens": sum(estimate_tokens(p['text']) for p, _ in chunk),
+            "paragraphs": [
+                {"locator": p['locator'], "text": p['text'], "overlap": is_overlap}
+                for p, is_overlap in chunk
+            ],
+        })
+
+    with open(os.path.join(chunk_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MERGE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def finding_target(finding):
+    """The document text a finding matches against."""
+    if finding['type'] == 'tracked_change':
+        return finding.get('old_text', '')
+    return finding.get('anchor_text', '')
+
+
+def locate_in_chunk(chunk, text):
+    """Find text in a chunk's paragraphs.
+
+    Returns (locator, start, end, is_overlap) for the first match, or None.
+    """
+    for variant in normalize_for_search(text):
+        for para in chunk['paragraphs']:
+            idx = para['text'].find(variant)
+            if idx != -1:
+                return para['locator'], idx, idx + len(variant), para['overlap']
+    return None
+
+
+def merge_findings(chunk_dir):
+    """Merge per-chunk findings files into one list in document order.
+
+    A finding repeated at the same place (same type, target text and
+    replacement, in the same paragraph with overlapping spans) is kept once;
+    the same edit elsewhere in the document is a separate finding. Targets
+    that occur more than once in the document are widened with context
+    words until unique, so apply_copyedits.py edits the paragraph the chunk
+    meant. When two chunks propose different edits for overlapping text,
+    the chunk that owns the paragraph (rather than seeing it as overlap)
+    wins.
+    """
+    with open(os.path.join(chunk_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    order = {loc: i for i, loc in enumerate(manifest["order"])}
+    texts = {p["locator"]: p["text"] for chunk in manifest["chunks"]
+             for p in chunk["paragraphs"]}
+    corpus = "\n".join(texts[loc] for loc in manifest["order"] if loc in texts)
+
+    located = []
+    for chunk in manifest["chunks"]:
+        path = os.path.join(chunk_dir, chunk["findings"])
+        if not os.path.exists(path):
+            print(f"  WARNING: no findings file for chunk {chunk['id']} ({chunk['findings']})")
+            continue
+        last_seq = order[chunk["paragraphs"][-1]["locator"]]
+        for n, finding in enumerate(parse_findings(path)):
+            hit = locate_in_chunk(chunk, finding_target(finding))
+            if hit is None:
+                print(f"  WARNING: chunk {chunk['id']} finding not found in chunk text: "
+                      f"{finding_target(finding)[:60]}...")
+                # Keep it; apply_copyedits.py will report it if it truly fails
+                key = (last_seq, float('inf'), 1, chunk["id"], n)
+                located.append((key, None, finding))
+                continue
+            locator, start, end, is_overlap = hit
+            key = (order[locator], start, 1 if is_overlap else 0, chunk["id"], n)
+            located.append((key, (locator, start, end), finding))
+
+    located.sort(key=lambda item: item[0])
+
+    merged = []
+    seen = {}   # (type, target, new_text) -> [(locator, start, end)], None if not located
+    spans = {}  # locator -> [(start, end)] of kept tracked changes, after widening
+    dropped = 0
+    for _, span, finding in located:
+        ident = (finding['type'], finding_target(finding), finding.get('new_text'))
+        places = seen.setdefault(ident, [])
+        if any(_same_place(span, other) for other in places):
+            dropped += 1
+            continue
+        places.append(span)
+        if span is not None and not finding.get('all_occurrences'):
+            span = _widen_target(finding, span, texts[span[0]], corpus)
+        if span is not None and finding['type'] == 'tracked_change':
+            locator, start, end = span
+            kept = spans.setdefault(locator, [])
+            if any(start < e and s < end for s, e in kept):
+                print(f"  WARNING: overlapping edit dropped: {finding_target(finding)[:60]}...")
+                dropped += 1
+                continue
+            kept.append((start, end))
+        merged.append(finding)
+    return merged, dropped
+
+
+def _same_place(span, other):
+    """True if two located spans overlap in one paragraph (or neither was located)."""
+    if span is None or other is None:
+        return span is other
+    return span[0] == other[0] and span[1] < other[2] and other[1] < span[2]
+
+
+def _widen_target(finding, span, text, corpus):
+    """Widen a finding's target until it occurs once in corpus; return the new span.
+
+    The target becomes the paragraph's own text for the span, with the
+    replacement widened by the same context.
+    """
+    locator, start, end = span
+    if corpus.count(text[start:end]) <= 1:
+        return span
+    new_start, new_end = unique_span(text, start, end, corpus, 0)
+    if corpus.count(text[new_start:new_end]) > 1:
+        print(f"  WARNING: {locator} text also occurs elsewhere; the first occurrence "
+              f"will be edited: {text[new_start:new_end][:60]}...")
+    if finding['type'] == 'tracked_change':
+        finding['old_text'] = text[new_start:new_end]
+        finding['new_text'] = (text[new_start:start] + finding.get('new_text', '')
+                               + text[end:new_end])
+    else:
+        finding['anchor_text'] = text[new_start:new_end]
+    return locator, new_start, new_end
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split a docx into review chunks, or merge per-chunk findings."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sp = sub.add_parser("split", help="write chunk_*.md files and manifest.json")
+    sp.add_argument("source", help="source .docx")
+    sp.add_argument("chunk_dir", help="output directory for chunks")
+    sp.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS,
+                    help=f"token budget per chunk (default {DEFAULT_MAX_TOKENS})")
+    sp.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP,
+                    help=f"paragraphs repeated from the previous chunk (default {DEFAULT_OVERLAP})")
+
+    mp = sub.add_parser("merge", help="merge chunk_*.findings.jsonl into one file")
+    mp.add_argument("chunk_dir", help="directory written by split")
+    mp.add_argument("findings", help="merged findings.jsonl to write")
+
+    args = parser.parse_args()
+
+    if args.command == "split":
+        if not os.path.exists(args.source):
+            print(f"Error: source file not found: {args.source}")
+            return 1
+        manifest = split_document(args.source, args.chunk_dir, args.max_tokens, args.overlap)
+        print(f"Wrote {len(manifest['chunks'])} chunks to {args.chunk_dir}")
+        for chunk in manifest["chunks"]:
+            print(f"  {chunk['file']}: ~{chunk['tokens']:,} tokens, "
+                  f"{len(chunk['paragraphs'])} paragraphs")
+        return 0
+
+    if not os.path.exists(os.path.join(args.chunk_dir, MANIFEST_NAME)):
+        print(f"Error: no {MANIFEST_NAME} in {args.chunk_dir}; run split first")
+        return 1
+    merged, dropped = merge_findings(args.chunk_dir)
+    write_findings(merged, args.findings)
+    print(f"Merged {len(merged)} findings into {args.findings} "
+          f"({dropped} duplicate or overlapping dropped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+delta.py — Extract only the paragraphs that changed between two versions.
+
+When a document comes back for a second copyedit round, the paragraphs the
+first round already reviewed do not need reading again. This script pairs
+the paragraphs of the two versions the way retarget.py does — by content
+hash first, so unchanged paragraphs are never compared character by
+character — and renders just the new and changed paragraphs of the new
+version, each prefixed with its locator (e.g. "[document:41]") as in
+chunk_document.py output.
+
+Each run of changes is preceded by the heading it sits under and --context
+unchanged paragraphs on either side, marked as context so the reviewer can
+read the change in place without reviewing it again.
+
+Usage:
+    python delta.py <old.docx> <new.docx> [output.md] [--context N] [--json]
+
+--json prints the changed paragraphs as JSON (locator, status, text) instead
+of markdown.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from apply_copyedits import read_story_paragraphs
+from retarget import align_versions, fingerprint
+
+DEFAULT_CONTEXT = 1
+
+
+def changed_paragraphs(old_paragraphs, new_paragraphs):
+    """Status of every non-empty paragraph of the new version.
+
+    Returns (status, deleted): status maps new index to 'new' or 'changed'
+    for paragraphs that are not an exact copy of their counterpart in the
+    old version (unchanged ones are left out); deleted counts the old
+    paragraphs with no counterpart.
+    """
+    mapping = align_versions(old_paragraphs, new_paragraphs)
+    partner = {j: i for i, j in mapping.items()}
+    status = {}
+    for j, para in enumerate(new_paragraphs):
+        if not para['text'].strip():
+            continue
+        i = partner.get(j)
+        if i is None:
+            status[j] = 'new'
+        elif fingerprint(old_paragraphs[i]['text']) != fingerprint(para['text']):
+            status[j] = 'changed'
+    deleted = sum(1 for i, p in enumerate(old_paragraphs)
+                  if p['text'].strip() and i not in mapping)
+    return status, deleted
+
+
+def delta_runs(new_paragraphs, status, context=DEFAULT_CONTEXT):
+    """Group the changed paragraphs into runs with their context.
+
+    Returns a list of runs; each run is a list of (index, role) pairs, role
+    being 'new', 'changed', 'context' or 'heading'. Runs whose context would
+    touch are joined.
+    """
+    texts = [j for j, p in enumerate(new_paragraphs) if p['text'].strip()]
+    position = {j: n for n, j in enumerate(texts)}
+    runs = []
+    last_end = -1
+    for j in sorted(status):
+        n = position[j]
+        start = max(n - context, 0)
+        if runs and start <= last_end + 1:
+            run = runs[-1]
+        else:
+            run = {}
+            runs.append(run)
+        for m in range(start, min(n + context, len(texts) - 1) + 1):
+            k = texts[m]
+            if k in status:
+                run[k] = status[k]
+            else:
+                run.setdefault(k, 'context')
+        last_end = max(last_end, min(n + context, len(texts) - 1))
+
+    result = []
+    for run in runs:
+        first = min(run)
+        part = new_paragraphs[first]['part']
+        heading = next(
+            (k for k in range(first - 1, -1, -1)
+             if new_paragraphs[k]['part'] == part and new_paragraphs[k]['level'] is not None),
+            None,
+        )
+        pairs = sorted(run.items())
+        if heading is not None and heading not in run:
+            pairs.insert(0, (heading, 'heading'))
+        result.append(pairs)
+    return result
+
+
+def render_delta(new_paragraphs, runs, old_name, new_name, deleted):
+    """Markdown for the runs, in the chunk_document.py locator format."""
+    changed = sum(1 for run in runs for _, role in run if role in ('new', 'changed'))
+    lines = [
+        f"<!-- Changes in {new_name} since {old_name}: {changed} new or changed "
+        f"paragraph(s), {deleted} deleted. Review only paragraphs marked new or "
+        f"changed; the others are context. The bracketed locator before each "
+        f"paragraph is not document text; do not copy it into findings. -->",
+        "",
+    ]
+    for run in runs:
+        lines.append("---")
+        lines.append("")
+        for j, role in run:
+            para = new_paragraphs[j]
+            # Title (level 0) renders like a level-1 heading
+            marker = "#" * max(para['level'], 1) + " " if para['level'] is not None else ""
+            lines.append(f"[{para['locator']}] {marker}{para['text']} <!-- {role} -->")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract the paragraphs that changed between two versions of a .docx."
+    )
+    parser.add_argument("old", help="the version already reviewed")
+    parser.add_argument("new", help="the revised version")
+    parser.add_argument("output", nargs="?", help="markdown file to write (default: stdout)")
+    parser.add_argument("--context", type=int, default=DEFAULT_CONTEXT,
+                        help=f"unchanged paragraphs shown around each change (default {DEFAULT_CONTEXT})")
+    parser.add_argument("--json", action="store_true",
+                        help="print the changed paragraphs as JSON instead")
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not os.path.exists(path):
+            print(f"Error: file not found: {path}")
+            return 1
+
+    old_paragraphs = read_story_paragraphs(args.old)
+    new_paragraphs = read_story_paragraphs(args.new)
+    status, deleted = changed_paragraphs(old_paragraphs, new_paragraphs)
+
+    if args.json:
+        output = json.dumps([
+            {'locator': new_paragraphs[j]['locator'], 'status': s, 'text': new_paragraphs[j]['text']}
+            for j, s in sorted(status.items())
+        ], ensure_ascii=False, indent=1)
+    else:
+        runs = delta_runs(new_paragraphs, status, args.context)
+        output = render_delta(new_paragraphs, runs, os.path.basename(args.old),
+                              os.path.basename(args.new), deleted)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Wrote {len(status)} new or changed paragraphs to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
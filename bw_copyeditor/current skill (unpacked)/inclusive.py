@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+inclusive.py — Flag inclusive-language issues from the reference lexicon.
+
+references/inclusive-language.md lists the terms to flag ("low-income
+students," "at-risk students," "achievement gap") with preferred
+alternatives, plus capitalization and hyphenation rules ("Black," "Asian
+American"). This script compiles those tables into a single pattern and
+scans every paragraph once, writing comment_only findings with the
+suggested alternative: the reference asks for these to be flagged for the
+author, not changed.
+
+Each term is expanded to the forms it takes in running text: singular and
+plural nouns ("student"/"students"), verb forms ("traumatized,"
+"traumatizing"), hyphen or space in compounds ("low-income"/"low income"),
+and short lists between a modifier and its noun ("low-income and adult
+students"). The variants of a term are folded into a prefix tree, so the
+pattern branches only where the forms differ.
+
+The compiled lexicon is cached on disk under a key derived from the
+reference file's content, so it is rebuilt only when the file changes, and
+once per process; --batch runs many documents against one compile.
+
+Usage:
+    python inclusive.py <source.docx> <findings.jsonl> [--lexicon FILE]
+        [--cache-dir DIR] [--append]
+    python inclusive.py --batch OUT_DIR <source.docx> [<source.docx> ...]
+"""
+
+import argparse
+import functools
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+
+from apply_copyedits import (
+    DEFAULT_CACHE_DIR, build_findings, read_story_paragraphs, reviewable_paragraphs,
+    write_findings,
+)
+from style_rules import protected_spans
+
+# Part of the cache key; bump whenever compiling the same reference changes
+LEXICON_VERSION = "1"
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where the reference lives in the packaged skill, then in this repository
+LEXICON_PATHS = (
+    os.path.join(SCRIPT_DIR, 'references', 'inclusive-language.md'),
+    os.path.join(SCRIPT_DIR, '..', 'references', 'inclusive-language.md'),
+    os.path.join(SCRIPT_DIR, '..', 'archive', 'references', 'inclusive-language.md'),
+)
+
+# Up to three more list items between a modifier and its noun:
+# "low-income, first-generation, and adult students"
+LIST_GAP = r"(?:,?\s+(?:and|or)\s+[\w’'-]+|,\s+[\w’'-]+){0,3}?"
+
+SENTENCE_START_RE = re.compile(r'(?:^|[.!?:]["”’)\]]*\s+|[“"(]\s*)$')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  READ THE REFERENCE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _cells(line):
+    return [c.strip() for c in line.strip().strip('|').split('|')]
+
+
+def _clean(term):
+    """Drop markup and explanations: '*Black* (racial identity)' -> 'Black'."""
+    term = re.sub(r'\s*\([^)]*\)', '', term)
+    return term.replace('*', '').replace('"', '').strip()
+
+
+def parse_reference(markdown):
+    """Lexicon entries from the reference's tables.
+
+    Returns a list of dicts with keys term, kind ('flag', 'case' or
+    'hyphen'), flagged (the text form to look for), alternative, why,
+    section and note. Tables the script cannot act on (contexts,
+    community preferences) are skipped; the model still reads those.
+    """
+    entries = []
+    seen = set()
+    section = subsection = ''
+    notes = {}
+    rows = []
+
+    def flush():
+        if len(rows) < 3:
+            return
+        header = [h.lower() for h in rows[0]]
+        sub = subsection.lower()
+        last_why = ''
+        for cells in rows[2:]:
+            cells += [''] * (len(header) - len(cells))
+            starred = any('*' in c.replace('**', '') for c in cells[:2])
+            term = _clean(cells[0])
+            if not term:
+                continue
+            if 'flag this' in header[0] or header[0] in ('instead of', 'avoid'):
+                why = cells[2] if len(header) > 2 else ''
+                if why.lower().startswith('same as'):
+                    why = last_why
+                last_why = why
+                entry = {'kind': 'flag', 'flagged': term.lower(),
+                         'alternative': _clean(cells[1]).replace(' / ', '" or "'), 'why': why}
+            elif header[:2] == ['term', 'example'] and sub in ('capitalize', 'lowercase'):
+                example = _clean(cells[1])
+                if term not in example:
+                    continue
+                # The example from the term on: "Black students"
+                phrase = example[example.index(term):]
+                wrong = term.lower() if sub == 'capitalize' else term[0].upper() + term[1:]
+                if wrong == term:
+                    continue
+                entry = {'kind': 'case', 'flagged': wrong + phrase[len(term):],
+                         'alternative': phrase, 'why': f'{sub} "{term}"'}
+            elif header[:2] == ['term', 'correct'] and sub == 'no hyphen' and ' ' in term:
+                entry = {'kind': 'hyphen', 'flagged': term.replace(' ', '-'),
+                         'alternative': term, 'why': 'no hyphen'}
+            else:
+                continue
+            if entry['flagged'] in seen:
+                continue
+            seen.add(entry['flagged'])
+            entry.update(term=term, section=section,
+                         note=notes.get(section, '') if starred else '')
+            entries.append(entry)
+
+    lines = markdown.splitlines()
+    # Notes for starred terms can follow their table
+    for line in lines:
+        if line.startswith('## '):
+            section = line[3:].replace('CRITICAL:', '').strip()
+        elif line.startswith('*Note:'):
+            notes[section] = line.strip('*').replace('Note:', '', 1).strip()
+    section = ''
+    for line in lines + ['']:
+        if line.startswith('|'):
+            rows.append(_cells(line))
+            continue
+        flush()
+        rows = []
+        if line.startswith('## '):
+            section = line[3:].replace('CRITICAL:', '').strip()
+            subsection = ''
+        elif line.startswith('### '):
+            subsection = line[4:].strip()
+    return entries
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  COMPILE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def inflections(word, noun=True):
+    """The word and its verb forms, and its plural/singular if a noun."""
+    forms = {word}
+    if len(word) < 3 or not word.isalpha():
+        return forms
+    if word.endswith('ed') and word[:-1].endswith('e'):
+        base = word[:-1]
+        forms.update((base, base + 's', base[:-1] + 'ing'))
+    elif word.endswith('ing'):
+        base = word[:-3]
+        forms.update((base, base + 's', base + 'ed'))
+    elif not noun:
+        pass
+    elif word.endswith('ies'):
+        forms.add(word[:-3] + 'y')
+    elif word.endswith(('ches', 'shes', 'sses', 'xes')):
+        forms.add(word[:-2])
+    elif word.endswith('s') and not word.endswith('ss'):
+        forms.add(word[:-1])
+    elif word.endswith('y') and word[-2] not in 'aeiou':
+        forms.add(word[:-1] + 'ies')
+    elif word.endswith(('ch', 'sh', 'ss', 'x')):
+        forms.add(word + 'es')
+    else:
+        forms.add(word + 's')
+    return forms
+
+
+def _word_variants(word, noun=True):
+    """Inflections, and for a compound both "low-income" and "low income"."""
+    parts = word.split('-')
+    heads = [inflections(p, noun) if i == len(parts) - 1 else {p} for i, p in enumerate(parts)]
+    variants = set()
+    for combo in itertools.product(*heads):
+        variants.add('-'.join(combo))
+        if len(combo) > 1:
+            variants.add(' '.join(combo))
+    return variants
+
+
+def trie_pattern(strings):
+    """A regex matching exactly `strings`, factored as a prefix tree.
+
+    A space matches any run of whitespace.
+    """
+    trie = {}
+    for s in strings:
+        node = trie
+        for ch in s:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node):
+        end = '' in node
+        branches = []
+        for ch in sorted(c for c in node if c):
+            piece = r'\s+' if ch == ' ' else re.escape(ch)
+            branches.append(piece + emit(node[ch]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            return f'(?:{body})?'
+        return body
+
+    return emit(trie)
+
+
+def entry_pattern(entry):
+    """The regex source for one lexicon entry."""
+    words = entry['flagged'].split(' ')
+    if entry['kind'] == 'case':
+        # Case rules name one form exactly; only the noun inflects
+        variants = [' '.join(words[:-1] + [w]) for w in sorted(inflections(words[-1]))]
+        return trie_pattern(variants)
+    if entry['kind'] == 'hyphen':
+        return trie_pattern(_word_variants(entry['flagged'].replace('-', '_'))
+                            ).replace('_', '-')
+    if len(words) == 2:
+        return (trie_pattern(_word_variants(words[0], noun=False)) + LIST_GAP + r'\s+'
+                + trie_pattern(_word_variants(words[1])))
+    variants = {' '.join(combo) for combo in itertools.product(
+        *(sorted(_word_variants(w, noun=i in (0, len(words) - 1))) for i, w in enumerate(words))
+    )}
+    return trie_pattern(variants)
+
+
+def compile_lexicon(entries):
+    """(combined pattern, entries): one named alternative e<N> per entry."""
+    alternatives = []
+    for i, entry in enumerate(entries):
+        body = entry['pattern']
+        if entry['kind'] != 'case':
+            body = f'(?i:{body})'
+        alternatives.append(fr"(?P<e{i}>\b{body}\b)")
+    return re.compile('|'.join(alternatives)), entries
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, f'inclusive-{digest[:16]}.json')
+
+
+@functools.lru_cache(maxsize=None)
+def load_lexicon(path, cache_dir=DEFAULT_CACHE_DIR):
+    """Compiled lexicon for the reference at path, via the on-disk cache.
+
+    The cache file is named after a hash of the reference's content and
+    LEXICON_VERSION, so an edited reference is recompiled and an unchanged
+    one never is. Cached per process as well.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(LEXICON_VERSION.encode() + b'\0' + data).hexdigest()
+    cached = _cache_path(cache_dir, digest) if cache_dir else None
+    if cached and os.path.isfile(cached):
+        with open(cached, 'r', encoding='utf-8') as f:
+            return compile_lexicon(json.load(f))
+
+    entries = parse_reference(data.decode('utf-8'))
+    for entry in entries:
+        entry['pattern'] = entry_pattern(entry)
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp, cached)
+    return compile_lexicon(entries)
+
+
+def find_lexicon_path():
+    for path in LEXICON_PATHS:
+        if os.path.isfile(path):
+            return os.path.normpath(path)
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SCAN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def comment_for(entry, matched):
+    if entry['kind'] == 'flag':
+        comment = (f"Inclusive Language ({entry['section'].lower()}): consider "
+                   f"\"{entry['alternative']}\" instead of \"{matched}.\"")
+        if entry['why']:
+            comment += f" {entry['why'].rstrip('.')}."
+    else:
+        comment = (f"Inclusive Language: {entry['why']} (\"{entry['alternative']}\"), "
+                   "unless this is a quotation or a name.")
+    if entry['note']:
+        comment += f" {entry['note']}"
+    return comment
+
+
+def find_lexicon_matches(paragraphs, lexicon):
+    """Scan paragraphs once with the compiled lexicon; matches for build_findings()."""
+    combined, entries = lexicon
+    matches = []
+    for pi, para in reviewable_paragraphs(paragraphs):
+        text = para['text']
+        protected = protected_spans(text)
+        for hit in combined.finditer(text):
+            if any(s <= hit.start() < e for s, e in protected):
+                continue
+            entry = entries[int(hit.lastgroup[1:])]
+            if entry['kind'] == 'case' and SENTENCE_START_RE.search(text, 0, hit.start()):
+                continue
+            matches.append({
+                'para': pi,
+                'start': hit.start(),
+                'end': hit.end(),
+                'new': None,
+                'category': 'Inclusive Language',
+                'comment': comment_for(entry, hit.group()),
+                'rule': entry['term'],
+            })
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write inclusive-language findings for one or more .docx files."
+    )
+    parser.add_argument("paths", nargs="+",
+                        help="source.docx findings.jsonl, or with --batch the sources")
+    parser.add_argument("--batch", metavar="OUT_DIR",
+                        help="scan every source and write OUT_DIR/<name>.inclusive.jsonl")
+    parser.add_argument("--lexicon", metavar="FILE",
+                        help="inclusive-language reference (default: references/inclusive-language.md)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"compiled lexicon cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    if args.batch:
+        jobs = [(src, os.path.join(args.batch, os.path.splitext(os.path.basename(src))[0]
+                                   + '.inclusive.jsonl')) for src in args.paths]
+    elif len(args.paths) == 2:
+        jobs = [tuple(args.paths)]
+    else:
+        print("Error: expected <source.docx> <findings.jsonl>, or --batch OUT_DIR with sources")
+        return 1
+
+    lexicon_path = args.lexicon or find_lexicon_path()
+    if not lexicon_path or not os.path.isfile(lexicon_path):
+        print(f"Error: inclusive-language reference not found: {lexicon_path or LEXICON_PATHS[0]}")
+        return 1
+    for src, _ in jobs:
+        if not os.path.exists(src):
+            print(f"Error: source file not found: {src}")
+            return 1
+
+    lexicon = load_lexicon(lexicon_path, args.cache_dir)
+    if args.batch:
+        os.makedirs(args.batch, exist_ok=True)
+    for src, out in jobs:
+        paragraphs = read_story_paragraphs(src)
+        findings = build_findings(paragraphs, find_lexicon_matches(paragraphs, lexicon))
+        write_findings(findings, out, append=args.append)
+        print(f"Wrote {len(findings)} findings to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+outline.py — Print a document's heading outline and check it for consistency.
+
+The SKILL asks for heading inconsistencies to be flagged, which means
+comparing every heading with the others at its level. This script reads the
+body once, taking each heading's level from its paragraph style (or direct
+outline level) and its outline number from the list numbering Word applies
+to it (or a number typed at the start of the text), and builds the outline
+index apply_copyedits.build_outline() describes. It prints the outline, and
+with --findings checks it:
+
+    casing       — title case, sentence case or all caps, per level; in a
+                   title-case level, words that break the Bellwether
+                   headline rule (minor words lowercase, others capitalized)
+    punctuation  — closing punctuation (period, colon, none), per level
+    parallelism  — grammatical form among sibling headings (full sentence,
+                   question, -ing phrase, noun phrase)
+    numbering    — numbered and unnumbered sibling headings mixed, typed
+                   numbers out of sequence
+    contents     — table-of-contents lines that no longer match their heading
+
+Findings are comment_only, one per heading, since the author may intend the
+difference. A heading's text usually also appears in the table of contents,
+so when it is not unique its comment is scoped to its own section
+("all_occurrences" with "section"), which apply_copyedits.py resolves to the
+heading itself. Headings in protected sections are left out.
+
+Usage:
+    python outline.py <source.docx> [--findings FILE] [--append] [--json]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+import zipfile
+
+from apply_copyedits import (
+    PROTECTED_SECTIONS, STORY_PARTS, W, build_outline, etree, find_hits, heading_level,
+    heading_styles, paragraph_text, reviewable_paragraphs, section_indices, toc_paragraphs,
+    unique_span, write_findings,
+)
+
+# Lowercase in a headline: articles, coordinating conjunctions, and
+# prepositions of three letters or fewer. "up", "out" and "off" are left out:
+# in headings they are mostly particles ("Filling Out the Form")
+MINOR_WORDS = {
+    'a', 'an', 'the', 'and', 'but', 'or', 'nor', 'for', 'so', 'yet',
+    'as', 'at', 'by', 'in', 'of', 'on', 'per', 'to', 'via', 'vs',
+}
+
+# Standard section names, which stand outside the form of their siblings
+CONVENTIONAL_HEADINGS = {
+    'introduction', 'overview', 'background', 'summary', 'executive summary',
+    'conclusion', 'conclusions', 'methodology', 'glossary', 'faq', 'appendix',
+    'references', 'notes', 'endnotes',
+}
+
+# -ing words that do not start a gerund phrase
+NOT_GERUNDS = {
+    'during', 'according', 'including', 'regarding', 'concerning', 'following',
+    'pending', 'nothing', 'something', 'everything', 'anything', 'morning',
+    'evening', 'funding', 'building', 'housing', 'spending',
+}
+
+HEADLINE_WORD_RE = re.compile(r"[A-Za-z][A-Za-z’']*")
+TYPED_NUMBER_RE = re.compile(
+    r'^\s*((?:\d+\.)*\d+\.?|[IVX]+\.|[A-Z]\.|(?:Part|Chapter|Section|Appendix)\s+[\dA-Z]+[.:]?)\s+'
+)
+
+# Share of a level (or sibling group) a style needs before others are flagged
+MAJORITY = 2 / 3
+PARALLEL_MAJORITY = 3 / 4
+
+# Fewest headings a level or sibling group needs to have a style at all
+MIN_GROUP = 3
+
+# Least difflib ratio at which a table-of-contents line is the same heading
+TOC_MATCH_RATIO = 0.8
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _format_number(value, fmt):
+    """One level of a list number in a w:numFmt format."""
+    if fmt in ('lowerLetter', 'upperLetter'):
+        letters = ''
+        while value > 0:
+            value, r = divmod(value - 1, 26)
+            letters = chr(ord('a') + r) + letters
+        return letters.upper() if fmt == 'upperLetter' else letters
+    if fmt in ('lowerRoman', 'upperRoman'):
+        numerals = ''
+        for n, s in ((1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'), (100, 'c'),
+                     (90, 'xc'), (50, 'l'), (40, 'xl'), (10, 'x'), (9, 'ix'),
+                     (5, 'v'), (4, 'iv'), (1, 'i')):
+            count, value = divmod(value, n)
+            numerals += s * count
+        return numerals.upper() if fmt == 'upperRoman' else numerals
+    if fmt == 'decimalZero':
+        return f'{value:02d}'
+    if fmt in ('bullet', 'none'):
+        return None
+    return str(value)
+
+
+class ListNumbering:
+    """Number labels of numbered paragraphs, counted in document order.
+
+    Built from numbering.xml and styles.xml; label() must be called for
+    every paragraph in order, since any numbered paragraph advances the
+    counters of its list.
+    """
+
+    def __init__(self, numbering_root, styles_root):
+        self.levels = {}   # numId -> {ilvl: (start, numFmt, lvlText, pStyle)}
+        self.counters = {}
+        self.style_numbering = {}
+        if numbering_root is not None:
+            abstract = {}
+            for a in numbering_root.findall(f'{{{W}}}abstractNum'):
+                abstract[a.get(f'{{{W}}}abstractNumId')] = {
+                    int(lvl.get(f'{{{W}}}ilvl', '0')): (
+                        int(_val(lvl, 'start') or 1), _val(lvl, 'numFmt') or 'decimal',
+                        _val(lvl, 'lvlText') or '', _val(lvl, 'pStyle'),
+                    )
+                    for lvl in a.findall(f'{{{W}}}lvl')
+                }
+            for num in numbering_root.findall(f'{{{W}}}num'):
+                levels = dict(abstract.get(_val(num, 'abstractNumId'), {}))
+                for override in num.findall(f'{{{W}}}lvlOverride'):
+                    ilvl = int(override.get(f'{{{W}}}ilvl', '0'))
+                    start = _val(override, 'startOverride')
+                    if start is not None and ilvl in levels:
+                        levels[ilvl] = (int(start),) + levels[ilvl][1:]
+                self.levels[num.get(f'{{{W}}}numId')] = levels
+        if styles_root is not None:
+            based_on = {}
+            for style in styles_root.findall(f'{{{W}}}style'):
+                style_id = style.get(f'{{{W}}}styleId')
+                based_on[style_id] = _val(style, 'basedOn')
+                num_pr = style.find(f'{{{W}}}pPr/{{{W}}}numPr')
+                if num_pr is not None:
+                    self.style_numbering[style_id] = (_val(num_pr, 'numId'), _val(num_pr, 'ilvl'))
+            for style_id in based_on:
+                parent = based_on[style_id]
+                while style_id not in self.style_numbering and parent:
+                    if parent in self.style_numbering:
+                        self.style_numbering[style_id] = self.style_numbering[parent]
+                    parent = based_on.get(parent)
+
+    def label(self, para):
+        """The paragraph's number label ("2.1", "B."), or None."""
+        ppr = para.find(f'{{{W}}}pPr')
+        style = _val(ppr, 'pStyle') if ppr is not None else None
+        num_id, ilvl = self.style_numbering.get(style, (None, None))
+        num_pr = ppr.find(f'{{{W}}}numPr') if ppr is not None else None
+        if num_pr is not None:
+            num_id = _val(num_pr, 'numId') or num_id
+            ilvl = _val(num_pr, 'ilvl') or ilvl
+        levels = self.levels.get(num_id)
+        if not levels:
+            return None  # numId 0, or a list that is not defined, is no list
+        if ilvl is None:
+            # A style linked to a list takes the level that names it
+            ilvl = next((n for n, lvl in levels.items() if lvl[3] == style), 0)
+        ilvl = int(ilvl)
+        if ilvl not in levels:
+            return None
+        counts = self.counters.setdefault(num_id, {})
+        counts[ilvl] = counts.get(ilvl, levels[ilvl][0] - 1) + 1
+        for deeper in [n for n in counts if n > ilvl]:
+            del counts[deeper]
+
+        def level_text(m):
+            n = int(m.group(1)) - 1
+            if n not in levels:
+                return ''
+            value = counts.get(n, levels[n][0])
+            return _format_number(value, levels[n][1]) or ''
+        if _format_number(1, levels[ilvl][1]) is None:
+            return None  # a bullet
+        return re.sub(r'%(\d)', level_text, levels[ilvl][2]).strip() or None
+
+
+def _val(elem, tag):
+    child = elem.find(f'{{{W}}}{tag}') if elem is not None else None
+    return child.get(f'{{{W}}}val') if child is not None else None
+
+
+def read_outline(docx_path):
+    """Paragraphs of the story parts, with the outline numbers of the body.
+
+    Each paragraph has the keys of apply_copyedits.read_story_paragraphs
+    plus number — the list number Word shows before it, else a number typed
+    at the start of a heading, else None.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    paragraphs = []
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        styles_root = (etree.fromstring(z.read('word/styles.xml'), parser)
+                       if 'word/styles.xml' in names else None)
+        numbering_root = (etree.fromstring(z.read('word/numbering.xml'), parser)
+                          if 'word/numbering.xml' in names else None)
+        styles = heading_styles(styles_root)
+        numbering = ListNumbering(numbering_root, styles_root)
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            paras = list(root.iter(f'{{{W}}}p'))
+            toc = toc_paragraphs(paras)
+            for i, para in enumerate(paras):
+                text = paragraph_text(para)
+                level = heading_level(para, styles)
+                number = numbering.label(para) if part == 'document' else None
+                if number is None and level is not None:
+                    typed = TYPED_NUMBER_RE.match(text)
+                    number = typed.group(1) if typed else None
+                paragraphs.append({
+                    'locator': f'{part}:{i}',
+                    'part': part,
+                    'text': text,
+                    'level': level,
+                    'toc': i in toc,
+                    'number': number,
+                })
+    return paragraphs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  HEADING STYLE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _words(text):
+    """(start, end, word) of each word, skipping a typed outline number."""
+    typed = TYPED_NUMBER_RE.match(text)
+    offset = typed.end() if typed else 0
+    return [(m.start(), m.end(), m.group()) for m in HEADLINE_WORD_RE.finditer(text, offset)]
+
+
+def casing(text):
+    """'title', 'sentence', 'upper' or 'mixed', or None if too short to tell."""
+    words = _words(text)
+    letters = [c for c in text if c.isalpha()]
+    if len(words) >= 2 and letters and all(c.isupper() for c in letters):
+        return 'upper'
+    after_break = _after_break(text, words)
+    significant = [w for i, (s, e, w) in enumerate(words)
+                   if i and not after_break[i] and w.lower() not in MINOR_WORDS
+                   and not _mixed_case(w)]
+    if len(significant) < 2:
+        return None
+    capitalized = sum(1 for w in significant if w[0].isupper())
+    if capitalized == len(significant):
+        return 'title'
+    if capitalized <= len(significant) / 2:
+        return 'sentence'
+    return 'mixed'
+
+
+def _after_break(text, words):
+    """Per word, whether it starts the heading or follows a colon or dash."""
+    flags = []
+    for i, (start, _, _) in enumerate(words):
+        before = text[words[i - 1][1]:start] if i else ''
+        flags.append(i == 0 or any(c in before for c in ':—–?'))
+    return flags
+
+
+def _mixed_case(word):
+    """Names like "iPhone" and acronyms like "GPA" keep their own casing."""
+    return any(c.isupper() for c in word[1:])
+
+
+def headline_errors(text):
+    """(start, end, fix) for words that break the headline capitalization rule."""
+    words = _words(text)
+    after_break = _after_break(text, words)
+    errors = []
+    for i, (start, end, word) in enumerate(words):
+        if _mixed_case(word):
+            continue
+        first = word.split('-')[0]
+        must_capitalize = after_break[i] or i == len(words) - 1
+        if first.lower() in MINOR_WORDS and not must_capitalize:
+            if first[0].isupper():
+                errors.append((start, end, 'lowercase'))
+        elif first[0].islower():
+            errors.append((start, end, 'capitalize'))
+    return errors
+
+
+def ending(text):
+    """Closing punctuation of a heading: '.', ':', '?', '!' or ''."""
+    stripped = text.rstrip().rstrip('"”’)')
+    return stripped[-1] if stripped and stripped[-1] in '.:?!' else ''
+
+
+def form(text):
+    """Grammatical form: 'question', 'sentence', 'gerund' or 'phrase'."""
+    end = ending(text)
+    if end == '?':
+        return 'question'
+    if end in '.!' and end:
+        return 'sentence'
+    words = _words(text)
+    if words:
+        first = words[0][2].lower()
+        if first.endswith('ing') and len(first) > 5 and first not in NOT_GERUNDS:
+            return 'gerund'
+    return 'phrase'
+
+
+CASING_NAMES = {'title': 'title case', 'sentence': 'sentence case', 'upper': 'all capitals',
+                'mixed': 'a mix of title and sentence case'}
+ENDING_NAMES = {'.': 'a closing period', ':': 'a closing colon', '!': 'a closing "!"',
+                '': 'no closing punctuation'}
+FORM_NAMES = {'question': ('a question', 'questions'),
+              'sentence': ('a full sentence', 'full sentences'),
+              'gerund': ('an -ing phrase', '-ing phrases'),
+              'phrase': ('a noun phrase', 'noun phrases')}
+
+
+def _majority(values, share):
+    """The value held by at least `share` of values (ignoring None), or None."""
+    known = [v for v in values if v is not None]
+    if len(known) < MIN_GROUP:
+        return None
+    best = max(set(known), key=known.count)
+    return best if known.count(best) >= share * len(known) else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CHECKS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def checked_headings(paragraphs, outline):
+    """Outline positions of the non-empty headings outside protected sections.
+
+    The title (level 0) has no siblings to compare with and is left out.
+    """
+    reviewable = {i for i, _ in reviewable_paragraphs(paragraphs)}
+    return [n for n, entry in enumerate(outline)
+            if entry['level'] and entry['para'] in reviewable
+            and entry['text'].strip().lower() not in PROTECTED_SECTIONS]
+
+
+def outline_matches(paragraphs, outline):
+    """One match per heading that differs from its level or siblings.
+
+    Matches are dicts with para, category, comment and the outline
+    position as 'heading'.
+    """
+    headings = checked_headings(paragraphs, outline)
+    problems = {n: [] for n in headings}
+    headline = set()
+
+    by_level = {}
+    for n in headings:
+        by_level.setdefault(outline[n]['level'], []).append(n)
+    for level, group in by_level.items():
+        texts = {n: outline[n]['text'].strip() for n in group}
+        style = _majority([casing(texts[n]) for n in group], MAJORITY)
+        if style is not None:
+            for n in group:
+                mine = casing(texts[n])
+                if mine not in (None, style) and not (style == 'title' and mine == 'mixed'):
+                    problems[n].append(f"it uses {CASING_NAMES[mine]} where the other "
+                                       f"level-{level} headings use {CASING_NAMES[style]}")
+        if style == 'title':
+            for n in group:
+                fixes = headline_errors(texts[n])
+                if fixes:
+                    headline.add(n)
+                    words = '; '.join(f'{fix} "{texts[n][s:e]}"' for s, e, fix in fixes)
+                    problems[n].append(f"under the headline rule, {words}")
+        punctuation = _majority([ending(texts[n]) if form(texts[n]) != 'question' else None
+                                 for n in group], MAJORITY)
+        if punctuation is not None:
+            for n in group:
+                mine = ending(texts[n])
+                if form(texts[n]) != 'question' and mine != punctuation:
+                    problems[n].append(f"it has {ENDING_NAMES[mine]} where the other "
+                                       f"level-{level} headings have {ENDING_NAMES[punctuation]}")
+
+    by_parent = {}
+    for n in headings:
+        by_parent.setdefault((outline[n]['parent'], outline[n]['level']), []).append(n)
+    for (parent, level), group in by_parent.items():
+        compared = [n for n in group
+                    if outline[n]['text'].strip().lower() not in CONVENTIONAL_HEADINGS]
+        shape = _majority([form(outline[n]['text']) for n in compared], PARALLEL_MAJORITY)
+        if shape is not None:
+            for n in compared:
+                mine = form(outline[n]['text'])
+                if mine != shape:
+                    problems[n].append(f"it is {FORM_NAMES[mine][0]} where its sibling "
+                                       f"headings are {FORM_NAMES[shape][1]}")
+
+        numbered = [n for n in group if outline[n]['number']]
+        if numbered and len(numbered) < len(group):
+            unnumbered = [n for n in group if not outline[n]['number']]
+            flagged = numbered if len(numbered) < len(unnumbered) else unnumbered
+            for n in flagged:
+                problems[n].append("it is numbered and its siblings are not"
+                                   if outline[n]['number'] else
+                                   "its siblings are numbered and this one is not")
+        expected = None
+        for n in numbered:
+            last = re.findall(r'\d+', outline[n]['number'])
+            if not last or not TYPED_NUMBER_RE.match(outline[n]['text']):
+                continue
+            value = int(last[-1])
+            if expected is not None and value != expected:
+                problems[n].append(f"its number {outline[n]['number']} is out of sequence "
+                                   f"({expected} was expected)")
+            expected = value + 1
+
+    matches = []
+    for n in headings:
+        if not problems[n]:
+            continue
+        only_headline = n in headline and len(problems[n]) == 1
+        category = 'Bellwether Style' if only_headline else 'Formatting'
+        matches.append({
+            'para': outline[n]['para'], 'heading': n, 'category': category,
+            'comment': f"{category}: this heading is inconsistent with the outline: "
+                       + '; '.join(problems[n]) + ". Confirm the intended style.",
+        })
+    return matches
+
+
+def _toc_text(text, headings):
+    """A table-of-contents line without its page number.
+
+    The heading the line is an exact copy of wins, so a heading ending in a
+    number ("Sidebar 1") keeps it.
+    """
+    line = text.strip()
+    for heading in headings:
+        if line.startswith(heading) and line[len(heading):].strip(' .\t').isdigit():
+            return heading
+    return re.sub(r'\s*(?:\.{2,}\s*)?\d+$', '', line).strip()
+
+
+def toc_matches(paragraphs, outline):
+    """Matches for table-of-contents lines that differ from their heading."""
+    headings = [e['text'].strip() for e in outline if e['level'] and e['text'].strip()]
+    exact = set(headings)
+    matches = []
+    for pi, para in enumerate(paragraphs):
+        if not para['toc']:
+            continue
+        line = _toc_text(para['text'], exact)
+        if not line or line in exact:
+            continue
+        best = max(headings, key=lambda h: difflib.SequenceMatcher(None, line, h).ratio(),
+                   default=None)
+        if best is None or difflib.SequenceMatcher(None, line, best).ratio() < TOC_MATCH_RATIO:
+            continue
+        matches.append({
+            'para': pi, 'start': 0, 'end': len(line), 'category': 'Formatting',
+            'comment': f"Formatting: this table-of-contents entry reads \"{line}\" but the "
+                       f"heading reads \"{best}\". Update the table of contents.",
+        })
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FINDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def outline_findings(paragraphs, outline, heading_matches, contents_matches):
+    """comment_only findings that land on their headings and contents lines.
+
+    Returns (findings, dropped count).
+    """
+    texts = [p['text'] for p in paragraphs]
+    corpus = '\n'.join(texts)
+    findings = []
+    dropped = 0
+    for m in heading_matches:
+        text = texts[m['para']]
+        anchor = text.strip()
+        finding = {'anchor_text': anchor, 'type': 'comment_only',
+                   'category': m['category'], 'comment': m['comment']}
+        hits = find_hits(texts, anchor)
+        if len(hits) != 1 or hits[0][0] != m['para']:
+            # Also in the contents; scope it to the heading's own section,
+            # where it must occur only as the heading
+            scope = section_indices(outline, anchor)
+            hits = find_hits(texts, anchor, True, scope)
+            finding.update(all_occurrences=True, section=anchor)
+        if len(hits) != 1 or hits[0][0] != m['para']:
+            dropped += 1
+            continue
+        findings.append(finding)
+    for m in contents_matches:
+        text = texts[m['para']]
+        start, end = unique_span(text, m['start'], m['end'], corpus, 0)
+        hits = find_hits(texts, text[start:end])
+        if not hits or hits[0][:2] != (m['para'], start):
+            dropped += 1
+            continue
+        findings.append({'anchor_text': text[start:end], 'type': 'comment_only',
+                         'category': m['category'], 'comment': m['comment']})
+    return findings, dropped
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  REPORT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def format_outline(paragraphs, outline):
+    """The outline as an indented Markdown list with locators."""
+    lines = ["## Outline", ""]
+    for entry in outline:
+        if not entry['text'].strip():
+            continue
+        number = f"{entry['number']} " if entry['number'] and not \
+            TYPED_NUMBER_RE.match(entry['text']) else ""
+        lines.append(f"{'  ' * max(entry['level'] - 1, 0)}- [{paragraphs[entry['para']]['locator']}] "
+                     f"{number}{entry['text'].strip()}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print the heading outline of a .docx and check it for consistency."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("--findings", metavar="FILE",
+                        help="also write comment_only findings on inconsistent headings")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of Markdown")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs = read_outline(args.source)
+    outline = build_outline(paragraphs)
+
+    if args.json:
+        print(json.dumps([
+            dict(entry, locator=paragraphs[entry['para']]['locator'],
+                 end_locator=paragraphs[entry['end'] - 1]['locator'])
+            for entry in outline
+        ], indent=1, ensure_ascii=False))
+    else:
+        print(format_outline(paragraphs, outline))
+
+    if args.findings:
+        findings, dropped = outline_findings(
+            paragraphs, outline, outline_matches(paragraphs, outline),
+            toc_matches(paragraphs, outline),
+        )
+        write_findings(findings, args.findings, append=args.append)
+        if not args.json:
+            print(f"\nWrote {len(findings)} findings to {args.findings}")
+            if dropped:
+                print(f"  ({dropped} dropped: no anchor would land on them unambiguously)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+pptx_edits.py — Copyedit PowerPoint decks with the apply_copyedits.py engine.
+
+apply_copyedits.py hands a .pptx source to apply_pptx(); read_docx.py hands
+it to deck_to_markdown(). The findings format and the matching (variants,
+all_occurrences, overlap handling) are the same as for Word.
+
+Text is indexed from every a:p of the slides and their speaker notes, in
+presentation order. Paragraph locators are "slide<N>:<index>" and
+"notes<N>:<index>", N being the slide's position in the deck; a finding's
+`part` may be "slides" or "notes" to limit all_occurrences.
+
+PowerPoint has no tracked changes, so a tracked_change edits the run text
+directly and a comment on the slide records the original and new text with
+the rationale; reviewers revert from the comment. comment_only findings
+become slide comments quoting their anchor text. Edits in speaker notes
+get their comment on the slide, marked "Speaker notes". Comments are
+PowerPoint's classic comments (ppt/comments/commentN.xml), which every
+version opens.
+
+Only parts that changed are re-serialized; every other entry of the
+package is copied unchanged.
+
+Usage:
+    python pptx_edits.py <deck.pptx> [output.md] [--locators]
+        (renders the deck text; apply findings with apply_copyedits.py)
+"""
+
+import argparse
+import copy
+import io
+import os
+import posixpath
+import sys
+import zipfile
+from datetime import datetime, timezone
+
+from apply_copyedits import (
+    DEFAULT_COMPRESS_LEVEL, DETERMINISTIC_EPOCH, author_initials, etree, fixed_zipinfo,
+    resolve_findings, write_zip,
+)
+
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+SLIDE_REL = f"{R}/slide"
+NOTES_REL = f"{R}/notesSlide"
+COMMENTS_REL = f"{R}/comments"
+COMMENT_AUTHORS_REL = f"{R}/commentAuthors"
+COMMENTS_CT = "application/vnd.openxmlformats-officedocument.presentationml.comments+xml"
+COMMENT_AUTHORS_CT = "application/vnd.openxmlformats-officedocument.presentationml.commentAuthors+xml"
+
+PRESENTATION = 'ppt/presentation.xml'
+COMMENT_AUTHORS = 'ppt/commentAuthors.xml'
+
+# Values a finding's `part` may take in a deck
+DECK_PARTS = ('slides', 'notes')
+
+# Placeholders whose text PowerPoint generates (slide number, date)
+GENERATED_PLACEHOLDERS = ('sldNum', 'dt')
+
+# Comment positions are in 1/576 inch; shape offsets in EMU (914400 per inch)
+EMU_PER_COMMENT_UNIT = 914400 / 576
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  PACKAGE STRUCTURE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def rels_name(part):
+    """ppt/slides/slide1.xml -> ppt/slides/_rels/slide1.xml.rels"""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def read_rels(z, part):
+    """Parsed relationships part of `part`, or a new empty one."""
+    name = rels_name(part)
+    if name in z.namelist():
+        return etree.fromstring(z.read(name))
+    return etree.Element(f'{{{REL_NS}}}Relationships', nsmap={None: REL_NS})
+
+
+def rel_targets(rels_root, part, rel_type):
+    """{rId: package path} of the relationships of one type."""
+    folder = posixpath.dirname(part)
+    return {
+        rel.get('Id'): posixpath.normpath(posixpath.join(folder, rel.get('Target')))
+        for rel in rels_root.findall(f'{{{REL_NS}}}Relationship')
+        if rel.get('Type') == rel_type and rel.get('TargetMode') != 'External'
+    }
+
+
+def add_rel(rels_root, part, rel_type, target):
+    """Add a relationship from part to target (a package path); returns its Id."""
+    taken = {rel.get('Id') for rel in rels_root}
+    n = 1
+    while f'rId{n}' in taken:
+        n += 1
+    rel = etree.SubElement(rels_root, f'{{{REL_NS}}}Relationship')
+    rel.set('Id', f'rId{n}')
+    rel.set('Type', rel_type)
+    rel.set('Target', posixpath.relpath(target, posixpath.dirname(part)))
+    return rel.get('Id')
+
+
+def deck_slides(z):
+    """Slide part names in presentation order, each with its notes part or None."""
+    pres = etree.fromstring(z.read(PRESENTATION))
+    targets = rel_targets(read_rels(z, PRESENTATION), PRESENTATION, SLIDE_REL)
+    slides = []
+    for sld_id in pres.iter(f'{{{P}}}sldId'):
+        slide = targets.get(sld_id.get(f'{{{R}}}id'))
+        if slide is None or slide not in z.namelist():
+            continue
+        notes = list(rel_targets(read_rels(z, slide), slide, NOTES_REL).values())
+        slides.append((slide, notes[0] if notes and notes[0] in z.namelist() else None))
+    return slides
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  DECK INDEX
+# ═══════════════════════════════════════════════════════════════════════════
+
+def build_text_map(para):
+    """Map the matchable text of an a:p onto its runs.
+
+    Returns (text_map, full_text) like apply_copyedits.build_text_map: a
+    list of (run, a:t element, start, end). Text runs (a:r) and fields
+    (a:fld) contribute their a:t; line breaks (a:br) contribute no text.
+    """
+    text_map = []
+    pos = 0
+    for run in para:
+        if run.tag in (f'{{{A}}}r', f'{{{A}}}fld'):
+            t_elem = run.find(f'{{{A}}}t')
+            if t_elem is not None and t_elem.text:
+                text_map.append((run, t_elem, pos, pos + len(t_elem.text)))
+                pos += len(t_elem.text)
+                continue
+            text_map.append((run, t_elem, pos, pos))
+        elif run.tag == f'{{{A}}}br':
+            text_map.append((run, None, pos, pos))
+    full_text = ''.join(t.text for _, t, _, _ in text_map if t is not None and t.text)
+    return text_map, full_text
+
+
+def paragraph_text(para):
+    """Return the matchable text of an a:p (see build_text_map)."""
+    return build_text_map(para)[1]
+
+
+def index_deck(z, budget=None):
+    """Parse every slide and notes part once and list their paragraphs.
+
+    Returns (roots, paragraphs): {part name: parsed root} and a list of
+    dicts with keys para (the a:p element), part (package path), slide
+    (the owning slide's package path), label and index (the locator), in
+    presentation order, each slide followed by its notes. Slide-number and
+    date placeholders are left out, but still count in the index. With a
+    budget, parts past its element limit are left out and noted in it.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    roots = {}
+    paragraphs = []
+    for n, (slide, notes) in enumerate(deck_slides(z), 1):
+        for part, label in ((slide, f'slide{n}'), (notes, f'notes{n}')):
+            if part is None:
+                continue
+            if budget is None:
+                roots[part] = etree.fromstring(z.read(part), parser)
+            else:
+                tree = budget.parse_or_skip(io.BytesIO(z.read(part)), parser,
+                                            posixpath.basename(part))
+                if tree is None:
+                    continue
+                roots[part] = tree.getroot()
+            for i, para in enumerate(roots[part].iter(f'{{{A}}}p')):
+                if _generated(para):
+                    continue
+                paragraphs.append({'para': para, 'part': part, 'slide': slide,
+                                   'label': label, 'index': i})
+    return roots, paragraphs
+
+
+def _generated(para):
+    """True for a paragraph in a slide-number or date placeholder."""
+    shape = next(para.iterancestors(f'{{{P}}}sp'), None)
+    ph = shape.find(f'{{{P}}}nvSpPr/{{{P}}}nvPr/{{{P}}}ph') if shape is not None else None
+    return ph is not None and ph.get('type') in GENERATED_PLACEHOLDERS
+
+
+def deck_to_markdown(pptx_path, locators=False):
+    """Render slide and speaker-notes text as markdown, one block per paragraph."""
+    blocks = []
+    with zipfile.ZipFile(pptx_path, 'r') as z:
+        _, paragraphs = index_deck(z)
+    current = None
+    for p in paragraphs:
+        text = paragraph_text(p['para'])
+        if not text.strip():
+            continue
+        if p['label'] != current:
+            current = p['label']
+            kind = 'Notes' if current.startswith('notes') else 'Slide'
+            blocks.append(f'## {kind} {current[5:]}')
+        prefix = f"[{p['label']}:{p['index']}] " if locators else ''
+        blocks.append(prefix + text)
+    return '\n\n'.join(blocks) + '\n'
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EDITS AND COMMENTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def replace_text(para, start, old_text, new_text):
+    """Replace old_text at offset start of an a:p with new_text, in place.
+
+    The new text takes the formatting of the first run it touches; runs
+    emptied by the edit are removed. Returns False, changing nothing, if
+    the text there differs or the span crosses a line break.
+    """
+    text_map, full_text = build_text_map(para)
+    end = start + len(old_text)
+    if full_text[start:end] != old_text:
+        return False
+    # Breaks and empty runs strictly inside the span sit between text runs
+    if any(t is None for _, t, cs, ce in text_map if cs == ce and start < cs < end):
+        return False
+    touched = [(run, t, cs) for run, t, cs, ce in text_map if cs < end and ce > start]
+    if not touched:
+        return False
+
+    _, first_t, cs = touched[0]
+    _, last_t, ls = touched[-1]
+    tail = last_t.text[end - ls:]
+    first_t.text = first_t.text[:start - cs] + new_text + (tail if last_t is first_t else '')
+    if last_t is not first_t:
+        last_t.text = tail
+    for run, t, _ in touched[1:]:
+        if not t.text and run.tag == f'{{{A}}}r':
+            run.getparent().remove(run)
+    return True
+
+
+def shape_position(para):
+    """Comment position (1/576 inch) of the shape holding a paragraph."""
+    node = para
+    while node is not None and node.tag not in (f'{{{P}}}sp', f'{{{P}}}graphicFrame'):
+        node = node.getparent()
+    off = node.find(f'.//{{{A}}}off') if node is not None else None
+    if off is None:
+        return 10, 10
+    return (round(int(off.get('x', 0)) / EMU_PER_COMMENT_UNIT),
+            round(int(off.get('y', 0)) / EMU_PER_COMMENT_UNIT))
+
+
+class CommentWriter:
+    """Adds classic PowerPoint comments to slides and tracks changed parts."""
+
+    def __init__(self, z, date):
+        self.z = z
+        self.date = date
+        self.parts = {}       # package path -> root to write
+        self.new_parts = []   # package paths created (need a content type)
+        names = set(z.namelist())
+        if COMMENT_AUTHORS in names:
+            self.authors_root = etree.fromstring(z.read(COMMENT_AUTHORS))
+        else:
+            self.authors_root = etree.Element(f'{{{P}}}cmAuthorLst', nsmap={'p': P})
+            self.new_parts.append(COMMENT_AUTHORS)
+            pres_rels = read_rels(z, PRESENTATION)
+            add_rel(pres_rels, PRESENTATION, COMMENT_AUTHORS_REL, COMMENT_AUTHORS)
+            self.parts[rels_name(PRESENTATION)] = pres_rels
+        self.parts[COMMENT_AUTHORS] = self.authors_root
+        self.lists = {}       # slide path -> p:cmLst root
+        self.comment_names = {n for n in names if n.startswith('ppt/comments/')}
+
+    def _author(self, name):
+        for author in self.authors_root.findall(f'{{{P}}}cmAuthor'):
+            if author.get('name') == name:
+                return author
+        ids = [int(a.get('id')) for a in self.authors_root.findall(f'{{{P}}}cmAuthor')]
+        author = etree.SubElement(self.authors_root, f'{{{P}}}cmAuthor')
+        author.set('id', str(max(ids, default=-1) + 1))
+        author.set('name', name)
+        author.set('initials', author_initials(name))
+        author.set('lastIdx', '0')
+        author.set('clrIdx', str(len(ids) % 8))
+        return author
+
+    def _comment_list(self, slide):
+        if slide in self.lists:
+            return self.lists[slide]
+        slide_rels = read_rels(self.z, slide)
+        existing = list(rel_targets(slide_rels, slide, COMMENTS_REL).values())
+        if existing and existing[0] in self.z.namelist():
+            name = existing[0]
+            root = etree.fromstring(self.z.read(name))
+        else:
+            n = 1
+            while f'ppt/comments/comment{n}.xml' in self.comment_names:
+                n += 1
+            name = f'ppt/comments/comment{n}.xml'
+            self.comment_names.add(name)
+            self.new_parts.append(name)
+            add_rel(slide_rels, slide, COMMENTS_REL, name)
+            self.parts[rels_name(slide)] = slide_rels
+            root = etree.Element(f'{{{P}}}cmLst', nsmap={'p': P})
+        self.parts[name] = root
+        self.lists[slide] = root
+        return root
+
+    def add(self, slide, text, author, position):
+        """Add a comment to a slide; returns its index (unique per author)."""
+        person = self._author(author)
+        idx = int(person.get('lastIdx')) + 1
+        person.set('lastIdx', str(idx))
+        cm = etree.SubElement(self._comment_list(slide), f'{{{P}}}cm')
+        cm.set('authorId', person.get('id'))
+        cm.set('dt', self.date)
+        cm.set('idx', str(idx))
+        pos = etree.SubElement(cm, f'{{{P}}}pos')
+        pos.set('x', str(position[0]))
+        pos.set('y', str(position[1]))
+        etree.SubElement(cm, f'{{{P}}}text').text = text
+        return idx
+
+    def content_types(self):
+        """[Content_Types].xml with overrides for the created parts."""
+        root = etree.fromstring(self.z.read('[Content_Types].xml'))
+        for name in self.new_parts:
+            override = etree.SubElement(root, f'{{{CT_NS}}}Override')
+            override.set('PartName', '/' + name)
+            override.set('ContentType',
+                         COMMENT_AUTHORS_CT if name == COMMENT_AUTHORS else COMMENTS_CT)
+        return root
+
+
+def comment_text(edit, in_notes):
+    """Comment recording one edit; quotes the text, since comments can't anchor to it."""
+    if edit['kind'] == 'change':
+        # The finding's own text reads better than the trimmed changed span
+        finding = edit['result']['finding']
+        note = f"Changed \"{finding['old_text']}\" to \"{finding['new_text']}\"."
+        text = f"{edit['comment']} ({note})" if edit['comment'] else note
+    else:
+        text = f"\"{edit['old']}\": {edit['comment']}"
+    return f"Speaker notes: {text}" if in_notes else text
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  APPLY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def apply_pptx(src_pptx, output_pptx, batches, when, workers=1, budget=None,
+               level=DEFAULT_COMPRESS_LEVEL):
+    """Apply findings batches to a deck and write output_pptx.
+
+    batches, workers, budget — as for apply_copyedits.resolve_findings;
+                       workers also deflate the package's entries
+    when             — UTC datetime stamped on comments and written entries
+    level            — deflate level for the package's entries
+
+    Returns (results, locators): the resolve_findings results, each edit
+    carrying ok and comment_id, and (label, index) for every paragraph.
+    """
+    date = when.strftime('%Y-%m-%dT%H:%M:%S.000')
+    with zipfile.ZipFile(src_pptx, 'r') as z:
+        roots, paragraphs = index_deck(z, budget)
+        texts = [paragraph_text(p['para']) for p in paragraphs]
+        by_kind = {kind: [] for kind in DECK_PARTS}
+        for i, p in enumerate(paragraphs):
+            by_kind['notes' if p['label'].startswith('notes') else 'slides'].append(i)
+
+        def scope(finding):
+            if not finding.get('all_occurrences'):
+                return None
+            return by_kind.get(finding.get('part'))
+
+        edits, results = resolve_findings(texts, batches, scope, workers, budget)
+        writer = CommentWriter(z, date)
+
+        def out_of_time(edit):
+            """True, marking the edit's finding skipped, once the wall time is up."""
+            if budget is None or not budget.out_of_time():
+                return False
+            edit['result']['reason'] = "wall-time budget used up"
+            return True
+
+        # Later offsets first, so earlier edits in a paragraph keep theirs.
+        # A change that is made always gets its comment, which records it.
+        changes = [e for e in edits if e['kind'] == 'change']
+        for edit in sorted(changes, key=lambda e: (e['para'], e['start']), reverse=True):
+            p = paragraphs[edit['para']]
+            edit['ok'] = (not out_of_time(edit)
+                          and replace_text(p['para'], edit['start'], edit['old'], edit['new']))
+            if edit['ok']:
+                writer.parts[p['part']] = roots[p['part']]
+        for edit in edits:
+            if edit['kind'] == 'comment':
+                edit['ok'] = not out_of_time(edit)
+            if edit['ok']:
+                p = paragraphs[edit['para']]
+                edit['comment_id'] = writer.add(
+                    p['slide'], comment_text(edit, p['part'] != p['slide']),
+                    edit['author'], shape_position(p['para']),
+                )
+
+        written = {name: _serialize(root) for name, root in writer.parts.items()}
+        written['[Content_Types].xml'] = _serialize(writer.content_types())
+        zip_time = max(when, datetime.fromtimestamp(DETERMINISTIC_EPOCH, timezone.utc))
+        _write_deck(z, output_pptx, written, zip_time.timetuple()[:6], level, workers)
+
+    locators = [(p['label'], p['index']) for p in paragraphs]
+    return results, locators
+
+
+def _serialize(root):
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _write_deck(zin, output_pptx, written, date_time, level=DEFAULT_COMPRESS_LEVEL,
+                workers=1):
+    """Copy the package through apply_copyedits.write_zip, replacing and
+    adding the parts in `written`.
+
+    Unchanged entries keep their bytes and ZIP metadata; written entries
+    get fixed metadata, as in apply_copyedits.write_package.
+    """
+    names = zin.namelist()
+    entries = []
+    for info in zin.infolist():
+        name = info.filename
+        if name in written:
+            entries.append((fixed_zipinfo(name, date_time), lambda n=name: written[n]))
+        else:
+            entries.append((copy.copy(info), lambda n=name: zin.read(n)))
+    for name in sorted(set(written) - set(names)):
+        entries.append((fixed_zipinfo(name, date_time), lambda n=name: written[n]))
+    write_zip(output_pptx, entries, level, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a .pptx's slide and notes text as markdown."
+    )
+    parser.add_argument("source", help="source .pptx")
+    parser.add_argument("output", nargs="?", help="output .md (default: stdout)")
+    parser.add_argument("--locators", action="store_true",
+                        help="prefix each paragraph with its [slideN:index] locator")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    markdown = deck_to_markdown(args.source, locators=args.locators)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        print(f"Wrote {args.output} ({len(markdown):,} characters)")
+    else:
+        sys.stdout.write(markdown)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+read_docx.py — Render a Word .docx as markdown for the copyedit pass.
+
+Replaces `pandoc --track-changes=all`. Paragraph text is produced by the same
+text map apply_copyedits.py matches findings against, so anything copied from
+the output into `old_text` or `anchor_text` matches the document exactly: no
+markdown escaping (`\\*`), no smart-quote or dash conversion.
+
+Output layout:
+    - Body paragraphs in document order; headings as `#`, list items as `- `.
+    - Existing tracked changes inline as CriticMarkup: `{++inserted++}` and
+      `{--deleted--}`. Text inside these marks is not matchable; the text on
+      either side of them joins directly.
+    - Footnotes and endnotes at the end, as `[^id]: text`.
+
+Usage:
+    python read_docx.py <source.docx> [output.md] [--locators]
+
+A .pptx source is rendered by pptx_edits.deck_to_markdown: slide and
+speaker-notes text under "## Slide N" / "## Notes N" headings.
+
+With --locators every paragraph is prefixed with its locator (e.g.
+"[document:41]"), as in chunk_document.py output.
+"""
+
+import argparse
+import os
+import sys
+import zipfile
+
+from apply_copyedits import (
+    STORY_PARTS, W, etree, heading_level, heading_styles,
+)
+
+NOTE_PARTS = {
+    'footnotes': ('footnote', 'Footnotes'),
+    'endnotes': ('endnote', 'Endnotes'),
+}
+
+
+def render_runs(para):
+    """Render a paragraph's runs, marking existing insertions and deletions.
+
+    Plain runs contribute exactly what build_text_map sees (the first w:t of
+    each run); runs inside w:ins/w:del are wrapped in CriticMarkup.
+    """
+    ins_tag = f'{{{W}}}ins'
+    del_tag = f'{{{W}}}del'
+    pieces = []
+    group = None  # (revision element, kind, [texts])
+
+    def flush():
+        if group is not None and ''.join(group[2]):
+            mark = '++' if group[1] == 'ins' else '--'
+            pieces.append(f'{{{mark}{"".join(group[2])}{mark}}}')
+
+    for run in para.iter(f'{{{W}}}r'):
+        parent = run.getparent()
+        if parent.tag == del_tag:
+            kind, t_elem = 'del', run.find(f'{{{W}}}delText')
+        elif parent.tag == ins_tag:
+            kind, t_elem = 'ins', run.find(f'{{{W}}}t')
+        else:
+            kind, t_elem = None, run.find(f'{{{W}}}t')
+        text = t_elem.text if t_elem is not None and t_elem.text else ''
+
+        if kind is None:
+            flush()
+            group = None
+            pieces.append(text)
+        elif group is not None and group[0] is parent:
+            group[2].append(text)
+        else:
+            flush()
+            group = (parent, kind, [text])
+    flush()
+    return ''.join(pieces)
+
+
+def render_paragraph(para, styles):
+    """Render one paragraph as a markdown block (without locator)."""
+    text = render_runs(para)
+    level = heading_level(para, styles)
+    if level is not None:
+        return '#' * max(level, 1) + ' ' + text
+    ppr = para.find(f'{{{W}}}pPr')
+    if ppr is not None and ppr.find(f'{{{W}}}numPr') is not None:
+        return '- ' + text
+    return text
+
+
+def docx_to_markdown(docx_path, locators=False):
+    """Render the body, footnotes and endnotes of a docx as markdown."""
+    parser = etree.XMLParser(remove_blank_text=False)
+    blocks = []
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        styles_root = None
+        if 'word/styles.xml' in names:
+            styles_root = etree.fromstring(z.read('word/styles.xml'), parser)
+        styles = heading_styles(styles_root)
+
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            # Paragraph indices count every w:p in the part, like the applier
+            index = {p: i for i, p in enumerate(root.iter(f'{{{W}}}p'))}
+
+            if part == 'document':
+                for para, i in index.items():
+                    text = render_paragraph(para, styles)
+                    if text.strip():
+                        prefix = f'[{part}:{i}] ' if locators else ''
+                        blocks.append(prefix + text)
+                continue
+
+            note_tag, title = NOTE_PARTS[part]
+            notes = []
+            for note in root.findall(f'{{{W}}}{note_tag}'):
+                # Separator and continuation notes have no author text
+                if note.get(f'{{{W}}}type') not in (None, 'normal'):
+                    continue
+                note_id = note.get(f'{{{W}}}id')
+                for j, para in enumerate(note.iter(f'{{{W}}}p')):
+                    text = render_runs(para)
+                    if not text.strip():
+                        continue
+                    prefix = f'[{part}:{index[para]}] ' if locators else ''
+                    lead = f'[^{note_id}]: ' if j == 0 else '    '
+                    notes.append(prefix + lead + text)
+            if notes:
+                blocks.append(f'## {title}')
+                blocks.extend(notes)
+
+    return '\n\n'.join(blocks) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a .docx as markdown using the applier's text."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("output", nargs="?", help="output .md (default: stdout)")
+    parser.add_argument("--locators", action="store_true",
+                        help="prefix each paragraph with its [part:index] locator")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    if args.source.lower().endswith('.pptx'):
+        from pptx_edits import deck_to_markdown
+        markdown = deck_to_markdown(args.source, locators=args.locators)
+    else:
+        markdown = docx_to_markdown(args.source, locators=args.locators)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        print(f"Wrote {args.output} ({len(markdown):,} characters)")
+    else:
+        sys.stdout.write(markdown)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+readability.py — Report sentence length, readability and passive voice per section.
+
+Verbosity findings and edit counts say what was fixed, not where a document
+is dense. This script reads the body text once, section by section (each
+heading starts one), and reports for every section: paragraphs, words,
+sentences, sentence length (mean, median, 90th percentile, longest), the
+share of long sentences, Flesch Reading Ease, Flesch-Kincaid grade and the
+share of sentences in the passive voice. The report is a Markdown table, or
+JSON with --json.
+
+--findings also writes comment_only findings on the outliers: sentences
+longer than --long-sentence words, and paragraphs whose grade level is far
+above the document's (two standard deviations). Protected sections, tables
+of contents and notes are left out.
+
+Usage:
+    python readability.py <source.docx> [--findings FILE] [--append]
+        [--long-sentence N] [--json]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+
+from apply_copyedits import (
+    build_findings, read_story_paragraphs, reviewable_paragraphs, write_findings,
+)
+
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z’'-]*|\d[\d,.]*")
+SENTENCE_END_RE = re.compile(r'[.!?]+["”’)\]]*(?=\s|$)')
+# Periods that do not end a sentence: "U.S.", "e.g.", "Dr."
+ABBREVIATION_RE = re.compile(r'(?:\b[A-Za-z]\.){2,}$|\b(?:vs|Dr|Mr|Ms|Mrs|St|No|Jr|Inc)\.$')
+VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+
+# A form of "to be", an optional adverb, then a past participle
+IRREGULAR_PARTICIPLES = (
+    'known|made|given|taken|shown|seen|done|built|found|held|left|paid|set|sent|'
+    'spent|told|written|chosen|drawn|driven|grown|brought|bought|thought|taught|'
+    'caught|kept|led|met|put|read|run|said|sold|understood|won|begun|broken|'
+    'forgotten|hidden|spoken|stolen|worn|cut|hit|hurt|let|shut|split|spread'
+)
+PASSIVE_RE = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being|’s)\s+(?:\w+ly\s+)?"
+    rf"(?:\w+ed|{IRREGULAR_PARTICIPLES})\b",
+    re.IGNORECASE,
+)
+
+DEFAULT_LONG_SENTENCE = 35
+
+# Paragraphs shorter than this are too small for a grade level to mean much
+MIN_OUTLIER_WORDS = 40
+
+# How far above the document's mean grade level a paragraph is an outlier
+OUTLIER_SD = 2.0
+
+
+def syllables(word):
+    """Rough syllable count from vowel groups; good enough for the indices."""
+    w = word.lower().strip("’'")
+    if not w.isalpha():
+        return 1
+    if len(w) <= 3:
+        return 1
+    if w.endswith(('es', 'ed')) and not w.endswith(('ted', 'ded', 'ses', 'zes', 'ces')):
+        w = w[:-2]
+    elif w.endswith('e') and not w.endswith('le'):
+        w = w[:-1]
+    return max(1, len(VOWEL_GROUP_RE.findall(w)))
+
+
+def flesch(words, sentences, syllable_count):
+    """(Reading Ease, Kincaid grade), or (None, None) for empty text."""
+    if not words or not sentences:
+        return None, None
+    per_sentence = words / sentences
+    per_word = syllable_count / words
+    return (206.835 - 1.015 * per_sentence - 84.6 * per_word,
+            0.39 * per_sentence + 11.8 * per_word - 15.59)
+
+
+def sentences(text):
+    """(start, end) of each sentence of a paragraph."""
+    spans = []
+    start = 0
+    for m in SENTENCE_END_RE.finditer(text):
+        if ABBREVIATION_RE.search(text, start, m.end()):
+            continue
+        spans.append((start, m.end()))
+        start = m.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def analyze(paragraphs, long_sentence=DEFAULT_LONG_SENTENCE):
+    """One pass over the body paragraphs.
+
+    Returns (sections, rows): sections is a list of per-section dicts of
+    totals (heading, paragraphs, words, sentences, syllables, passive,
+    long, lengths), in document order, the first titled "(Front matter)"
+    if text precedes the first heading; rows has one dict per paragraph
+    (para, section index, words, sentences, syllables, grade, long — the
+    (start, end, words) of each long sentence).
+    """
+    sections = []
+    rows = []
+
+    def new_section(heading):
+        sections.append({
+            'heading': heading, 'paragraphs': 0, 'words': 0, 'sentences': 0,
+            'syllables': 0, 'passive': 0, 'long': 0, 'lengths': [],
+        })
+
+    for pi, para in reviewable_paragraphs(paragraphs):
+        if para['part'] != 'document' or para['toc']:
+            continue
+        if para['level'] is not None:
+            new_section(para['text'].strip())
+            continue
+        if not sections:
+            new_section('(Front matter)')
+        section = sections[-1]
+        text = para['text']
+
+        row = {'para': pi, 'section': len(sections) - 1, 'words': 0, 'sentences': 0,
+               'syllables': 0, 'long': []}
+        for s_start, s_end in sentences(text):
+            sentence = text[s_start:s_end]
+            words = WORD_RE.findall(sentence)
+            if not words:
+                continue
+            count = len(words)
+            row['words'] += count
+            row['sentences'] += 1
+            row['syllables'] += sum(syllables(w) for w in words)
+            section['lengths'].append(count)
+            if PASSIVE_RE.search(sentence):
+                section['passive'] += 1
+            if count > long_sentence:
+                section['long'] += 1
+                start = s_start + len(sentence) - len(sentence.lstrip())
+                row['long'].append((start, s_end, count))
+        if not row['words']:
+            continue
+        row['grade'] = flesch(row['words'], row['sentences'], row['syllables'])[1]
+        section['paragraphs'] += 1
+        for key in ('words', 'sentences', 'syllables'):
+            section[key] += row[key]
+        rows.append(row)
+    return [s for s in sections if s['words']], rows
+
+
+def section_metrics(section):
+    """Report figures for one section's totals."""
+    lengths = sorted(section['lengths'])
+    ease, grade = flesch(section['words'], section['sentences'], section['syllables'])
+    sentences = section['sentences']
+    return {
+        'heading': section['heading'],
+        'paragraphs': section['paragraphs'],
+        'words': section['words'],
+        'sentences': sentences,
+        'mean_sentence': round(section['words'] / sentences, 1) if sentences else None,
+        'median_sentence': _percentile(lengths, 0.5),
+        'p90_sentence': _percentile(lengths, 0.9),
+        'longest_sentence': lengths[-1] if lengths else None,
+        'long_pct': round(100 * section['long'] / sentences, 1) if sentences else None,
+        'reading_ease': round(ease, 1) if ease is not None else None,
+        'grade': round(grade, 1) if grade is not None else None,
+        'passive_pct': round(100 * section['passive'] / sentences, 1) if sentences else None,
+    }
+
+
+def document_totals(sections):
+    """The sections' totals added up, as one section."""
+    total = {'heading': 'Whole document', 'paragraphs': 0, 'words': 0, 'sentences': 0,
+             'syllables': 0, 'passive': 0, 'long': 0, 'lengths': []}
+    for s in sections:
+        for key in ('paragraphs', 'words', 'sentences', 'syllables', 'passive', 'long'):
+            total[key] += s[key]
+        total['lengths'].extend(s['lengths'])
+    return total
+
+
+def outlier_matches(paragraphs, rows, long_sentence=DEFAULT_LONG_SENTENCE):
+    """Matches for build_findings(): long sentences and hard paragraphs."""
+    matches = []
+    grades = [r['grade'] for r in rows if r['words'] >= MIN_OUTLIER_WORDS]
+    mean = sum(grades) / len(grades) if grades else 0
+    sd = math.sqrt(sum((g - mean) ** 2 for g in grades) / len(grades)) if grades else 0
+    for row in rows:
+        text = paragraphs[row['para']]['text']
+        if grades and row['words'] >= MIN_OUTLIER_WORDS and row['grade'] > mean + OUTLIER_SD * sd:
+            end = min(len(text), _first_words_end(text, 0, 8))
+            matches.append({
+                'para': row['para'], 'start': 0, 'end': end, 'new': None,
+                'category': 'Clarity', 'rule': 'dense-paragraph',
+                'comment': (f"Clarity: this paragraph reads at grade {row['grade']:.0f}, "
+                            f"well above the document's average of {mean:.0f}; consider "
+                            "shorter sentences or plainer wording."),
+            })
+            continue
+        for start, end, count in row['long']:
+            matches.append({
+                'para': row['para'], 'start': start, 'end': _first_words_end(text, start, 8),
+                'new': None, 'category': 'Clarity', 'rule': 'long-sentence',
+                'comment': (f"Clarity: this sentence runs {count} words (over {long_sentence}); "
+                            "consider splitting it."),
+            })
+    return matches
+
+
+def _first_words_end(text, start, n):
+    """End offset of the first n words of text from start."""
+    words = list(re.finditer(r'\S+', text[start:]))
+    return start + words[min(n, len(words)) - 1].end() if words else len(text)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  REPORT
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Longer headings are cut short in the table
+HEADING_WIDTH = 50
+
+
+def _cell(value):
+    return '' if value is None else str(value)
+
+
+def format_report(metrics, long_sentence=DEFAULT_LONG_SENTENCE):
+    """Per-section table as Markdown, whole document last."""
+    lines = [
+        "## Readability by Section", "",
+        f"| Section | Paragraphs | Words | Sentences | Mean length | Median | 90th pct "
+        f"| Longest | % over {long_sentence} words | Reading ease | Grade | % passive |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for m in metrics:
+        name = m['heading']
+        if len(name) > HEADING_WIDTH:
+            name = name[:HEADING_WIDTH].rstrip() + '…'
+        if m is metrics[-1]:
+            name = f"**{name}**"
+        lines.append("| " + " | ".join([name.replace('|', '/')] + [_cell(m[k]) for k in (
+            'paragraphs', 'words', 'sentences', 'mean_sentence', 'median_sentence',
+            'p90_sentence', 'longest_sentence', 'long_pct', 'reading_ease', 'grade',
+            'passive_pct',
+        )]) + " |")
+    lines += ["", "Reading ease: higher is easier (60-70 is plain English). "
+              "Grade: U.S. school grade needed to follow the text."]
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report readability, sentence length and passive voice per section of a .docx."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("--findings", metavar="FILE",
+                        help="also write comment_only findings on outlier sentences and paragraphs")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    parser.add_argument("--long-sentence", type=int, default=DEFAULT_LONG_SENTENCE,
+                        help=f"words above which a sentence is long (default {DEFAULT_LONG_SENTENCE})")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of Markdown")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs = read_story_paragraphs(args.source)
+    sections, rows = analyze(paragraphs, args.long_sentence)
+    metrics = [section_metrics(s) for s in sections]
+    metrics.append(section_metrics(document_totals(sections)))
+
+    if args.json:
+        print(json.dumps(metrics, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(metrics, args.long_sentence))
+
+    if args.findings:
+        findings = build_findings(paragraphs, outlier_matches(paragraphs, rows, args.long_sentence))
+        write_findings(findings, args.findings, append=args.append)
+        if not args.json:
+            print(f"\nWrote {len(findings)} findings to {args.findings}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
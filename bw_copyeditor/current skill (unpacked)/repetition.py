@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+repetition.py — Flag repeated words and phrases, and wordy constructions.
+
+Repetition and Verbosity are among the most frequent findings, and the
+model otherwise finds them only by reading. This script tokenizes the body
+text once and walks the token stream a single time, across paragraph and
+section boundaries, keeping for every word and n-gram the position where it
+was last seen. That flags, in time linear in the document length:
+
+    - a content word used again within --distance words
+    - a modal verb ("may," "could," ...) used again in the same or the
+      next sentence
+    - a phrase of 3-5 words repeated within --phrase-window words
+    - consecutive sentences that start with the same word
+
+Words and phrases that run through the whole document (the topic terms,
+e.g. "outcomes-based funding") are not flagged. These are comment_only
+findings: the fix is a rewording only the model or the author can choose.
+Known wordy constructions ("due to the fact that," "help to <verb>") come
+from the Verbosity rules of style_rules.py and are tracked changes where
+the fix is mechanical.
+
+Usage:
+    python repetition.py <source.docx> <findings.jsonl> [--distance N]
+        [--phrase-window N] [--no-wordy] [--deliverable TYPE] [--append]
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from apply_copyedits import (
+    build_findings, read_story_paragraphs, reviewable_paragraphs, write_findings,
+)
+from style_rules import DELIVERABLES, find_rule_matches
+
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z’'-]*[A-Za-z]|[A-Za-z]")
+SENTENCE_END_RE = re.compile(r'[.!?]["”’)\]]*(?:\s|$)')
+
+STOPWORDS = frozenset('''
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by did do does doing down during each
+    few for from further had has have having he her here hers herself him himself
+    his how i if in into is it its itself just me more most my myself no nor not
+    now of off on once only or other our ours ourselves out over own same she so
+    some such than that the their theirs them themselves then there these they
+    this those through to too under until up very was we were what when where
+    which while who whom why with you your yours yourself yourselves
+    one two three four five six seven eight nine ten many much well even however
+    many within without across among per via
+'''.split())
+
+MODALS = frozenset(('may', 'might', 'could', 'can', 'should', 'would', 'must', 'will'))
+
+# Shortest word the single-word check looks at
+MIN_WORD_LENGTH = 4
+
+# A word or phrase seen at least this often per 1,000 words is a topic term
+TOPIC_RATE = 1.5
+
+PHRASE_SIZES = (5, 4, 3)
+
+# A phrase does not run across these
+PHRASE_BREAK_RE = re.compile(r'[()\[\]:;"“”]')
+
+
+def tokenize(paragraphs):
+    """Tokens of the reviewable body paragraphs, as one stream.
+
+    Returns a list of (para index, start, end, word, lowered, sentence,
+    sentence_start) tuples. Sentence numbers run across the whole stream;
+    sentence_start marks the first word of a sentence. Headings, table of
+    contents lines, notes and protected sections are left out.
+    """
+    tokens = []
+    sentence = 0
+    for pi, para in reviewable_paragraphs(paragraphs):
+        if para['part'] != 'document' or para['level'] is not None or para['toc']:
+            continue
+        text = para['text']
+        sentence += 1
+        prev_end = None
+        for m in WORD_RE.finditer(text):
+            starts = prev_end is None
+            if prev_end is not None and SENTENCE_END_RE.search(text, prev_end, m.start()):
+                sentence += 1
+                starts = True
+            word = m.group()
+            tokens.append((pi, m.start(), m.end(), word, word.lower().replace('’', "'"),
+                           sentence, starts))
+            prev_end = m.end()
+    return tokens
+
+
+def topic_terms(tokens):
+    """Lowered words and 2-grams frequent enough to be the document's subject."""
+    counts = {}
+    words = [t[4] for t in tokens]
+    for i, w in enumerate(words):
+        counts[w] = counts.get(w, 0) + 1
+        if i:
+            pair = (words[i - 1], w)
+            counts[pair] = counts.get(pair, 0) + 1
+    floor = max(4, TOPIC_RATE * len(words) / 1000)
+    return {term for term, n in counts.items() if n >= floor}
+
+
+def _is_proper(token):
+    # A capitalized word that does not start a sentence is a name
+    return token[3][0].isupper() and not token[6]
+
+
+def find_repetitions(paragraphs, distance=12, phrase_window=150):
+    """Scan the token stream once; returns matches for build_findings()."""
+    tokens = tokenize(paragraphs)
+    topics = topic_terms(tokens)
+    matches = []
+    last_word = {}       # lowered word -> token index last seen
+    last_phrase = {}     # n-gram tuple -> token index of its last word
+    flagged_until = -1   # token index up to which a phrase was already flagged
+    prev_opening = None  # (lowered first word, sentence) of the previous sentence
+    phrases = []         # matches flagged as phrases
+
+    def flag(first, last, comment):
+        matches.append({
+            'para': tokens[first][0], 'start': tokens[first][1], 'end': tokens[last][2],
+            'new': None, 'category': 'Repetition', 'comment': comment, 'rule': 'repetition',
+        })
+
+    for i, tok in enumerate(tokens):
+        pi, _, _, word, low, sentence, starts = tok
+
+        # Phrases: the longest n-gram ending here that was seen recently
+        for n in PHRASE_SIZES:
+            if i + 1 < n:
+                continue
+            gram = tuple(t[4] for t in tokens[i - n + 1:i + 1])
+            seen = last_phrase.get(gram)
+            last_phrase[gram] = i
+            if (seen is None or i - seen > phrase_window or seen > i - n
+                    or i - n + 1 <= flagged_until):
+                continue
+            if gram[0] in STOPWORDS or gram[-1] in STOPWORDS:
+                continue
+            if any(tokens[j][0] != pi for j in range(i - n + 1, i + 1)):
+                continue
+            content = [w for w in gram if w not in STOPWORDS]
+            if all(w in topics for w in content) or (len(content) == 2 and tuple(content) in topics):
+                continue
+            phrase = paragraphs[pi]['text'][tokens[i - n + 1][1]:tok[2]]
+            if PHRASE_BREAK_RE.search(phrase):
+                continue
+            flag(i - n + 1, i, f"Repetition: \"{phrase}\" repeats within {i - seen} words; "
+                               "consider rephrasing the second use.")
+            phrases.append(matches[-1])
+            flagged_until = i
+
+        # Modal verbs: again in the same or the next sentence
+        seen = last_word.get(low)
+        if low in MODALS and seen is not None and sentence - tokens[seen][5] <= 1 \
+                and i > flagged_until:
+            flag(i, i, f"Repetition: \"{low}\" is used in adjacent sentences; vary modal verbs.")
+
+        # Content words: again within `distance` words
+        elif (seen is not None and i - seen <= distance and i > flagged_until
+              and len(low) >= MIN_WORD_LENGTH and low not in STOPWORDS
+              and low not in MODALS and low not in topics
+              and not _is_proper(tok) and not _is_proper(tokens[seen])):
+            flag(i, i, f"Repetition: \"{low}\" appears twice within {i - seen} words; "
+                       "vary the wording.")
+        last_word[low] = i
+
+        # Sentence openings
+        if starts:
+            if (prev_opening is not None and prev_opening[0] == low
+                    and prev_opening[1] == sentence - 1 and low not in ('the', 'a', 'an')):
+                flag(i, i, f"Repetition: consecutive sentences start with \"{word}\"; "
+                           "vary the opening.")
+            prev_opening = (low, sentence)
+
+    # A word flagged inside a flagged phrase adds nothing
+    return [
+        m for m in matches
+        if any(m is p for p in phrases) or not any(
+            p['para'] == m['para'] and p['start'] <= m['start'] and m['end'] <= p['end']
+            for p in phrases
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write repetition and verbosity findings for a .docx."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("findings", help="findings.jsonl to write")
+    parser.add_argument("--distance", type=int, default=12,
+                        help="flag a word repeated within this many words (default 12)")
+    parser.add_argument("--phrase-window", type=int, default=150,
+                        help="flag a 3-5 word phrase repeated within this many words (default 150)")
+    parser.add_argument("--no-wordy", action="store_true",
+                        help="skip the wordy-construction rules")
+    parser.add_argument("--deliverable", choices=DELIVERABLES, default="publication",
+                        help="deliverable type for the wordy rules (default: publication)")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs = read_story_paragraphs(args.source)
+    matches = find_repetitions(paragraphs, args.distance, args.phrase_window)
+    wordy = [] if args.no_wordy else find_rule_matches(
+        paragraphs, args.deliverable, categories=('Verbosity',)
+    )
+    findings = build_findings(paragraphs, matches + wordy)
+    write_findings(findings, args.findings, append=args.append)
+
+    print(f"Wrote {len(findings)} findings to {args.findings}")
+    print(f"  repetition: {len(matches)}")
+    print(f"  wordy constructions: {len(wordy)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+resolve_changes.py — Accept or reject all tracked changes in a .docx, and
+verify apply_copyedits.py output without opening Word.
+
+Resolves w:ins / w:del (and moves, paragraph-mark and table-row revisions,
+and formatting changes) the way Word's "Accept All" / "Reject All" do.
+Comment ranges, bookmarks and comment references inside removed content are
+kept in place, so every comment stays anchored.
+
+Usage:
+    python resolve_changes.py accept <source.docx> <output.(docx|txt)>
+    python resolve_changes.py reject <source.docx> <output.(docx|txt)>
+    python resolve_changes.py verify <source.docx> <edited.docx> <findings.jsonl> [--journal FILE]
+
+Text output has one line per paragraph of the body, footnotes and endnotes
+(use "-" for stdout). verify checks that rejecting every change in the edited
+file gives back the source text, and that accepting them puts every
+tracked change in place: at the paragraph and offsets the apply journal
+records, or without one in a paragraph that held its old_text. It exits 1
+if either check fails.
+"""
+
+import argparse
+import copy
+import os
+import sys
+import zipfile
+
+from apply_copyedits import (
+    STORY_PARTS, W, etree, normalize_for_search, paragraph_text, parse_findings,
+    read_journal, read_story_paragraphs,
+)
+
+# Parts other than STORY_PARTS that can carry revisions
+REVISION_PART_PREFIXES = ('word/header', 'word/footer', 'word/comments.xml')
+
+# Property-change records; each holds the previous properties as its child
+PROPERTY_CHANGES = (
+    'rPrChange', 'pPrChange', 'sectPrChange', 'tblPrChange', 'tblPrExChange',
+    'trPrChange', 'tcPrChange', 'tblGridChange',
+)
+
+# Zero-width markers that must survive when the content around them is removed
+ANCHOR_MARKERS = (
+    'commentRangeStart', 'commentRangeEnd', 'bookmarkStart', 'bookmarkEnd',
+    'permStart', 'permEnd',
+)
+
+# Move ranges only delimit moveFrom/moveTo content; both sides drop them
+MOVE_RANGES = (
+    'moveFromRangeStart', 'moveFromRangeEnd', 'moveToRangeStart', 'moveToRangeEnd',
+)
+
+
+def _w(tag):
+    return f'{{{W}}}{tag}'
+
+
+def _remove_content(elem):
+    """Remove a revision element and its content, keeping anchor markers.
+
+    Comment ranges and bookmarks are moved to where the element was; a run
+    holding a comment reference is kept with only its reference.
+    """
+    parent = elem.getparent()
+    if parent is None:
+        return
+    kept = [m for m in elem.iter(*[_w(t) for t in ANCHOR_MARKERS]) if m is not elem]
+    for run in elem.iter(_w('r')):
+        ref = run.find(_w('commentReference'))
+        if ref is not None:
+            for child in list(run):
+                if child.tag not in (_w('rPr'), _w('commentReference')):
+                    run.remove(child)
+            kept.append(run)
+    # Markers keep their document order
+    order = {e: i for i, e in enumerate(elem.iter())}
+    for marker in sorted(kept, key=order.get):
+        marker.tail = None
+        elem.addprevious(marker)
+    _drop(elem)
+
+
+def _drop(elem):
+    """Remove elem, keeping its tail text (whitespace) on the previous node."""
+    parent = elem.getparent()
+    if elem.tail:
+        prev = elem.getprevious()
+        if prev is not None:
+            prev.tail = (prev.tail or '') + elem.tail
+        else:
+            parent.text = (parent.text or '') + elem.tail
+    parent.remove(elem)
+
+
+def _unwrap(elem, restore_deleted=False):
+    """Replace a revision element with its children.
+
+    With restore_deleted, deleted text becomes ordinary text again
+    (w:delText -> w:t, w:delInstrText -> w:instrText).
+    """
+    if restore_deleted:
+        for node in elem.iter(_w('delText'), _w('delInstrText')):
+            node.tag = _w('t') if node.tag == _w('delText') else _w('instrText')
+        for run in elem.iter(_w('r')):
+            run.attrib.pop(_w('rsidDel'), None)
+    for child in list(elem):
+        elem.addprevious(child)
+    _drop(elem)
+
+
+def _merge_with_next(para):
+    """Join a paragraph whose mark is removed with the following paragraph.
+
+    The merged paragraph keeps the following paragraph's properties, as in
+    Word. Paragraphs that end a section, or have no following paragraph in
+    the same container, are left as they are.
+    """
+    nxt = para.getnext()
+    ppr = para.find(_w('pPr'))
+    if nxt is None or nxt.tag != _w('p'):
+        return False
+    if ppr is not None and ppr.find(_w('sectPr')) is not None:
+        return False
+    content = [c for c in para if c.tag != _w('pPr')]
+    nxt_ppr = nxt.find(_w('pPr'))
+    for child in reversed(content):
+        if nxt_ppr is not None:
+            nxt_ppr.addnext(child)
+        else:
+            nxt.insert(0, child)
+    _drop(para)
+    return True
+
+
+def _restore_properties(change):
+    """Reject a property change: put back the properties it recorded."""
+    props = change.getparent()
+    old = change[0] if len(change) else None
+    # Paragraph-mark run properties and section breaks are not part of pPrChange
+    keep = (_w('rPr'), _w('sectPr')) if props.tag == _w('pPr') else ()
+    for child in list(props):
+        if child is not change and child.tag not in keep:
+            props.remove(child)
+    if old is not None:
+        for child in reversed(list(old)):
+            change.addnext(child)
+    props.remove(change)
+
+
+def resolve_revisions(root, accept=True):
+    """Accept (or reject) every revision under root, in place.
+
+    Returns the number of revision elements resolved.
+    """
+    drop = (_w('del'), _w('moveFrom')) if accept else (_w('ins'), _w('moveTo'))
+    keep = (_w('ins'), _w('moveTo')) if accept else (_w('del'), _w('moveFrom'))
+    count = 0
+
+    # Paragraph marks and table rows: the marker lives in pPr/rPr or trPr
+    merges = []
+    for marker in list(root.iter(*drop, *keep)):
+        props = marker.getparent()
+        owner = props.getparent() if props is not None else None
+        if props.tag == _w('rPr') and owner is not None and owner.tag == _w('pPr'):
+            if marker.tag in drop:
+                merges.append(owner.getparent())
+        elif props.tag == _w('trPr'):
+            if marker.tag in drop:
+                _remove_content(owner)
+        else:
+            continue
+        props.remove(marker)
+        count += 1
+
+    # Formatting changes
+    for change in list(root.iter(*[_w(t) for t in PROPERTY_CHANGES])):
+        if change.getparent() is None:
+            continue
+        if accept:
+            change.getparent().remove(change)
+        else:
+            _restore_properties(change)
+        count += 1
+
+    # Inserted and deleted content; outer elements come first, so content
+    # nested in something already removed is never reinserted
+    for elem in list(root.iter(*drop)):
+        _remove_content(elem)
+        count += 1
+    for elem in list(root.iter(*keep)):
+        _unwrap(elem, restore_deleted=not accept)
+        count += 1
+    for elem in list(root.iter(*[_w(t) for t in MOVE_RANGES])):
+        _drop(elem)
+
+    for para in merges:
+        if para.getparent() is not None:
+            _merge_with_next(para)
+    return count
+
+
+def _revision_parts(names):
+    return [
+        n for n in names
+        if n in dict(STORY_PARTS).values()
+        or (n.startswith(REVISION_PART_PREFIXES) and n.endswith('.xml'))
+    ]
+
+
+def resolve_docx(src_docx, output_docx, accept=True):
+    """Write a copy of src_docx with every revision accepted or rejected.
+
+    Untouched parts are copied byte for byte with their original ZIP entry
+    metadata. Returns the number of revisions resolved.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    count = 0
+    with zipfile.ZipFile(src_docx, 'r') as zin, \
+            zipfile.ZipFile(output_docx, 'w', zipfile.ZIP_DEFLATED) as zout:
+        targets = set(_revision_parts(zin.namelist()))
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename in targets:
+                root = etree.fromstring(data, parser)
+                n = resolve_revisions(root, accept)
+                if n:
+                    count += n
+                    data = etree.tostring(
+                        root, xml_declaration=True, encoding='UTF-8', standalone=True
+                    )
+            zout.writestr(info, data)
+    return count
+
+
+def resolved_paragraphs(docx_path, accept=True):
+    """Paragraph texts of the story parts with every revision resolved.
+
+    Returns a list of (locator, text) in document order, parts in
+    STORY_PARTS order; locators index the resolved paragraphs.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    result = []
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            resolve_revisions(root, accept)
+            for i, para in enumerate(root.iter(_w('p'))):
+                result.append((f'{part}:{i}', paragraph_text(para)))
+    return result
+
+
+def resolved_text(docx_path, accept=True):
+    """Accepted (or rejected) plain text, one line per paragraph."""
+    return ''.join(text + '\n' for _, text in resolved_paragraphs(docx_path, accept))
+
+
+def paragraphs_resolved_alone(docx_path, accept=True):
+    """Paragraph texts of the story parts, each paragraph resolved on its own.
+
+    Returns {locator: text}. Unlike resolved_paragraphs, a removed paragraph
+    mark does not merge two paragraphs, so locators stay those of the
+    unresolved document, as in read_story_paragraphs and the journal.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    result = {}
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            for i, para in enumerate(root.iter(_w('p'))):
+                holder = etree.Element(_w('body'))
+                holder.append(copy.deepcopy(para))
+                resolve_revisions(holder, accept)
+                result[f'{part}:{i}'] = ''.join(paragraph_text(p) for p in holder)
+    return result
+
+
+def _verify_journal(source, accepted, journal):
+    """Findings whose journalled edits are not in place once all are accepted.
+
+    Each paragraph an edit landed in must read, once accepted, as the source
+    paragraph with every applied edit spliced in at its offsets.
+    """
+    spliced = {}
+    for entry in journal:
+        for edit in entry['edits']:
+            if edit['kind'] == 'change' and edit['applied']:
+                locator = f"{edit['part']}:{edit['paragraph']}"
+                spliced.setdefault(locator, []).append(edit)
+    in_place = set()
+    for locator, edits in spliced.items():
+        text = source.get(locator, '')
+        for edit in sorted(edits, key=lambda e: e['start'], reverse=True):
+            if text[edit['start']:edit['end']] != edit['old']:
+                break
+            text = text[:edit['start']] + edit['new'] + text[edit['end']:]
+        else:
+            if accepted.get(locator) == text:
+                in_place.add(locator)
+
+    missing = []
+    for entry in journal:
+        if entry['type'] != 'tracked_change' or entry['status'] == 'duplicate':
+            continue
+        changes = [e for e in entry['edits'] if e['kind'] == 'change' and e['applied']]
+        bad = [f"{e['part']}:{e['paragraph']}" for e in changes
+               if f"{e['part']}:{e['paragraph']}" not in in_place]
+        if not changes or bad:
+            missing.append((bad[0] if bad else entry['status'], entry['category'], entry['target']))
+    return missing
+
+
+def _verify_findings(source, accepted, findings):
+    """Tracked-change findings with no source paragraph that changed as asked.
+
+    Without a journal, a finding counts as applied if some paragraph that
+    held its old_text, once accepted, holds fewer of old_text or more of
+    new_text than the source did.
+    """
+    missing = []
+    for f in findings:
+        if f['type'] != 'tracked_change' or not f.get('new_text'):
+            continue
+        old_variants = normalize_for_search(f['old_text'])
+        new_variants = normalize_for_search(f['new_text'])
+        held = []
+        for locator, text in source.items():
+            old = next((v for v in old_variants if v in text), None)
+            if old is not None:
+                held.append(locator)
+                after = accepted.get(locator, '')
+                if (after.count(old) < text.count(old)
+                        or any(after.count(v) > text.count(v) for v in new_variants)):
+                    break
+        else:
+            missing.append((held[0] if held else None, f.get('category', ''), f['new_text']))
+    return missing
+
+
+def verify_output(src_docx, edited_docx, findings, journal=None):
+    """Check an edited docx against its source and findings.
+
+    Returns (mismatches, missing): paragraphs where rejecting all changes
+    does not give back the source text, as (locator, expected, actual), and
+    tracked-change findings not in place once all changes are accepted, as
+    (where, category, text), where being a locator, a journal status, or
+    None if the text was not found. With a journal (apply_copyedits.py
+    --journal) each edit is checked at the paragraph and offsets it
+    records; otherwise in the paragraphs that held the finding's old_text.
+    """
+    original = resolved_paragraphs(src_docx, accept=False)
+    rejected = resolved_paragraphs(edited_docx, accept=False)
+    mismatches = []
+    for i in range(max(len(original), len(rejected))):
+        expected = original[i] if i < len(original) else (None, None)
+        actual = rejected[i] if i < len(rejected) else (None, None)
+        if expected[1] != actual[1]:
+            mismatches.append((expected[0] or actual[0], expected[1], actual[1]))
+
+    source = {p['locator']: p['text'] for p in read_story_paragraphs(src_docx)}
+    accepted = paragraphs_resolved_alone(edited_docx, accept=True)
+    if journal is not None:
+        return mismatches, _verify_journal(source, accepted, journal)
+    return mismatches, _verify_findings(source, accepted, findings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Accept or reject all tracked changes, or verify edited output."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for mode in ("accept", "reject"):
+        sp = sub.add_parser(mode, help=f"{mode} every tracked change")
+        sp.add_argument("source", help="source .docx")
+        sp.add_argument("output", help="output .docx, or text file (\"-\" for stdout)")
+    vp = sub.add_parser("verify", help="check apply_copyedits.py output")
+    vp.add_argument("source", help="original .docx")
+    vp.add_argument("edited", help=".docx written by apply_copyedits.py")
+    vp.add_argument("findings", help="findings.jsonl that was applied")
+    vp.add_argument("--journal",
+                    help="journal written by apply_copyedits.py --journal; checks each "
+                         "edit where it landed")
+    args = parser.parse_args()
+
+    inputs = [args.source]
+    if args.command == "verify":
+        inputs += [args.edited, args.findings] + ([args.journal] if args.journal else [])
+    for path in inputs:
+        if not os.path.exists(path):
+            print(f"Error: file not found: {path}")
+            return 1
+
+    if args.command in ("accept", "reject"):
+        accept = args.command == "accept"
+        if args.output.lower().endswith(".docx"):
+            n = resolve_docx(args.source, args.output, accept)
+            print(f"{args.command.capitalize()}ed {n} revisions: {args.output}")
+        elif args.output == "-":
+            sys.stdout.write(resolved_text(args.source, accept))
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(resolved_text(args.source, accept))
+            print(f"Wrote {args.output}")
+        return 0
+
+    findings = parse_findings(args.findings)
+    journal = read_journal(args.journal) if args.journal else None
+    mismatches, missing = verify_output(args.source, args.edited, findings, journal)
+    if journal is not None:
+        edits = sum(1 for e in journal
+                    if e['type'] == 'tracked_change' and e['status'] != 'duplicate')
+    else:
+        edits = sum(1 for f in findings if f['type'] == 'tracked_change' and f.get('new_text'))
+    print(f"Reject all: {'matches the source' if not mismatches else f'{len(mismatches)} paragraph(s) differ'}")
+    for locator, expected, actual in mismatches[:10]:
+        print(f"  [{locator}] expected: {(expected or '')[:70]!r}")
+        print(f"  {' ' * (len(locator) + 2)} got:      {(actual or '')[:70]!r}")
+    print(f"Accept all: {edits - len(missing)}/{edits} edits in place")
+    for locator, category, text in missing:
+        print(f"  - [{category}] {locator or 'not found'}: {text[:80]}")
+    return 1 if mismatches or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+retarget.py — Move findings onto a revised version of the source document.
+
+When the author edits the source while a review is in progress, every
+finding in a paragraph that changed stops matching and apply_copyedits.py
+reports it as failed. This script carries a findings file from the version
+it was written against to the revised one:
+
+    1. Every paragraph of both versions is fingerprinted by a hash of its
+       text, and the two hash sequences are diffed per story part, so
+       unchanged paragraphs align without comparing their text.
+    2. Changed paragraphs inside a diff block are paired by the rolling
+       hashes of their word shingles (4-word windows), which survive local
+       edits; paragraphs that moved are found through an index of the
+       shingles of the new paragraphs left unpaired.
+    3. Each finding is located in the old version the way
+       apply_copyedits.py would locate it, and its span is carried through a
+       character diff of the paired paragraphs. If the text it edits or
+       anchors on is still there, the finding is rewritten with context
+       that is unique in the new version.
+
+Findings whose target no longer exists are orphaned and listed, not
+written; they need another look at the revised text.
+
+Usage:
+    python retarget.py <old.docx> <new.docx> <findings.jsonl> <out.jsonl>
+        [--report orphans.jsonl]
+"""
+
+import argparse
+import difflib
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+
+from apply_copyedits import (
+    DIFF_TOKEN_RE, change_span, diff_text, find_hits, parse_findings,
+    read_story_paragraphs, unique_span, write_findings,
+)
+
+SHINGLE_WORDS = 4
+
+# Rolling hash parameters: base and a Mersenne prime modulus
+HASH_BASE = 1000003
+HASH_MOD = (1 << 61) - 1
+
+# Least share of shingles two paragraphs need in common to be paired
+MIN_SIMILARITY = 0.3
+
+# Least similarity (difflib ratio) a comment anchor may keep after a revision
+MIN_ANCHOR_RATIO = 0.6
+
+WORD_RE = re.compile(r'\S+')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FINGERPRINTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def fingerprint(text):
+    """Content hash of a paragraph, blind to whitespace differences."""
+    return hash(' '.join(text.split()))
+
+
+def shingles(text, k=SHINGLE_WORDS):
+    """Rolling hashes of every k-word window of text.
+
+    Each window's hash is derived from the previous one in constant time,
+    so a paragraph is hashed in one pass over its words.
+    """
+    words = [hash(w) % HASH_MOD for w in WORD_RE.findall(text.lower())]
+    if len(words) < k:
+        return {hash(tuple(words))} if words else set()
+    top = pow(HASH_BASE, k - 1, HASH_MOD)
+    h = 0
+    for w in words[:k]:
+        h = (h * HASH_BASE + w) % HASH_MOD
+    found = {h}
+    for i in range(k, len(words)):
+        h = ((h - words[i - k] * top) * HASH_BASE + words[i]) % HASH_MOD
+        found.add(h)
+    return found
+
+
+def similarity(a, b):
+    """Share of shingles in common (Jaccard) between two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ALIGNMENT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _same(offset, end=False):
+    return offset
+
+
+def offset_map(a, b):
+    """Function mapping character offsets of text a onto text b.
+
+    An offset where text was inserted maps past the insertion; with
+    end=True it maps before it, so the end of a span does not take in text
+    added right after the span.
+    """
+    ops = difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+    starts = [op[1] for op in ops]
+    ends = [op[2] for op in ops]
+
+    def convert(offset, end=False):
+        if end:
+            i = min(bisect_left(ends, offset), len(ops) - 1)
+        else:
+            i = max(bisect_right(starts, offset) - 1, 0)
+        tag, a1, a2, b1, b2 = ops[i]
+        if tag == 'equal':
+            return b1 + (offset - a1)
+        return b1 if offset <= a1 else b2
+    return convert
+
+
+def _pair_block(old_texts, new_texts, olds, news, mapping):
+    """Pair changed paragraphs of a diff block in order, by shingle overlap.
+
+    A block with as many paragraphs on both sides is an edit in place:
+    paragraphs too short to share shingles are then paired by position.
+    """
+    new_shingles = {j: shingles(new_texts[j]) for j in news}
+    in_place = len(olds) == len(news)
+    next_new = 0
+    for k, i in enumerate(olds):
+        mine = shingles(old_texts[i])
+        best, best_score = None, MIN_SIMILARITY
+        for n in range(next_new, len(news)):
+            score = similarity(mine, new_shingles[news[n]])
+            if score >= best_score:
+                best, best_score = n, score
+        if best is None and in_place and k >= next_new:
+            best = k
+        if best is not None:
+            mapping[i] = news[best]
+            next_new = best + 1
+
+
+def align_versions(old_paragraphs, new_paragraphs):
+    """Pair the paragraphs of two versions of a document.
+
+    Returns {old index: new index}, covering unchanged paragraphs, edited
+    paragraphs and moved ones. Paragraphs are only paired within the same
+    story part.
+    """
+    old_texts = [p['text'] for p in old_paragraphs]
+    new_texts = [p['text'] for p in new_paragraphs]
+    old_prints = [fingerprint(t) for t in old_texts]
+    new_prints = [fingerprint(t) for t in new_texts]
+    mapping = {}
+    for part in dict.fromkeys(p['part'] for p in old_paragraphs):
+        olds = [i for i, p in enumerate(old_paragraphs) if p['part'] == part]
+        news = [j for j, p in enumerate(new_paragraphs) if p['part'] == part]
+        matcher = difflib.SequenceMatcher(
+            None, [old_prints[i] for i in olds], [new_prints[j] for j in news], autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for k in range(i2 - i1):
+                    mapping[olds[i1 + k]] = news[j1 + k]
+            elif tag == 'replace':
+                _pair_block(old_texts, new_texts, olds[i1:i2], news[j1:j2], mapping)
+
+        # Moved paragraphs, found through an index of the free ones' shingles
+        paired = set(mapping.values())
+        free = {}
+        by_shingle = {}
+        for j in news:
+            if j not in paired and new_texts[j].strip():
+                free[j] = shingles(new_texts[j])
+                for h in free[j]:
+                    by_shingle.setdefault(h, []).append(j)
+        for i in olds:
+            if i in mapping or not old_texts[i].strip():
+                continue
+            mine = shingles(old_texts[i])
+            votes = {}
+            for h in mine:
+                for j in by_shingle.get(h, ()):
+                    if j in free:
+                        votes[j] = votes.get(j, 0) + 1
+            best, best_score = None, MIN_SIMILARITY
+            for j in sorted(votes, key=votes.get, reverse=True)[:5]:
+                score = similarity(mine, free[j])
+                if score >= best_score:
+                    best, best_score = j, score
+            if best is not None:
+                mapping[i] = best
+                del free[best]
+    return mapping
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RETARGET
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _nearest(text, target, pos):
+    """Start of the occurrence of target in text nearest to pos, or None."""
+    starts = [m.start() for m in re.finditer(re.escape(target), text)]
+    if not starts:
+        return None
+    return min(starts, key=lambda s: abs(s - pos))
+
+
+def _insertion_moved(matched, new_text, start, new, convert):
+    """Whether a pure insertion lost the words either side of its point.
+
+    The span of an insertion is only the token kept before (or after) it,
+    which can survive while the text on the other side changes: inserting
+    "all" into "funds colleges" must not land in "funds many colleges".
+    """
+    ops = [op for op in diff_text(matched, new_text) if op[0] != 'equal']
+    if any(op[1] != op[2] for op in ops):
+        return False
+    point = ops[0][1]
+    words = [m.span() for m in DIFF_TOKEN_RE.finditer(matched) if not m.group().isspace()]
+    left = max((ws for ws, we in words if we <= point), default=0)
+    right = min((we for ws, we in words if ws >= point), default=len(matched))
+    moved = new[convert(start + left):convert(start + right, end=True)]
+    return moved != matched[left:right]
+
+
+def retarget_finding(finding, old_texts, new_texts, mapping, corpus):
+    """Carry one finding to the new version.
+
+    Returns (status, finding): 'unchanged' (still matches where it did),
+    'retargeted' (rewritten against the new text) or 'orphaned' (with a
+    reason in the returned finding's 'orphaned' key).
+    """
+    is_change = finding['type'] == 'tracked_change'
+    key = 'old_text' if is_change else 'anchor_text'
+    target = finding[key]
+    every = finding.get('all_occurrences', False)
+
+    if every:
+        # Applied wherever the text occurs; it only needs to occur somewhere
+        if find_hits(new_texts, target, True):
+            return 'unchanged', finding
+        return 'orphaned', dict(finding, orphaned='text no longer in the document')
+
+    old_hits = find_hits(old_texts, target)
+    if not old_hits:
+        return 'orphaned', dict(finding, orphaned='not found in the old version')
+    pi, start, matched = old_hits[0]
+    npi = mapping.get(pi)
+    if npi is None:
+        return 'orphaned', dict(finding, orphaned='paragraph deleted')
+    old, new = old_texts[pi], new_texts[npi]
+    convert = _same if old == new else offset_map(old, new)
+
+    # The whole matched text, at or near where the diff puts it
+    pos = _nearest(new, matched, convert(start))
+    if pos is not None:
+        new_hits = find_hits(new_texts, target)
+        if new_hits and new_hits[0][:2] == (npi, pos):
+            return 'unchanged', finding
+
+    if is_change:
+        span = change_span(matched, finding.get('new_text', ''))
+        if span is None:
+            return 'orphaned', dict(finding, orphaned='already reads as the edit')
+        a, b, new_sub = span
+    else:
+        a, b, new_sub = 0, len(matched), None
+
+    if pos is not None:
+        cs, ce = pos + a, pos + b
+    else:
+        # A tracked change needs the text it changes intact; a comment only
+        # needs its anchor to be recognizably the same
+        cs, ce = convert(start + a), convert(start + b, end=True)
+        if is_change and new[cs:ce] != matched[a:b]:
+            return 'orphaned', dict(finding, orphaned='text changed')
+        if is_change and _insertion_moved(matched, finding.get('new_text', ''),
+                                          start, new, convert):
+            return 'orphaned', dict(finding, orphaned='text around the insertion changed')
+        if not is_change and (not new[cs:ce].strip() or difflib.SequenceMatcher(
+                None, matched, new[cs:ce], autojunk=False).ratio() < MIN_ANCHOR_RATIO):
+            return 'orphaned', dict(finding, orphaned='text changed')
+
+    span_start, span_end = unique_span(new, cs, ce, corpus, 2 if is_change else 0)
+    moved = dict(finding)
+    if is_change:
+        moved['old_text'] = new[span_start:span_end]
+        moved['new_text'] = new[span_start:cs] + new_sub + new[ce:span_end]
+    else:
+        moved['anchor_text'] = new[span_start:span_end]
+    return 'retargeted', moved
+
+
+def retarget(old_docx, new_docx, findings):
+    """Retarget findings; returns (kept findings, orphaned findings, counts)."""
+    old_paragraphs = read_story_paragraphs(old_docx)
+    new_paragraphs = read_story_paragraphs(new_docx)
+    old_texts = [p['text'] for p in old_paragraphs]
+    new_texts = [p['text'] for p in new_paragraphs]
+    mapping = align_versions(old_paragraphs, new_paragraphs)
+    corpus = '\n'.join(new_texts)
+
+    kept, orphaned = [], []
+    counts = {'unchanged': 0, 'retargeted': 0, 'orphaned': 0}
+    for finding in findings:
+        status, result = retarget_finding(finding, old_texts, new_texts, mapping, corpus)
+        counts[status] += 1
+        (orphaned if status == 'orphaned' else kept).append(result)
+    return kept, orphaned, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Move findings written for one version of a .docx onto a revised version."
+    )
+    parser.add_argument("old", help="the .docx the findings were written for")
+    parser.add_argument("new", help="the revised .docx")
+    parser.add_argument("findings", help="findings.jsonl written for old")
+    parser.add_argument("output", help="findings.jsonl to write for new")
+    parser.add_argument("--report", metavar="FILE",
+                        help="also write the orphaned findings, with the reason, as JSONL")
+    args = parser.parse_args()
+
+    for path in (args.old, args.new, args.findings):
+        if not os.path.exists(path):
+            print(f"Error: file not found: {path}")
+            return 1
+
+    findings = parse_findings(args.findings)
+    kept, orphaned, counts = retarget(args.old, args.new, findings)
+    write_findings(kept, args.output)
+    if args.report:
+        write_findings(orphaned, args.report)
+
+    print(f"Wrote {len(kept)} findings to {args.output}")
+    print(f"  unchanged:  {counts['unchanged']}")
+    print(f"  retargeted: {counts['retargeted']}")
+    print(f"  orphaned:   {counts['orphaned']}")
+    for finding in orphaned:
+        anchor = finding.get('old_text', finding.get('anchor_text', ''))
+        print(f"  - [{finding.get('category', '')}] {anchor[:70]} ({finding['orphaned']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+score_edits.py — Score a copyedited .docx against a human-edited benchmark.
+
+Extracts every tracked change and comment from both documents in one
+streaming pass per story part, aligns them by paragraph and character
+overlap, and reports the Edit Volume and Edit Recall by Category metrics of
+tests/copyeditor-eval-template.md as Markdown tables ready to paste in.
+
+Usage:
+    python score_edits.py <skill.docx> <human.docx> [--source SRC.docx]
+        [--human-csv EDITS.csv] [--json]
+    python score_edits.py --folder <test folder> [--json]
+
+Positions are offsets in the original (reject-all) text, so both documents
+are compared in the coordinates of the source they were edited from; the
+paragraphs of the two documents are aligned first, in case the benchmark
+was made from a slightly different draft.
+
+--source drops comments and revisions already present in the source
+document. --human-csv is the team's sheet of human edits (columns "Issue",
+"original text" and "did the team take the edit?"); it marks which human
+edits were accepted and gives the categories for the recall table.
+
+--folder scores every .docx in the folder's subfolders (one per skill
+version) against the benchmark in the folder itself: the .docx with
+"human" in its name, the .csv with "human" in its name if any, and the
+remaining .docx as the source.
+"""
+
+import argparse
+import csv
+import difflib
+import glob
+import json
+import os
+import sys
+import time
+import zipfile
+from bisect import bisect_right
+from collections import namedtuple
+
+from apply_copyedits import STORY_PARTS, W, etree, normalize_for_search
+
+# A tracked change, or a comment that covers no tracked change. para is an
+# index into the document's paragraphs; start/end are original-text offsets
+# (start == end for a pure insertion).
+Edit = namedtuple('Edit', 'kind para start end deleted inserted comment')
+
+# Template categories for the recall table; CSV issue names map onto these
+CATEGORIES = (
+    'Clarity', 'AP Style', 'Wordiness', 'Formatting', 'Repetitive phrasing',
+    'Grammar', 'Precision', 'Word Choice', 'Parallelism', 'Bellwether Style',
+    'Inclusive Language', 'Factual Flag',
+)
+CATEGORY_ALIASES = {'AP Style Error': 'AP Style'}
+
+# Container tags whose w:ins/w:del mark a paragraph mark or table row, not text
+PROPERTY_PARENTS = {f'{{{W}}}{t}' for t in ('rPr', 'pPr', 'trPr')}
+
+
+def _w(tag):
+    return f'{{{W}}}{tag}'
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EXTRACTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _Paragraph:
+    __slots__ = ('text', 'pos', 'pending', 'groups')
+
+    def __init__(self):
+        self.text = []        # original-text pieces
+        self.pos = 0          # original-text length so far
+        self.pending = None   # revision group still open for extension
+        self.groups = []      # [start, end, deleted, inserted]
+
+
+def scan_story(z, name, base, paragraphs, groups, ranges):
+    """Stream one story part, appending paragraphs, revisions and comment ranges.
+
+    base is the index of the part's first paragraph in the whole document.
+    Paragraph texts go to paragraphs; revision groups (adjacent w:del and
+    w:ins with no unchanged text between) to groups as [para, start, end,
+    deleted, inserted]; comment ranges to ranges as {id: [para, start, end]}.
+    """
+    stack = []       # tags of open elements
+    open_paras = []  # (paragraph index, _Paragraph) of open w:p, innermost last
+    inserted = deleted = 0
+    count = 0
+    with z.open(name) as f:
+        for event, elem in etree.iterparse(f, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                parent = stack[-1] if stack else None
+                stack.append(tag)
+                if tag == _w('p'):
+                    paragraphs.append('')
+                    open_paras.append((base + count, _Paragraph()))
+                    count += 1
+                elif tag in (_w('ins'), _w('del')) and parent not in PROPERTY_PARENTS:
+                    if tag == _w('ins'):
+                        inserted += 1
+                    else:
+                        deleted += 1
+                elif tag == _w('commentRangeStart') and open_paras:
+                    pi, para = open_paras[-1]
+                    ranges[elem.get(_w('id'))] = [pi, para.pos, None]
+                elif tag == _w('commentRangeEnd') and open_paras:
+                    pi, para = open_paras[-1]
+                    rng = ranges.get(elem.get(_w('id')))
+                    if rng is not None:
+                        # A range ending in a later paragraph runs to the end of its first
+                        rng[2] = para.pos if rng[0] == pi else -1
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if tag in (_w('ins'), _w('del')) and parent not in PROPERTY_PARENTS:
+                if tag == _w('ins'):
+                    inserted -= 1
+                else:
+                    deleted -= 1
+            elif tag in (_w('t'), _w('delText')) and open_paras and elem.text:
+                para = open_paras[-1][1]
+                text = elem.text
+                if inserted and not deleted:
+                    group = para.pending or [para.pos, para.pos, '', '']
+                    group[3] += text
+                elif deleted:
+                    group = para.pending or [para.pos, para.pos, '', '']
+                    group[2] += text
+                    group[1] += len(text)
+                    para.text.append(text)
+                    para.pos += len(text)
+                else:
+                    para.text.append(text)
+                    para.pos += len(text)
+                    para.pending = None
+                    group = None
+                if group is not None and para.pending is None:
+                    para.pending = group
+                    para.groups.append(group)
+            elif tag == _w('p') and open_paras:
+                pi, para = open_paras.pop()
+                paragraphs[pi] = ''.join(para.text)
+                groups.extend([pi] + g for g in para.groups)
+            # Free finished elements so memory stays flat
+            elem.clear(keep_tail=True)
+            if elem.getparent() is not None and tag == _w('p') and not open_paras:
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    return count
+
+
+def comment_texts(z):
+    """{comment id: text} from word/comments.xml."""
+    if 'word/comments.xml' not in z.namelist():
+        return {}
+    root = etree.fromstring(z.read('word/comments.xml'))
+    return {
+        c.get(_w('id')): ''.join(t.text or '' for t in c.iter(_w('t')))
+        for c in root.iter(_w('comment'))
+    }
+
+
+def extract_edits(docx_path):
+    """Every tracked change and comment in a .docx.
+
+    Returns (paragraphs, edits): the original (reject-all) text of every
+    paragraph in the story parts, and a list of Edits. Revision groups
+    covered by the same comment form one 'change' edit carrying that
+    comment's text; comments covering no revision are 'comment' edits.
+    """
+    paragraphs, groups, ranges = [], [], {}
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        for _, name in STORY_PARTS:
+            if name in names:
+                scan_story(z, name, len(paragraphs), paragraphs, groups, ranges)
+        texts = comment_texts(z)
+
+    spans = {}
+    for cid, (pi, start, end) in ranges.items():
+        if end is None or end < 0:
+            end = len(paragraphs[pi])
+        spans[cid] = (pi, start, end)
+
+    # Attach each revision group to the first comment covering it
+    comment_index = IntervalIndex((pi, cs, ce, cid) for cid, (pi, cs, ce) in spans.items())
+    by_comment = {}
+    edits = []
+    for pi, start, end, deleted, inserted in groups:
+        owners = comment_index.overlapping(pi, start, end)
+        owner = owners[0] if owners else None
+        if owner is None:
+            edits.append(Edit('change', pi, start, end, deleted, inserted, None))
+        elif owner in by_comment:
+            e = by_comment[owner]
+            by_comment[owner] = e._replace(
+                start=min(e.start, start), end=max(e.end, end),
+                deleted=e.deleted + deleted, inserted=e.inserted + inserted,
+            )
+        else:
+            by_comment[owner] = Edit('change', pi, start, end, deleted, inserted,
+                                     texts.get(owner, ''))
+    edits.extend(by_comment.values())
+    for cid, (pi, start, end) in spans.items():
+        if cid not in by_comment:
+            edits.append(Edit('comment', pi, start, end, paragraphs[pi][start:end],
+                              None, texts.get(cid, '')))
+    edits.sort(key=lambda e: (e.para, e.start, e.end))
+    return paragraphs, edits
+
+
+def _overlaps(s1, e1, s2, e2):
+    """Spans overlap; an empty span (insertion) overlaps one it touches."""
+    if s1 == e1 or s2 == e2:
+        return s2 <= e1 and s1 <= e2
+    return s1 < e2 and s2 < e1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ALIGNMENT
+# ═══════════════════════════════════════════════════════════════════════════
+
+class IntervalIndex:
+    """Spans per paragraph, queried for overlap in O(log n + hits).
+
+    Spans are sorted by start with a running maximum of ends, so a query
+    walks back from the last span starting at or before its end and stops
+    as soon as no earlier span can reach its start.
+    """
+
+    def __init__(self, items):
+        """items: (para, start, end, value)."""
+        self._paras = {}
+        for para, start, end, value in sorted(items, key=lambda x: (x[0], x[1], x[2])):
+            self._paras.setdefault(para, []).append((start, end, value))
+        self._starts = {}
+        self._reach = {}
+        for para, spans in self._paras.items():
+            self._starts[para] = [s for s, _, _ in spans]
+            reach, top = [], -1
+            for _, e, _ in spans:
+                top = max(top, e)
+                reach.append(top)
+            self._reach[para] = reach
+
+    def overlapping(self, para, start, end):
+        """Values of every span in para overlapping [start, end)."""
+        spans = self._paras.get(para)
+        if not spans:
+            return []
+        starts, reach = self._starts[para], self._reach[para]
+        hits = []
+        i = bisect_right(starts, end) - 1
+        while i >= 0 and reach[i] >= start:
+            s, e, value = spans[i]
+            if _overlaps(start, end, s, e):
+                hits.append(value)
+            i -= 1
+        hits.reverse()
+        return hits
+
+
+def align_paragraphs(a_texts, b_texts):
+    """Map paragraph indices of a onto b, with an offset map per pair.
+
+    Returns {a index: (b index, offset function)}. Identical paragraphs map
+    offsets unchanged; paragraphs paired inside a changed block map them
+    through a character diff.
+    """
+    mapping = {}
+    matcher = difflib.SequenceMatcher(None, a_texts, b_texts, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for k in range(i2 - i1):
+                mapping[i1 + k] = (j1 + k, _same)
+        elif tag == 'replace':
+            for k in range(min(i2 - i1, j2 - j1)):
+                mapping[i1 + k] = (j1 + k, _offset_map(a_texts[i1 + k], b_texts[j1 + k]))
+    return mapping
+
+
+def _same(offset):
+    return offset
+
+
+def _offset_map(a, b):
+    ops = difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+    starts = [op[1] for op in ops]
+
+    def convert(offset):
+        i = max(bisect_right(starts, offset) - 1, 0)
+        tag, a1, a2, b1, b2 = ops[i]
+        if tag == 'equal':
+            return b1 + (offset - a1)
+        return b1 if offset <= a1 else b2
+    return convert
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  HUMAN EDIT SHEET
+# ═══════════════════════════════════════════════════════════════════════════
+
+def read_edit_sheet(csv_path, paragraphs):
+    """Locate each row of the team's human-edit CSV in the benchmark text.
+
+    Returns (rows, unlocated): rows as dicts with category, accepted, para,
+    start and end; unlocated counts rows whose original text was not found.
+    """
+    rows, unlocated = [], 0
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            original = (row.get('original text') or '').strip()
+            issue = (row.get('Issue') or '').strip()
+            category = CATEGORY_ALIASES.get(issue, issue)
+            if category not in CATEGORIES:
+                category = 'Uncategorized'
+            accepted = (row.get('did the team take the edit?') or '').strip().lower()
+            located = _locate(original, paragraphs)
+            if located is None:
+                unlocated += 1
+                continue
+            rows.append({
+                'category': category, 'accepted': accepted.startswith('yes'),
+                'para': located[0], 'start': located[1], 'end': located[2],
+            })
+    return rows, unlocated
+
+
+def _locate(original, paragraphs):
+    """First (para, start, end) of a sheet excerpt, ignoring elided ends."""
+    excerpt = original.strip('.…"“” ').strip()
+    if not excerpt:
+        return None
+    # Excerpts elide the middle too ("From X… to Y"); match the longest part
+    excerpt = max(excerpt.replace('...', '…').split('…'), key=len).strip()
+    for variant in normalize_for_search(excerpt):
+        for pi, text in enumerate(paragraphs):
+            at = text.find(variant)
+            if at >= 0:
+                return pi, at, at + len(variant)
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SCORING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def drop_preexisting(paragraphs, edits, source_docx):
+    """Remove edits already in the source document (earlier review rounds)."""
+    src_paragraphs, src_edits = extract_edits(source_docx)
+    seen = {(src_paragraphs[e.para], e.start, e.end, e.comment) for e in src_edits}
+    return [e for e in edits if (paragraphs[e.para], e.start, e.end, e.comment) not in seen]
+
+
+def score(skill_docx, human_docx, source_docx=None, csv_path=None):
+    """Compute the template metrics for one skill output; returns a dict."""
+    skill_paras, skill_edits = extract_edits(skill_docx)
+    human_paras, human_edits = extract_edits(human_docx)
+    if source_docx:
+        skill_edits = drop_preexisting(skill_paras, skill_edits, source_docx)
+        human_edits = drop_preexisting(human_paras, human_edits, source_docx)
+
+    rows, unlocated = read_edit_sheet(csv_path, human_paras) if csv_path else ([], 0)
+    human_index = IntervalIndex((e.para, e.start, e.end, e) for e in human_edits)
+    row_index = IntervalIndex((r['para'], r['start'], r['end'], n) for n, r in enumerate(rows))
+    mapping = align_paragraphs(skill_paras, human_paras)
+
+    matched_rows = set()
+    matching_accepted = matching_human = unique = 0
+    for e in skill_edits:
+        if e.para not in mapping:
+            unique += 1
+            continue
+        hp, convert = mapping[e.para]
+        start, end = convert(e.start), convert(e.end)
+        hits = row_index.overlapping(hp, start, end)
+        matched_rows.update(hits)
+        human_hits = human_index.overlapping(hp, start, end)
+        if any(rows[n]['accepted'] for n in hits):
+            matching_accepted += 1
+        if human_hits or hits:
+            matching_human += 1
+        else:
+            unique += 1
+
+    changes = [e for e in skill_edits if e.kind == 'change']
+    human_changes = [e for e in human_edits if e.kind == 'change']
+    recall = {}
+    for n, r in enumerate(rows):
+        if r['accepted']:
+            taken, caught = recall.get(r['category'], (0, 0))
+            recall[r['category']] = (taken + 1, caught + (n in matched_rows))
+    return {
+        'skill': {
+            'total': len(skill_edits),
+            'tracked_changes': len(changes),
+            'comment_only': len(skill_edits) - len(changes),
+            'with_comment': sum(1 for e in changes if e.comment),
+        },
+        'human': {
+            'total': len(human_edits),
+            'tracked_changes': len(human_changes),
+            'comment_only': len(human_edits) - len(human_changes),
+            'accepted': sum(1 for r in rows if r['accepted']) if csv_path else None,
+        },
+        'matching_human': matching_human,
+        'matching_accepted': matching_accepted if csv_path else None,
+        'unique': unique,
+        'sheet_rows_unlocated': unlocated if csv_path else None,
+        'recall': recall,
+    }
+
+
+def _pct(part, whole):
+    return f"{100 * part / whole:.0f}%" if whole else "n/a"
+
+
+def _value(v):
+    return "n/a" if v is None else str(v)
+
+
+def format_report(result):
+    """The template's Edit Volume and recall tables, as Markdown."""
+    s, h = result['skill'], result['human']
+    lines = [
+        "## Edit Volume", "",
+        "| Metric | Skill | Human benchmark |",
+        "|---|---|---|",
+        f"| Total edits made | {s['total']} | {h['total']} |",
+        f"| Tracked changes | {s['tracked_changes']} | {h['tracked_changes']} |",
+        f"| Comment-only findings | {s['comment_only']} | {h['comment_only']} |",
+        f"| % of tracked changes with a comment/rationale "
+        f"| {_pct(s['with_comment'], s['tracked_changes'])} | n/a |",
+        f"| Human benchmark edits accepted by team | | {_value(h['accepted'])} |",
+        f"| Skill edits matching accepted human edits | {_value(result['matching_accepted'])} | |",
+        f"| Skill edits unique to skill (not in human benchmark) | {result['unique']} | |",
+        "",
+        f"**Notes**: {result['matching_human']} skill edit(s) overlap a human edit.",
+    ]
+    if result['sheet_rows_unlocated']:
+        lines[-1] += (f" {result['sheet_rows_unlocated']} row(s) of the edit sheet"
+                      " were not found in the benchmark text.")
+    if result['recall']:
+        lines += [
+            "", "## Edit Recall by Category", "",
+            "| Category | Human taken edits | Skill caught (approx.) | Coverage | Notes |",
+            "|---|---|---|---|---|",
+        ]
+        for category in CATEGORIES + ('Uncategorized',):
+            taken, caught = result['recall'].get(category, (0, 0))
+            if category == 'Uncategorized' and not taken:
+                continue
+            lines.append(f"| {category} | {taken} | {caught} | {_pct(caught, taken)} | |")
+    return '\n'.join(lines)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  TEST FOLDERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def find_benchmark(folder):
+    """(human docx, human csv or None, source docx or None) in a test folder."""
+    docs = sorted(glob.glob(os.path.join(folder, '*.docx')))
+    human = [d for d in docs if 'human' in os.path.basename(d).lower()]
+    sheets = [c for c in sorted(glob.glob(os.path.join(folder, '*.csv')))
+              if 'human' in os.path.basename(c).lower()]
+    others = [d for d in docs if d not in human]
+    return (human[0] if human else None, sheets[0] if sheets else None,
+            others[0] if len(others) == 1 else None)
+
+
+def score_folder(folder):
+    """Score every skill output under a test folder; returns [(path, result)]."""
+    human, sheet, source = find_benchmark(folder)
+    if human is None:
+        raise FileNotFoundError(f"no human benchmark .docx in {folder}")
+    results = []
+    for path in sorted(glob.glob(os.path.join(folder, '*', '*.docx'))):
+        try:
+            results.append((path, score(path, human, source, sheet)))
+        except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+            results.append((path, {'error': str(e)}))
+    return results
+
+
+def format_folder(folder, results):
+    """One Markdown row per skill output."""
+    lines = [
+        f"## {os.path.basename(os.path.normpath(folder))}", "",
+        "| Output | Total | Tracked | Comment-only | With rationale "
+        "| Match accepted | Match human | Unique |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for path, r in results:
+        name = os.path.relpath(path, folder)
+        if 'error' in r:
+            lines.append(f"| {name} | error: {r['error']} | | | | | | |")
+            continue
+        s = r['skill']
+        lines.append(
+            f"| {name} | {s['total']} | {s['tracked_changes']} | {s['comment_only']} "
+            f"| {_pct(s['with_comment'], s['tracked_changes'])} "
+            f"| {_value(r['matching_accepted'])} | {r['matching_human']} | {r['unique']} |"
+        )
+    return '\n'.join(lines)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score a copyedited .docx against a human-edited benchmark."
+    )
+    parser.add_argument("skill", nargs="?", help="skill output .docx")
+    parser.add_argument("human", nargs="?", help="human-edited benchmark .docx")
+    parser.add_argument("--source", help="source .docx (its own comments are not counted)")
+    parser.add_argument("--human-csv", help="team sheet of human edits and whether they were taken")
+    parser.add_argument("--folder", help="score every output in a test folder")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of Markdown")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.folder:
+        if not os.path.isdir(args.folder):
+            print(f"Error: folder not found: {args.folder}")
+            return 1
+        try:
+            results = score_folder(args.folder)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return 1
+        if args.json:
+            print(json.dumps({os.path.relpath(p, args.folder): r for p, r in results}, indent=2))
+        else:
+            print(format_folder(args.folder, results))
+    else:
+        if not (args.skill and args.human):
+            parser.error("give a skill .docx and a human .docx, or --folder")
+        for path in (args.skill, args.human, args.source, args.human_csv):
+            if path and not os.path.exists(path):
+                print(f"Error: file not found: {path}")
+                return 1
+        result = score(args.skill, args.human, args.source, args.human_csv)
+        print(json.dumps(result, indent=2) if args.json else format_report(result))
+    if not args.json:
+        print(f"\n_Scored in {time.perf_counter() - started:.1f}s_")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+spelling.py — Flag misspelled words, offline.
+
+Reads the reviewable text once and checks every word against three
+vocabularies: a system word list compiled into a compact on-disk
+dictionary, Bellwether's own words (organization names, education terms)
+and the document itself. A word the document uses often is taken as
+intended, and a rare word one edit away from a frequent one ("questionss"
+beside "questions") as a typo of it.
+
+    tracked_change — the word has exactly one likely correction one edit
+                     away (a letter dropped, added, changed, or two
+                     adjacent letters swapped)
+    comment_only   — an unknown word with several candidates or none, and
+                     real-word typos spell-check cannot catch ("pubic")
+
+Acronyms, words with digits or inner capitals, URLs and quotations are left
+alone. Capitalized words inside a sentence are taken as names and only
+flagged when the document itself shows the typo ("Bellweather" beside
+"Bellwether").
+
+The dictionary is a plain word list, one word per line (/usr/share/dict/words,
+a SCOWL list, or a Hunspell .dic, whose common affix flags are expanded),
+given with --dictionary or found in the usual system locations. It is
+compiled once into a sorted, offset-indexed file with a Bloom filter in
+front, cached under a key derived from the list's content, and
+memory-mapped: most candidate corrections are ruled out by the filter
+without touching the word list. With no dictionary only the document's own
+vocabulary is used, which still catches swapped and doubled letters in words
+the document spells correctly elsewhere; coverage is poor, and the script
+warns.
+
+Usage:
+    python spelling.py <source.docx> <findings.jsonl> [--dictionary FILE ...]
+        [--words FILE] [--cache-dir DIR] [--append]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+
+from apply_copyedits import (
+    DEFAULT_CACHE_DIR, build_findings, read_story_paragraphs, reviewable_paragraphs,
+    write_findings,
+)
+from style_rules import protected_spans
+
+WORD_RE = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+SENTENCE_START_RE = re.compile(r'(?:^|[.!?:]["”’)\]]*\s+|[“"(]\s*)$')
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Checked in order when no --dictionary is given
+DICTIONARY_PATHS = (
+    '/usr/share/dict/words',
+    '/usr/share/dict/american-english',
+    '/usr/share/dict/web2',
+    '/usr/share/hunspell/en_US.dic',
+    '/usr/share/myspell/en_US.dic',
+    '/Library/Spelling/en_US.dic',
+)
+
+# Part of the cache key; bump whenever compiling the same list changes
+DICTIONARY_VERSION = "1"
+DICTIONARY_MAGIC = b'BWDICT1\0'
+
+# Bloom filter size and probes: about 1% false positives
+BLOOM_BITS_PER_WORD = 10
+BLOOM_PROBES = 7
+
+# A word the document uses this often is taken as intended
+FREQUENT = 3
+
+# Shorter words have too many neighbors one edit away to check
+MIN_LENGTH = 3
+# Without a dictionary, shorter words are too often another real word
+MIN_DOCUMENT_LENGTH = 6
+# Shorter words are never changed, only commented on
+MIN_FIX_LENGTH = 5
+
+MAX_SUGGESTIONS = 3
+
+# Organization names and education terms general word lists lack
+BELLWETHER_WORDS = frozenset("""
+    bellwether bellwether's ascendium lumina kresge strada overdeck raikes
+    arnold walton joyce kipp americorps naep essa esser ferpa wioa ipeds fafsa
+    edtech postsecondary prekindergarten preschoolers microcredential
+    microcredentials microschool microschools homeschool homeschooled
+    homeschooling homeschoolers noncredit nondegree nonacademic noncognitive
+    nonpublic nonprofits nonpartisan subgroup subgroups subgrant subgrants
+    subgrantee subgrantees grantee grantees grantmaking grantmaker grantmakers
+    policymaker policymakers policymaking coursetaking upskill upskilling
+    reskill reskilling onboarding wraparound socioemotional schoolwide
+    districtwide statewide systemwide paraprofessional paraprofessionals
+    paraeducator paraeducators dataset datasets disaggregate disaggregated
+    disaggregation multiyear midyear edu
+""".split())
+
+# Real words that are almost always typos in Bellwether's writing, from the
+# style guide's "Dangerous Typos"
+REAL_WORD_TYPOS = {
+    'pubic': 'public',
+    'shit': 'shift',
+    'asses': 'assess',
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  DICTIONARY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _affixed(word, flags):
+    """Forms of a Hunspell stem for the common en_US suffix flags."""
+    forms = [word]
+    consonant_y = word.endswith('y') and word[-2:-1] not in tuple('aeiou')
+    if 'S' in flags:
+        if consonant_y:
+            forms.append(word[:-1] + 'ies')
+        elif word.endswith(('s', 'x', 'z', 'ch', 'sh')):
+            forms.append(word + 'es')
+        else:
+            forms.append(word + 's')
+    if 'D' in flags:
+        if word.endswith('e'):
+            forms.append(word + 'd')
+        elif consonant_y:
+            forms.append(word[:-1] + 'ied')
+        else:
+            forms.append(word + 'ed')
+    if 'G' in flags:
+        if word.endswith('e') and not word.endswith('ee'):
+            forms.append(word[:-1] + 'ing')
+        else:
+            forms.append(word + 'ing')
+    if 'M' in flags:
+        forms.append(word + "'s")
+    return forms
+
+
+def read_word_list(path):
+    """Lowercased words of a plain word list or a Hunspell .dic file."""
+    words = set()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for n, line in enumerate(f):
+            entry = line.strip()
+            if not entry or entry.startswith('#') or (n == 0 and entry.isdigit()):
+                continue
+            word, _, flags = entry.partition('/')
+            for form in _affixed(word.lower().replace('’', "'"), flags.split()[0] if flags else ''):
+                words.add(form)
+    return words
+
+
+def _bloom_positions(key, bits):
+    """Bit positions of a word in a Bloom filter of the given size."""
+    h1 = zlib.crc32(key)
+    h2 = zlib.adler32(key) | 1
+    return [(h1 + i * h2) % bits for i in range(BLOOM_PROBES)]
+
+
+def write_dictionary(words, path):
+    """Write words as a compiled dictionary file (see Dictionary).
+
+    Layout: magic, word count and filter size in bits (uint32 each),
+    count + 1 byte offsets (uint32), the Bloom filter, then the words,
+    sorted and back to back in UTF-8.
+    """
+    data = sorted(w.encode('utf-8') for w in words)
+    offsets = array('I', [0])
+    for d in data:
+        offsets.append(offsets[-1] + len(d))
+    bits = max(64, len(data) * BLOOM_BITS_PER_WORD)
+    bloom = bytearray((bits + 7) // 8)
+    for d in data:
+        for pos in _bloom_positions(d, bits):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(DICTIONARY_MAGIC)
+        f.write(struct.pack('<II', len(data), bits))
+        f.write(offsets.tobytes())
+        f.write(bloom)
+        f.write(b''.join(data))
+    os.replace(tmp, path)
+
+
+class Dictionary:
+    """A compiled word list, memory-mapped.
+
+    A lookup checks the Bloom filter first and binary-searches the sorted
+    words only when the filter lets the word through, so neither the list
+    nor an index of it is ever loaded into memory.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(DICTIONARY_MAGIC)] != DICTIONARY_MAGIC:
+            raise ValueError(f"not a compiled dictionary: {path}")
+        self._count, self._bits = struct.unpack_from('<II', self._map, len(DICTIONARY_MAGIC))
+        start = len(DICTIONARY_MAGIC) + 8
+        self._offsets = memoryview(self._map)[start:start + 4 * (self._count + 1)].cast('I')
+        bloom = start + 4 * (self._count + 1)
+        self._words = bloom + (self._bits + 7) // 8
+        self._bloom_bytes = memoryview(self._map)[bloom:self._words]
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        key = word.encode('utf-8')
+        # Probe by probe, so most misses stop after one or two
+        bloom, bits = self._bloom_bytes, self._bits
+        h1 = zlib.crc32(key)
+        h2 = zlib.adler32(key) | 1
+        for i in range(BLOOM_PROBES):
+            pos = (h1 + i * h2) % bits
+            if not bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        m = self._map
+        offsets, base = self._offsets, self._words
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found = m[base + offsets[mid]:base + offsets[mid + 1]]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+def load_dictionary(paths, cache_dir=DEFAULT_CACHE_DIR):
+    """Dictionary compiled from the word lists at paths, via the on-disk cache.
+
+    The compiled file is named after a hash of the lists' content and
+    DICTIONARY_VERSION, so a changed list is recompiled and an unchanged
+    one never is.
+    """
+    h = hashlib.sha256(DICTIONARY_VERSION.encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(b'\0' + hashlib.sha256(f.read()).digest())
+    os.makedirs(cache_dir, exist_ok=True)
+    compiled = os.path.join(cache_dir, f"words-{h.hexdigest()[:16]}.bin")
+    if not os.path.isfile(compiled):
+        words = set()
+        for path in paths:
+            words |= read_word_list(path)
+        write_dictionary(words, compiled)
+    return Dictionary(compiled)
+
+
+def find_dictionary_path():
+    for path in DICTIONARY_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CHECK
+# ═══════════════════════════════════════════════════════════════════════════
+
+def edits1(word):
+    """Every string one deletion, swap, substitution or insertion from word."""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    found = set()
+    for a, b in splits:
+        if b:
+            found.add(a + b[1:])
+            for c in ALPHABET:
+                found.add(a + c + b[1:])
+        if len(b) > 1:
+            found.add(a + b[1] + b[0] + b[2:])
+        for c in ALPHABET:
+            found.add(a + c + b)
+    found.discard(word)
+    return found
+
+
+def _match_case(word, like):
+    """word in the capitalization of like."""
+    if like.isupper():
+        return word.upper()
+    if like[0].isupper():
+        return word[0].upper() + word[1:]
+    return word
+
+
+def words_to_check(paragraphs):
+    """(para index, start, end, word, capitalized-inside-a-sentence) per word.
+
+    Skips tables of contents, protected text, acronyms, short words and
+    words run into digits or inner capitals; a possessive is checked
+    without its "'s".
+    """
+    found = []
+    for pi, para in reviewable_paragraphs(paragraphs):
+        if para['toc']:
+            continue
+        text = para['text']
+        protected = protected_spans(text)
+        for m in WORD_RE.finditer(text):
+            word = m.group()
+            start, end = m.span()
+            if len(word) < MIN_LENGTH or word.isupper():
+                continue
+            if any(c.isupper() for c in word[1:]):
+                continue
+            before = text[start - 1] if start else ''
+            after = text[end] if end < len(text) else ''
+            if before.isdigit() or after.isdigit() or {before, after} & set('@/_'):
+                continue
+            if after == '.' and text[end + 1:end + 2].isalpha():
+                continue  # domain names: "example.org"
+            if any(s <= start < e for s, e in protected):
+                continue
+            if word[-2:] in ("'s", "’s"):
+                word, end = word[:-2], end - 2
+            name = word[0].isupper() and not SENTENCE_START_RE.search(text[:start])
+            if para['level'] is not None:
+                name = False if start == 0 else word[0].isupper()
+            found.append((pi, start, end, word, name))
+    return found
+
+
+def typo_kind(word, right):
+    """How word, one edit from right, reads when both could be words.
+
+    'slip' — two adjacent letters swapped, or a letter doubled or undoubled
+    'inner' — a letter added or dropped inside the word
+    None — a changed letter, or a letter added or dropped at either end;
+           those mostly make another real word ("then" / "than", "state" /
+           "states", "billion" / "million")
+    """
+    n, m = len(word), len(right)
+    i = 0
+    while i < min(n, m) and word[i] == right[i]:
+        i += 1
+    if n == m:
+        if word[i + 1:i + 2] == right[i:i + 1] and word[i:i + 1] == right[i + 1:i + 2]:
+            return 'slip'
+        return None
+    longer, shorter = (word, right) if n > m else (right, word)
+    if longer[i] in (longer[i - 1:i], longer[i + 1:i + 2]):
+        return 'slip'
+    return 'inner' if 0 < i < len(shorter) else None
+
+
+class SpellChecker:
+    """Judges words against a dictionary, custom words and the document.
+
+    counts is the number of times each lowercased word occurs in the
+    document, names the number of those that are capitalized inside a
+    sentence. Results are memoized per distinct word.
+    """
+
+    def __init__(self, dictionary, custom, counts, names):
+        self.dictionary = dictionary
+        self.custom = custom
+        self.counts = counts
+        self.names = names
+        self._memo = {}
+
+    def known(self, word):
+        """Whether a lowercased word is in the dictionary or the custom words."""
+        return word in self.custom or (self.dictionary is not None and word in self.dictionary)
+
+    def check(self, word, name):
+        """None if word looks right, else (suggestions, confident, listed).
+
+        listed is False when only the document's vocabulary judged the word
+        (names, or no dictionary), True when the dictionary did.
+        """
+        key = (word, name)
+        if key not in self._memo:
+            self._memo[key] = self._check(word.lower().replace('’', "'"), name)
+        return self._memo[key]
+
+    def _check(self, lower, name):
+        seen = self.counts[lower]
+        if seen >= FREQUENT or self.known(lower):
+            return None
+        neighbors = edits1(lower)
+
+        if name or self.dictionary is None:
+            # Nothing says this word is wrong but the document's own
+            # spelling elsewhere, and only for slips that rarely make
+            # another word; without a dictionary, a letter added or dropped
+            # inside the word ("though" / "through") is as likely a word
+            if len(lower) < MIN_DOCUMENT_LENGTH:
+                return None
+            pool = self.names if name else self.counts
+            allowed = ('slip', 'inner') if self.dictionary is not None else ('slip',)
+            kinds = {}
+            for c in neighbors:
+                if pool.get(c, 0) >= max(FREQUENT, FREQUENT * seen):
+                    kind = typo_kind(lower, c)
+                    if kind in allowed:
+                        kinds[c] = kind
+            if not kinds:
+                return None
+            ranked = sorted(kinds, key=lambda c: (-pool[c], c))
+            return ranked[:MAX_SUGGESTIONS], len(ranked) == 1 and kinds[ranked[0]] == 'slip', False
+
+        # Not in the dictionary: prefer the corrections the document uses
+        listed = [c for c in neighbors if self.known(c) or self.counts.get(c, 0) >= FREQUENT]
+        if not listed:
+            return [], False, True
+        ranked = sorted(listed, key=lambda c: (-self.counts.get(c, 0), c))
+        used = [c for c in ranked if self.counts.get(c, 0) >= FREQUENT]
+        confident = len(ranked) == 1 or len(used) == 1
+        return ranked[:MAX_SUGGESTIONS], confident, True
+
+
+def spelling_matches(paragraphs, dictionary, custom=frozenset()):
+    """Matches for build_findings(); returns (matches, words checked)."""
+    found = words_to_check(paragraphs)
+    counts = Counter(w.lower().replace('’', "'") for _, _, _, w, _ in found)
+    names = Counter(w.lower().replace('’', "'") for _, _, _, w, name in found if name)
+    checker = SpellChecker(dictionary, BELLWETHER_WORDS | custom, counts, names)
+    matches = []
+    for pi, start, end, word, name in found:
+        lower = word.lower()
+        if lower in REAL_WORD_TYPOS and not name:
+            right = _match_case(REAL_WORD_TYPOS[lower], word)
+            matches.append({
+                'para': pi, 'start': start, 'end': end, 'new': None,
+                'category': 'Spelling', 'rule': 'real-word-typo',
+                'comment': f"Spelling: did you mean '{right}'? Spell-check does not catch '{word}.'",
+            })
+            continue
+        verdict = checker.check(word, name)
+        if verdict is None:
+            continue
+        suggestions, confident, listed = verdict
+        suggestions = [_match_case(s, word) for s in suggestions]
+        if confident and len(word) >= MIN_FIX_LENGTH:
+            matches.append({
+                'para': pi, 'start': start, 'end': end, 'new': suggestions[0],
+                'category': 'Spelling', 'rule': 'spelling',
+                'comment': f"Spelling: '{suggestions[0]}.'",
+            })
+        elif suggestions:
+            options = ' or '.join(f"'{s}'" for s in suggestions)
+            if listed:
+                reason = f"'{word}' is not in the dictionary."
+            else:
+                spelling = 'that spelling' if len(suggestions) == 1 else 'those spellings'
+                reason = f"The document uses {spelling} more often than '{word}.'"
+            matches.append({
+                'para': pi, 'start': start, 'end': end, 'new': None,
+                'category': 'Spelling', 'rule': 'spelling',
+                'comment': f"Spelling: did you mean {options}? {reason}",
+            })
+        else:
+            matches.append({
+                'para': pi, 'start': start, 'end': end, 'new': None,
+                'category': 'Spelling', 'rule': 'spelling',
+                'comment': f"Spelling: check '{word}'; it is not in the dictionary.",
+            })
+    return matches, len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write spelling findings for a .docx, offline."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("findings", help="findings.jsonl to write")
+    parser.add_argument("--dictionary", metavar="FILE", action="append", default=[],
+                        help="word list or Hunspell .dic (repeatable; default: the system list)")
+    parser.add_argument("--words", metavar="FILE",
+                        help="extra accepted words for this document, one per line")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"compiled dictionary cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    for path in [args.source] + args.dictionary + ([args.words] if args.words else []):
+        if not os.path.exists(path):
+            print(f"Error: file not found: {path}")
+            return 1
+
+    started = time.perf_counter()
+    paths = args.dictionary or [p for p in [find_dictionary_path()] if p]
+    dictionary = load_dictionary(paths, args.cache_dir) if paths else None
+    if dictionary is None:
+        print("WARNING: no system word list found, so spelling coverage is poor: only "
+              "misspellings of words the document also spells correctly are caught. "
+              "Install one (e.g. the wamerican package) or pass --dictionary FILE.")
+    custom = frozenset(read_word_list(args.words)) if args.words else frozenset()
+
+    paragraphs = read_story_paragraphs(args.source)
+    matches, checked = spelling_matches(paragraphs, dictionary, custom)
+    findings = build_findings(paragraphs, matches)
+    write_findings(findings, args.findings, append=args.append)
+
+    if dictionary is not None:
+        print(f"Dictionary: {', '.join(paths)} ({len(dictionary):,} words)")
+    changes = sum(1 for f in findings if f['type'] == 'tracked_change')
+    print(f"Checked {checked:,} words in {time.perf_counter() - started:.2f}s")
+    print(f"Wrote {len(findings)} findings to {args.findings} "
+          f"({changes} tracked changes, {len(findings) - changes} comments)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
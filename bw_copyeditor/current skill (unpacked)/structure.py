@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+structure.py — Check brackets, quotes, note references and numbering.
+
+Structural slips are easy to miss when reading for prose: a parenthesis
+that never closes, a footnote reference whose note was deleted, "Sidebar 1"
+followed by an unnumbered sidebar. This script reads the body and notes
+once, collecting the footnote and endnote references and typed superscript
+note numbers as it goes, and checks:
+
+    brackets   — ( ) [ ] { } and quotation marks (“ ” ‘ ’ "), matched per
+                 paragraph with a stack; a quotation that continues into
+                 the next paragraph (which opens with a quotation mark) is
+                 not flagged
+    notes      — references to notes that do not exist or are empty, notes
+                 no reference points to, notes referenced twice, and gaps
+                 or repeats in typed superscript note numbers
+    numbering  — figure, table, sidebar, exhibit, box and chart captions
+                 numbered out of sequence, twice, or only some of the time,
+                 and in-text references ("see Table 4") to captions the
+                 document does not have
+
+Findings are comment_only: Formatting for caption numbering, Factual Flag
+for everything else. Each anchor is widened until it is unique and then located
+the way apply_copyedits.py will locate it; an anchor that would land
+anywhere else is dropped and counted.
+
+Usage:
+    python structure.py <source.docx> <findings.jsonl> [--append]
+"""
+
+import argparse
+import os
+import re
+import sys
+import zipfile
+
+from apply_copyedits import (
+    STORY_PARTS, W, build_text_map, etree, find_hits, heading_level, heading_styles,
+    reviewable_paragraphs, toc_paragraphs, unique_span, write_findings,
+)
+
+PAIRS = {')': '(', ']': '[', '}': '{', '”': '“', '’': '‘'}
+NAMES = {'(': 'parenthesis', '[': 'bracket', '{': 'brace', '“': 'quotation mark',
+         '‘': 'single quotation mark', '"': 'quotation mark'}
+
+# "1)" or "b)" opening a list item, not closing a parenthesis
+LIST_MARKER_RE = re.compile(r'(?:^|[\s;:])\(?(?:\d{1,2}|[a-zA-Z]|[ivx]{1,4})$')
+
+URL_RE = re.compile(r'(?:https?://|www\.)\S+')
+
+LABELS = ('Figure', 'Table', 'Sidebar', 'Exhibit', 'Box', 'Chart', 'Graph', 'Map')
+NUMBER = r'\d+(?:[.-]\d+)*[A-Za-z]?'
+# A caption opens its paragraph: "Table 2: ...", "Sidebar: ...", "Figure 3."
+CAPTION_RE = re.compile(rf'^\s*({"|".join(LABELS)})(?:\s+({NUMBER}))?\s*(?:[:.—–-]|$)')
+REFERENCE_RE = re.compile(rf'\b({"|".join(LABELS)})s?\s+({NUMBER})\b')
+
+# Captions longer than this are body text that happens to start with a label
+MAX_CAPTION_WORDS = 25
+
+# Footnote and endnote entries that are separators, not notes
+SEPARATOR_TYPES = ('separator', 'continuationSeparator', 'continuationNotice')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def read_structure(docx_path):
+    """Paragraphs of the story parts, with their note references.
+
+    Returns (paragraphs, notes). Each paragraph has the keys of
+    apply_copyedits.read_story_paragraphs plus:
+        refs        — (kind, note id, offset) per footnote or endnote
+                      reference, kind being 'footnotes' or 'endnotes'
+        superscript — (start, end) of typed superscript digits
+        note        — (kind, id) of the note the paragraph belongs to
+    notes maps 'footnotes' / 'endnotes' to {id: [paragraph indices]} for
+    every note that is not a separator.
+    """
+    parser = etree.XMLParser(remove_blank_text=False)
+    paragraphs = []
+    notes = {'footnotes': {}, 'endnotes': {}}
+    with zipfile.ZipFile(docx_path, 'r') as z:
+        names = set(z.namelist())
+        styles = heading_styles(
+            etree.fromstring(z.read('word/styles.xml'), parser)
+            if 'word/styles.xml' in names else None
+        )
+        for part, name in STORY_PARTS:
+            if name not in names:
+                continue
+            root = etree.fromstring(z.read(name), parser)
+            if part in notes:
+                for note in root.findall(f'{{{W}}}{part[:-1]}'):
+                    if note.get(f'{{{W}}}type') not in SEPARATOR_TYPES:
+                        notes[part][note.get(f'{{{W}}}id')] = []
+            paras = list(root.iter(f'{{{W}}}p'))
+            toc = toc_paragraphs(paras)
+            for i, para in enumerate(paras):
+                text_map, text = build_text_map(para)
+                refs, superscript = [], []
+                for run, t_elem, start, end in text_map:
+                    for kind in ('footnotes', 'endnotes'):
+                        ref = run.find(f'{{{W}}}{kind[:-1]}Reference')
+                        if ref is not None:
+                            refs.append((kind, ref.get(f'{{{W}}}id'), start))
+                    align = run.find(f'{{{W}}}rPr/{{{W}}}vertAlign')
+                    if (align is not None and align.get(f'{{{W}}}val') == 'superscript'
+                            and text[start:end].strip().isdigit()):
+                        superscript.append((start, end))
+                note = None
+                if part in notes:
+                    owner = next(para.iterancestors(f'{{{W}}}{part[:-1]}'), None)
+                    if owner is not None and owner.get(f'{{{W}}}id') in notes[part]:
+                        note = (part, owner.get(f'{{{W}}}id'))
+                        notes[part][note[1]].append(len(paragraphs))
+                paragraphs.append({
+                    'locator': f'{part}:{i}',
+                    'part': part,
+                    'text': text,
+                    'level': heading_level(para, styles),
+                    'toc': i in toc,
+                    'refs': refs,
+                    'superscript': _merge_spans(superscript),
+                    'note': note,
+                })
+    return paragraphs, notes
+
+
+def _merge_spans(spans):
+    """Join adjacent spans: a number split across runs is one number."""
+    merged = []
+    for start, end in spans:
+        if merged and merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _word_before(text, pos):
+    """(start, end) of the word just before pos, or after it at the start."""
+    m = re.search(r'\S+\s*$', text[:pos])
+    if m:
+        return m.start(), m.start() + len(m.group().rstrip())
+    m = re.match(r'\s*\S+', text[pos:])
+    return (pos, pos + m.end()) if m else (0, len(text))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BRACKETS AND QUOTES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _marks(text):
+    """(offset, mark) of every bracket and quotation mark outside URLs."""
+    urls = [m.span() for m in URL_RE.finditer(text)]
+    for i, c in enumerate(text):
+        if c in '([{“‘")]}”’' and not any(s <= i < e for s, e in urls):
+            yield i, c
+        elif c == "'" and text[i + 1:i + 2] == "'" and text[i - 1:i] != "'":
+            yield i, '"'  # two apostrophes typed for a double quotation mark
+
+
+def unbalanced(text):
+    """(offset, mark, problem) for each unmatched mark in one paragraph.
+
+    problem is 'unclosed' for an opener left open at the end, 'unopened'
+    for a closer with no opener, and 'mismatched' for a closer that meets
+    a different opener.
+    """
+    stack = []
+    problems = []
+    for i, c in _marks(text):
+        if c == '"':
+            # Closes a curly opener too; mixed quote styles are a style
+            # question, not a missing mark
+            if stack and stack[-1][1] in '"“':
+                stack.pop()
+            else:
+                stack.append((i, c))
+        elif c == '’':
+            # An apostrophe unless it closes an open single quotation
+            between_letters = i > 0 and text[i - 1].isalpha() and text[i + 1:i + 2].isalpha()
+            if stack and stack[-1][1] == '‘' and not between_letters:
+                stack.pop()
+        elif c == '‘':
+            if text[i + 1:i + 2].isdigit():
+                continue  # abbreviated year: ‘90s
+            stack.append((i, c))
+        elif c in PAIRS:
+            opener = PAIRS[c]
+            if stack and stack[-1][1] == opener:
+                stack.pop()
+            elif any(o == opener for _, o in stack):
+                while stack[-1][1] != opener:
+                    problems.append(stack.pop() + ('unclosed',))
+                stack.pop()
+            elif c == ')' and LIST_MARKER_RE.search(text[:i]):
+                continue
+            elif stack and stack[-1][1] in '([{':
+                stack.pop()
+                problems.append((i, c, 'mismatched'))
+            else:
+                problems.append((i, c, 'unopened'))
+        else:
+            stack.append((i, c))
+    problems.extend(s + ('unclosed',) for s in stack)
+    return sorted(problems)
+
+
+def bracket_matches(paragraphs):
+    """Matches for unbalanced brackets and quotation marks."""
+    matches = []
+    reviewable = reviewable_paragraphs(paragraphs)
+    texts = {pi: para['text'] for pi, para in reviewable}
+    for pi, para in reviewable:
+        if para['toc']:
+            continue
+        text = para['text']
+        following = texts.get(pi + 1, '').lstrip()
+        for i, c, problem in unbalanced(text):
+            if problem == 'unclosed':
+                if c in '“"' and following[:1] in ('“', '"'):
+                    continue  # a quotation running on into the next paragraph
+                comment = (f"Factual Flag: this opening {NAMES[c]} is never closed. "
+                           "Check for a missing closing mark.")
+                start, end = i, i + len(re.match(r'.\S*', text[i:]).group())
+            else:
+                if problem == 'mismatched':
+                    comment = (f"Factual Flag: '{c}' does not match the bracket it closes. "
+                               "Check which was intended.")
+                else:
+                    comment = (f"Factual Flag: this '{c}' has no opening mark. Check for a "
+                               f"missing '{PAIRS[c]}' or a stray character.")
+                start, end = min(_word_before(text, i)[0], i), i + 1
+            matches.append({'para': pi, 'start': start, 'end': end,
+                            'category': 'Factual Flag', 'comment': comment})
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  NOTES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def note_matches(paragraphs, notes):
+    """Matches for note references and notes that do not pair up."""
+    matches = []
+    singular = {'footnotes': 'footnote', 'endnotes': 'endnote'}
+
+    def flag(pi, start, end, comment):
+        matches.append({'para': pi, 'start': start, 'end': end,
+                        'category': 'Factual Flag', 'comment': comment})
+
+    referenced = {'footnotes': set(), 'endnotes': set()}
+    for pi, para in enumerate(paragraphs):
+        text = para['text']
+        for kind, note_id, offset in para['refs']:
+            start, end = _word_before(text, offset)
+            name = singular[kind]
+            if note_id not in notes[kind]:
+                flag(pi, start, end, f"Factual Flag: the {name} reference here points to a "
+                                     f"{name} that does not exist. Restore or remove it.")
+            elif note_id in referenced[kind]:
+                flag(pi, start, end, f"Factual Flag: this {name} reference repeats an earlier "
+                                     f"one; the same {name} is cited twice. Check the numbering.")
+            elif not any(paragraphs[i]['text'].strip() for i in notes[kind][note_id]):
+                flag(pi, start, end, f"Factual Flag: the {name} referenced here is empty.")
+            referenced[kind].add(note_id)
+
+    for kind, defined in notes.items():
+        for note_id, indices in defined.items():
+            if note_id in referenced[kind]:
+                continue
+            body = next((i for i in indices if paragraphs[i]['text'].strip()), None)
+            if body is None:
+                continue
+            text = paragraphs[body]['text']
+            words = list(re.finditer(r'\S+', text))[:6]
+            flag(body, words[0].start(), words[-1].end(),
+                 f"Factual Flag: nothing in the text refers to this {singular[kind]}. "
+                 "Add the reference or delete the note.")
+
+    # Typed superscript note numbers, which Word does not keep in sequence.
+    # Only a run of them that starts at 1 is read as notes, not exponents.
+    typed = [(pi, start, end) for pi, para in enumerate(paragraphs)
+             if para['part'] == 'document' and not para['toc']
+             for start, end in para['superscript']]
+    if len(typed) < 2 or paragraphs[typed[0][0]]['text'][typed[0][1]:typed[0][2]] != '1':
+        return matches
+    expected = 1
+    for pi, start, end in typed:
+        text = paragraphs[pi]['text']
+        number = int(text[start:end])
+        if number != expected:
+            problem = "repeats an earlier number" if number < expected else "skips ahead"
+            flag(pi, _word_before(text, start)[0], end,
+                 f"Factual Flag: note number {number} {problem}; {expected} was expected. "
+                 "Check the note numbering.")
+        expected = max(expected, number + 1)
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  NUMBERING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def captions(paragraphs):
+    """(para index, label, number or None, end of the label) per caption."""
+    found = []
+    for pi, para in reviewable_paragraphs(paragraphs):
+        if para['part'] != 'document' or para['toc']:
+            continue
+        m = CAPTION_RE.match(para['text'])
+        if m and len(para['text'].split()) <= MAX_CAPTION_WORDS:
+            found.append((pi, m.group(1), m.group(2), m.end(2) if m.group(2) else m.end(1)))
+    return found
+
+
+def numbering_matches(paragraphs):
+    """Matches for caption numbering and references to missing captions."""
+    matches = []
+
+    def flag(pi, start, end, comment, category='Formatting'):
+        matches.append({'para': pi, 'start': start, 'end': end,
+                        'category': category, 'comment': comment})
+
+    by_label = {}
+    for caption in captions(paragraphs):
+        by_label.setdefault(caption[1], []).append(caption)
+
+    for label, found in by_label.items():
+        numbered = [c for c in found if c[2]]
+        lower = label.lower()
+        seen = set()
+        expected = 1
+        for pi, _, number, end in found:
+            start = len(paragraphs[pi]['text']) - len(paragraphs[pi]['text'].lstrip())
+            if number is None:
+                if numbered:
+                    flag(pi, start, end, f"Formatting: other {lower}s are numbered "
+                                         f"({label} {numbered[0][2]}) but this one is not. "
+                                         f"Number {lower}s consistently.")
+                continue
+            if number in seen:
+                flag(pi, start, end, f"Formatting: {label} {number} is used twice. "
+                                     f"Renumber the {lower}s in sequence.")
+                continue
+            seen.add(number)
+            if number.isdigit():
+                if int(number) != expected:
+                    after = (f"follows {label} {expected - 1}" if expected > 1
+                             else f"is the first {lower}")
+                    flag(pi, start, end, f"Formatting: {label} {number} {after}; "
+                                         f"{lower}s should be numbered in sequence.")
+                expected = max(expected, int(number) + 1)
+
+        # In-text references to a caption the document does not have
+        caption_paras = {c[0] for c in found}
+        for pi, para in reviewable_paragraphs(paragraphs):
+            if para['part'] != 'document' or para['toc'] or pi in caption_paras:
+                continue
+            for m in REFERENCE_RE.finditer(para['text']):
+                if m.group(1) == label and numbered and m.group(2) not in seen:
+                    flag(pi, m.start(), m.end(),
+                         f"Factual Flag: the text refers to {label} {m.group(2)}, but no "
+                         f"{lower} has that number.", 'Factual Flag')
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FINDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def anchored_findings(paragraphs, matches):
+    """comment_only findings whose anchors land exactly on their matches.
+
+    Each anchor is widened until unique, then searched for as
+    apply_copyedits.py will search for it; findings that would be placed
+    anywhere else are dropped. Returns (findings, dropped count).
+    """
+    texts = [p['text'] for p in paragraphs]
+    corpus = '\n'.join(texts)
+    findings = []
+    dropped = 0
+    seen = set()
+    for m in sorted(matches, key=lambda m: (m['para'], m['start'])):
+        text = texts[m['para']]
+        start, end = unique_span(text, m['start'], m['end'], corpus, 0)
+        anchor = text[start:end]
+        hits = find_hits(texts, anchor)
+        if not anchor.strip() or not hits or hits[0][:2] != (m['para'], start):
+            dropped += 1
+            continue
+        if (anchor, m['comment']) in seen:
+            continue
+        seen.add((anchor, m['comment']))
+        findings.append({
+            'anchor_text': anchor,
+            'type': 'comment_only',
+            'category': m['category'],
+            'comment': m['comment'],
+        })
+    return findings, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check brackets, quotes, note references and caption numbering in a .docx."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("findings", help="findings.jsonl to write")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs, notes = read_structure(args.source)
+    checks = [
+        ('brackets and quotes', bracket_matches(paragraphs)),
+        ('notes', note_matches(paragraphs, notes)),
+        ('numbering', numbering_matches(paragraphs)),
+    ]
+    findings, dropped = anchored_findings(paragraphs, [m for _, found in checks for m in found])
+    write_findings(findings, args.findings, append=args.append)
+
+    for name, found in checks:
+        print(f"  {name}: {len(found)}")
+    print(f"Wrote {len(findings)} findings to {args.findings}")
+    if dropped:
+        print(f"  ({dropped} dropped: no anchor would land on them unambiguously)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
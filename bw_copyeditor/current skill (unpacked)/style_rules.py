@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+style_rules.py — Find mechanical house-style issues before the model pass.
+
+Many Bellwether style rules are mechanical: spacing around em dashes, double
+spaces, "percent" after numerals, state abbreviations, "like" before
+examples, word-choice fixes. This script checks all of them in one pass over
+the document text and writes the hits as findings in the findings.jsonl
+schema, with a category and a rationale comment, ready for
+apply_copyedits.py. The model then only has to review what rules can't catch.
+
+All rules are combined into a single regular expression, compiled once per
+process, so each paragraph is scanned once no matter how many rules exist.
+Protected sections (Acknowledgments, About the Authors, ...) are skipped, as
+are URLs and quoted material.
+
+Usage:
+    python style_rules.py <source.docx> <findings.jsonl> [--deliverable TYPE] [--append]
+
+TYPE is publication (default), blog, client, or internal; some rules (e.g.
+contractions) only apply to publications.
+"""
+
+import argparse
+import functools
+import os
+import re
+import sys
+from collections import namedtuple
+
+from apply_copyedits import (
+    build_findings, read_story_paragraphs, reviewable_paragraphs, write_findings,
+)
+
+DELIVERABLES = ('publication', 'blog', 'client', 'internal')
+
+# pattern     — regex for the issue; unnamed groups only
+# replace     — replacement template (\1 etc.), a function of the match that
+#               returns the replacement (or None to skip the hit), or None for
+#               a comment-only finding
+# ignore_case — match case-insensitively
+# only_for    — deliverable types the rule applies to (None = all)
+Rule = namedtuple('Rule', 'name category pattern replace comment ignore_case only_for')
+
+
+def _rule(name, category, pattern, replace, comment, ignore_case=False, only_for=None):
+    return Rule(name, category, pattern, replace, comment, ignore_case, only_for)
+
+
+def _same_case(word):
+    """Replacement that copies the capitalization of the matched text's first letter."""
+    def replace(m):
+        if m.group(0)[:1].isupper():
+            return word[:1].upper() + word[1:]
+        return word
+    return replace
+
+
+STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas',
+    'CA': 'California', 'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware',
+    'DC': 'D.C.', 'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii',
+    'ID': 'Idaho', 'IL': 'Illinois', 'IN': 'Indiana', 'IA': 'Iowa',
+    'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana', 'ME': 'Maine',
+    'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska',
+    'NV': 'Nevada', 'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico',
+    'NY': 'New York', 'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio',
+    'OK': 'Oklahoma', 'OR': 'Oregon', 'PA': 'Pennsylvania', 'RI': 'Rhode Island',
+    'SC': 'South Carolina', 'SD': 'South Dakota', 'TN': 'Tennessee', 'TX': 'Texas',
+    'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia', 'WA': 'Washington',
+    'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+
+NUMBER_WORDS = {
+    'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18,
+    'nineteen': 19, 'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+DIGIT_WORDS = ['', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+# Words after which a single digit stays a numeral (AP: ages, percentages,
+# units, labels like "Grade 3" or "Table 2")
+NUMERAL_CONTEXT = (
+    'grade', 'grades', 'table', 'figure', 'sidebar', 'chapter', 'section', 'page',
+    'pages', 'step', 'tier', 'level', 'phase', 'part', 'appendix', 'title',
+    'article', 'no', 'number', 'version', 'year', 'years', 'age', 'ages', 'option',
+    'round', 'question', 'exhibit', 'box', 'cohort', 'period', 'periods', 'unit',
+    'module', 'week', 'day', 'wave', 'cycle', 'and', 'or', 'to', 'of', 'in',
+)
+# One fixed-width lookbehind per word, in lower- and capitalized form
+NUMERAL_CONTEXT_RE = ''.join(
+    rf'(?<!\b[{w[0]}{w[0].upper()}]{w[1:]} )' for w in NUMERAL_CONTEXT
+)
+NUMERAL_UNITS = (
+    r'percent|percentage|%|million|billion|trillion|thousand|hundred|'
+    r'years?[- ]old|points?|p\.m\.|a\.m\.|am|pm|inches|feet|miles|pounds|'
+    r'degrees|credits?|hours?|minutes?|seconds?|and|or|to|through|of|out|x'
+)
+
+# Text no rule may start inside: URLs, and quoted material (direct quotes and
+# cited titles are reproduced as written). The closing quote itself is outside
+# the span so punctuation-inside-quotes can still fire on it.
+PROTECTED_TEXT_RE = re.compile(
+    r'(?:https?://|www\.)\S+'
+    r'|(?<=“)[^”]*(?=”)'
+    r'|(?<=")[^"]*(?=")'
+)
+
+
+def protected_spans(text):
+    """(start, end) spans of text that rules must leave alone."""
+    spans = []
+    pos = 0
+    for m in PROTECTED_TEXT_RE.finditer(text):
+        if m.start() < pos:
+            continue
+        spans.append((m.start(), m.end()))
+        # Step past the closing quote so it is not taken as the next opener
+        pos = m.end() + 1
+    return spans
+
+
+def _spell_digit(m):
+    return DIGIT_WORDS[int(m.group(1))]
+
+
+def _numeral(m):
+    word = m.group(1).lower()
+    value = NUMBER_WORDS[word]
+    if m.group(2):
+        value += DIGIT_WORDS.index(m.group(2).lower())
+    return str(value)
+
+
+def _em_dash(m):
+    return None if m.group(0) == ' — ' else ' — '
+
+
+def _pre_k(m):
+    # Keep the capital at the start of a sentence
+    before = m.string[:m.start()].rstrip()
+    return 'Pre-K' if not before or before[-1] in '.!?:' else 'pre-K'
+
+
+def _not_contraction(m):
+    verb = m.group(1)
+    full = {'ca': 'cannot', 'wo': 'will not'}.get(verb.lower(), verb.lower() + ' not')
+    return full[:1].upper() + full[1:] if verb[:1].isupper() else full
+
+
+RULES = [
+    # ── Spacing and dashes ──
+    _rule('double-space', 'Formatting', r'(?<=\S) {2,}(?=\S)', ' ',
+          "Formatting: use one space between words and sentences, never two."),
+    _rule('em-dash-spacing', 'AP Style', r'[ \t]*—[ \t]*', _em_dash,
+          "AP Style: em dashes take a space on either side."),
+    _rule('double-hyphen', 'AP Style', r'[ \t]*(?<!-)--(?!-)[ \t]*', ' — ',
+          "AP Style: use an em dash with a space on either side, not two hyphens."),
+    _rule('range-en-dash', 'Bellwether Style', r'(?<=[\dK])–(?=\d)', '-',
+          "Bellwether Style: use a regular hyphen for ranges (K-12, SY25-26), not an en dash."),
+    _rule('slash-spacing', 'Formatting', r'(?<=\w) / (?=\w)', '/',
+          "Formatting: no spaces around forward slashes."),
+
+    # ── Numbers, percentages, dates ──
+    _rule('percent', 'AP Style', r'(?<=\d) ?percent\b', '%',
+          "AP Style: use \"%\" with numerals.", ignore_case=True),
+    _rule('spell-out-digit', 'AP Style',
+          r'(?<![\w$.,%/–-])' + NUMERAL_CONTEXT_RE
+          + r'([1-9])(?= (?!(?i:' + NUMERAL_UNITS + r')\b)[a-z])',
+          _spell_digit, "AP Style: spell out numbers one through nine."),
+    _rule('numeral-10-plus', 'AP Style',
+          r'(?<=[a-z,;] )(' + '|'.join(NUMBER_WORDS) + r')(?:-(' + '|'.join(DIGIT_WORDS[1:])
+          + r'))?(?= [a-z])(?! (?:percent|million|billion)\b)',
+          _numeral, "AP Style: use numerals for 10 and above."),
+    _rule('date-ordinal', 'AP Style',
+          r'\b(January|February|March|April|May|June|July|August|September|'
+          r'October|November|December) (\d{1,2})(?:st|nd|rd|th)\b', r'\1 \2',
+          "AP Style: no ordinal suffix on dates."),
+
+    # ── Punctuation ──
+    _rule('punctuation-inside-quotes', 'AP Style', r'([”"])([.,])', r'\2\1',
+          "AP Style: periods and commas always go inside quotation marks."),
+    _rule('ampersand', 'Bellwether Style', r'(?<=[a-z]) & (?=[a-z])', ' and ',
+          "Bellwether Style: spell out \"and\" unless \"&\" is part of a formal name."),
+
+    # ── State names ──
+    _rule('state-abbreviation', 'AP Style',
+          r'(?<=[a-z], )(' + '|'.join(STATES) + r')\b(?![.\w-])',
+          lambda m: STATES[m.group(1)],
+          "AP Style: spell out state names in running text."),
+
+    # ── Word choice ──
+    _rule('such-as', 'AP Style',
+          r'(?<=\w)(?<!\b[Ii]s)(?<!\b[Hh]as)(?<!\b[Ww]as)(?<![Tt]his)(?<!\bus)(?<=s)'
+          r',? like (?=[A-Z][a-z])',
+          lambda m: m.group(0).replace('like', 'such as'),
+          "AP Style: use \"such as\" for examples, \"like\" for comparisons."),
+    _rule('is-comprised-of', 'Grammar', r'\b(is|are) comprised of\b',
+          lambda m: 'comprises' if m.group(1) == 'is' else 'comprise',
+          "Grammar: \"comprised of\" is never correct; use \"comprises.\""),
+    _rule('comprised-of', 'Grammar', r'\bcomprised of\b', None,
+          "Grammar: \"comprised of\" is never correct; consider \"comprises\" or "
+          "\"is composed of.\""),
+    _rule('adviser', 'Bellwether Style', r'\b([Aa])dvisor(s?)\b', r'\1dviser\2',
+          "Bellwether Style: \"adviser\" (not \"advisor\"); \"advisory\" is correct."),
+    _rule('health-care', 'Bellwether Style', r'\b([Hh])ealthcare\b', r'\1ealth care',
+          "Bellwether Style: \"health care\" is two words."),
+    _rule('child-care', 'Bellwether Style', r'\b([Cc])hildcare\b', r'\1hild care',
+          "Bellwether Style: \"child care\" is two words."),
+    _rule('ed-tech', 'Bellwether Style', r'\b([Ee])d-?tech\b', r'\1d tech',
+          "Bellwether Style: \"ed tech\" is two words."),
+    _rule('in-order-to', 'Verbosity', r'\b[Ii]n order to\b', _same_case('to'),
+          "Verbosity: \"to\" is enough; drop \"in order.\""),
+    _rule('extant', 'Clarity', r'\bextant\b', 'existing',
+          "Clarity: \"existing\" is more accessible than \"extant.\""),
+    _rule('past-history', 'Verbosity', r'\bpast history\b', 'history',
+          "Verbosity: \"past\" is redundant with \"history.\""),
+
+    # ── Wordy constructions ──
+    _rule('due-to-the-fact', 'Verbosity', r'\b[Dd]ue to the fact that\b', _same_case('because'),
+          "Verbosity: \"because\" is enough."),
+    _rule('despite-the-fact', 'Verbosity', r'\b[Ii]n spite of the fact that\b',
+          _same_case('although'), "Verbosity: \"although\" is enough."),
+    _rule('in-the-event-that', 'Verbosity', r'\b[Ii]n the event that\b', _same_case('if'),
+          "Verbosity: \"if\" is enough."),
+    _rule('at-this-point-in-time', 'Verbosity', r'\b[Aa]t this point in time\b',
+          _same_case('now'), "Verbosity: \"now\" is enough."),
+    _rule('in-an-effort-to', 'Verbosity', r'\b[Ii]n an effort to\b', _same_case('to'),
+          "Verbosity: \"to\" is enough; drop \"in an effort.\""),
+    _rule('has-the-ability-to', 'Verbosity', r'\b(has|have|had) the ability to\b',
+          lambda m: 'could' if m.group(1) == 'had' else 'can',
+          "Verbosity: \"can\" is enough."),
+    _rule('the-majority-of', 'Verbosity', r'\b[Tt]he (?:vast )?majority of\b', _same_case('most'),
+          "Verbosity: \"most\" is shorter than \"the majority of.\""),
+    _rule('prior-to', 'Verbosity', r'\b[Pp]rior to\b', _same_case('before'),
+          "Verbosity: \"before\" is plainer than \"prior to.\""),
+    _rule('help-to', 'Verbosity',
+          r'\b(help(?:s|ed|ing)?) to (?!(?:the|a|an|their|its|his|her|our|your|them|this|'
+          r'these|those|that|all|each|every|some|many|more|most)\b)(?=[a-z]+\b)', r'\1 ',
+          "Verbosity: unnecessary \"to.\""),
+    _rule('each-and-every', 'Verbosity', r'\b[Ee]ach and every\b', _same_case('every'),
+          "Verbosity: \"every\" is enough."),
+    _rule('first-and-foremost', 'Verbosity', r'\b[Ff]irst and foremost\b', _same_case('first'),
+          "Verbosity: \"first\" is enough."),
+    _rule('redundant-pair', 'Verbosity',
+          r'\b(?:end results?|future plans?|close proximity|completely eliminat(?:e|es|ed|ing)'
+          r'|basic fundamentals)\b',
+          lambda m: m.group(0).split(' ', 1)[1],
+          "Verbosity: the modifier is redundant."),
+    _rule('whether-or-not', 'Verbosity', r'\bwhether or not\b', None,
+          "Verbosity: \"whether\" is usually enough; keep \"or not\" only when it means "
+          "\"regardless of whether.\""),
+    _rule('in-terms-of', 'Verbosity', r'\b[Ii]n terms of\b', None,
+          "Verbosity: \"in terms of\" is usually filler; consider a more direct preposition."),
+    _rule('with-regard-to', 'Verbosity', r'\b(?:[Ww]ith|[Ii]n) (?:regard|respect) to\b', None,
+          "Verbosity: consider \"about,\" \"for,\" or \"on.\""),
+    _rule('it-should-be-noted', 'Verbosity', r'\bIt should be noted that\b', None,
+          "Verbosity: throat-clearing; start with the point."),
+
+    # ── Hyphenation ──
+    _rule('no-hyphen-prefix', 'Bellwether Style',
+          r'\b([Nn]on|[Uu]nder|[Ss]ocio|[Pp]ost)-(profit|served|represented|economic|secondary)\b',
+          r'\1\2', "Bellwether Style: no hyphen in this word."),
+    _rule('pre-k', 'Bellwether Style',
+          r'\b(?:[Pp]re-?[Kk]indergarten|[Pp]re-?K|pre-k)\b',
+          _pre_k, "Bellwether Style: pre-kindergarten is \"pre-K.\""),
+    _rule('k-12', 'Bellwether Style', r'\bK12\b', 'K-12',
+          "Bellwether Style: grade range is \"K-12.\""),
+    _rule('ly-hyphen', 'AP Style',
+          r'\b(?!(?:early|family|only|daily|weekly|monthly|yearly|friendly|likely|'
+          r'elderly|costly|holy|ugly|silly|curly|burly|lonely|bully|rally|belly|'
+          r'jelly|supply|apply|reply|ally)-)(\w+ly)-(?=[a-z])',
+          r'\1 ', "AP Style: words ending in \"-ly\" do not take a hyphen."),
+    _rule('no-hyphen-identity', 'Bellwether Style',
+          r'\b(African|Asian|Mexican|Native)-(American)\b', r'\1 \2',
+          "Bellwether Style: do not hyphenate \"Asian American\" or \"African American.\""),
+    _rule('learners-no-hyphen', 'Bellwether Style',
+          r'\b([Dd]ual|English)-(language learners|learners)\b', r'\1 \2',
+          "Bellwether Style: \"dual language learners\" and \"English learners\" take no hyphen."),
+
+    # ── Capitalization and names ──
+    _rule('theory-of-action', 'Bellwether Style',
+          r'(?<=[a-z,;] )Theory [Oo]f (Action|Change)\b',
+          lambda m: 'theory of ' + m.group(1).lower(),
+          "Bellwether Style: lowercase \"theory of action\" and \"theory of change.\""),
+    _rule('civil-rights-movement', 'Bellwether Style',
+          r'\b(?!Civil Rights Movement)[Cc]ivil [Rr]ights [Mm]ovement\b',
+          'Civil Rights Movement',
+          "Bellwether Style: capitalize \"Civil Rights Movement\" for the 1950s–60s movement."),
+    _rule('lgbtq', 'Bellwether Style', r'\bLGBTQ?(?:IA)?\b(?!\+)', 'LGBTQ+',
+          "Bellwether Style: \"LGBTQ+\" is the correct form."),
+    _rule('teach-for-america', 'Bellwether Style', r'\bTeach for America\b',
+          'Teach For America',
+          "Bellwether Style: capitalize all three words of \"Teach For America.\""),
+    _rule('gates-foundation', 'Bellwether Style',
+          r'\bBill (?:&|and) Melinda Gates Foundation\b', 'Gates Foundation',
+          "Bellwether Style: as of FY25, use \"Gates Foundation.\""),
+    _rule('english-learners', 'Bellwether Style',
+          r'\bEnglish language learners\b', 'English learners',
+          "Bellwether Style: use \"English learners\" or \"EL students,\" not "
+          "\"English language learners.\""),
+    _rule('ells', 'Bellwether Style', r'\bELL(s?)\b', r'EL\1',
+          "Bellwether Style: use \"EL\"/\"ELs,\" not \"ELL\"/\"ELLs.\""),
+    _rule('doe', 'Bellwether Style', r'\b(?:DOE|USDOE)\b', None,
+          "Bellwether Style: spell out \"U.S. Department of Education\" or use "
+          "\"the Department\"; do not abbreviate."),
+
+    # ── Contractions (publications only) ──
+    _rule('contraction-not', 'AP Style',
+          r"\b(do|does|did|is|are|was|were|has|have|had|would|should|could|ca|wo)n[’']t\b",
+          _not_contraction,
+          "AP Style: avoid contractions in publications.",
+          ignore_case=True, only_for=('publication',)),
+    _rule('contraction-it-is', 'AP Style', r"\b([Ii]t|[Tt]hat|[Tt]here)[’']s\b",
+          r'\1 is', "AP Style: avoid contractions in publications.",
+          only_for=('publication',)),
+
+    # ── Flags for the author ──
+    _rule('draft-marker', 'Formatting',
+          r'FOR (?:SUPER )?COPY EDITORS|FOR INTERNAL REVIEW|\[(?:TK|TODO|INSERT[^\]]*)\]|\bTK\b',
+          None, "Formatting: draft marker or placeholder; remove before publication."),
+    _rule('dangerous-typo', 'Spelling', r'\b(?:pubic|shit|asses)\b', None,
+          "Spelling: likely typo (\"public,\" \"shift,\" or \"assess\"); please confirm."),
+    _rule('impactful', 'Precision', r'\bimpactful\b', None,
+          "Precision: avoid \"impactful\"; consider \"effective\" or \"influential.\"",
+          ignore_case=True),
+    _rule('citizen', 'Precision', r'\bcitizens?\b', None,
+          "Precision: use \"citizen\" only for legal status; consider \"resident\" or "
+          "\"person.\"", ignore_case=True),
+    _rule('move-the-needle', 'Precision', r'\bmov(?:e|es|ed|ing) the needle\b', None,
+          "Precision: replace the idiom with plain language, e.g. \"make a meaningful impact.\"",
+          ignore_case=True),
+    _rule('throat-clearing', 'Clarity',
+          r'\bIt is (?:important|worth) (?:to note|noting) that\b', None,
+          "Clarity: throat-clearing; consider starting with the point."),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rules(deliverable='publication', categories=None):
+    """Compile the rules for a deliverable into one combined pattern.
+
+    categories, a tuple of category names, keeps only those rules (None =
+    all). Returns (combined_pattern, rules, rule_patterns). Each rule
+    becomes a named alternative r<N> of the combined pattern; the rule's own
+    pattern is used to re-match a hit so its groups number from 1. Cached
+    per process, so batch runs compile once.
+
+    Unlike the inclusive-language lexicon and the spelling word list, there
+    is no on-disk cache under DEFAULT_CACHE_DIR: the rules are Python
+    literals, with nothing to parse, and a compiled pattern cannot be
+    stored (pickling one recompiles it on load). Compiling every rule takes
+    a few milliseconds.
+    """
+    rules = [
+        r for r in RULES
+        if (r.only_for is None or deliverable in r.only_for)
+        and (categories is None or r.category in categories)
+    ]
+    alternatives = []
+    rule_patterns = []
+    for i, rule in enumerate(rules):
+        flags = re.IGNORECASE if rule.ignore_case else 0
+        rule_patterns.append(re.compile(rule.pattern, flags))
+        body = f'(?i:{rule.pattern})' if rule.ignore_case else rule.pattern
+        alternatives.append(f'(?P<r{i}>{body})')
+    return re.compile('|'.join(alternatives)), rules, rule_patterns
+
+
+def find_rule_matches(paragraphs, deliverable='publication', categories=None):
+    """Scan paragraphs once and return matches for build_findings().
+
+    categories limits the scan to rules of those categories (None = all).
+    """
+    combined, rules, rule_patterns = compile_rules(
+        deliverable, tuple(categories) if categories is not None else None
+    )
+    matches = []
+    for pi, para in reviewable_paragraphs(paragraphs):
+        text = para['text']
+        protected = protected_spans(text)
+        for hit in combined.finditer(text):
+            if any(s <= hit.start() < e for s, e in protected):
+                continue
+            i = int(hit.lastgroup[1:])
+            rule = rules[i]
+            m = rule_patterns[i].match(text, hit.start())
+            if m is None or m.end() != hit.end():
+                continue
+            if rule.replace is None:
+                new = None
+            elif callable(rule.replace):
+                new = rule.replace(m)
+                if new is None:
+                    continue
+            else:
+                new = m.expand(rule.replace)
+            if new == m.group(0):
+                continue
+            matches.append({
+                'para': pi,
+                'start': m.start(),
+                'end': m.end(),
+                'new': new,
+                'category': rule.category,
+                'comment': rule.comment,
+                'rule': rule.name,
+            })
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write mechanical house-style findings for a .docx."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("findings", help="findings.jsonl to write")
+    parser.add_argument("--deliverable", choices=DELIVERABLES, default="publication",
+                        help="deliverable type (default: publication)")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs = read_story_paragraphs(args.source)
+    matches = find_rule_matches(paragraphs, args.deliverable)
+    findings = build_findings(paragraphs, matches)
+    write_findings(findings, args.findings, append=args.append)
+
+    counts = {}
+    for m in matches:
+        counts[m['rule']] = counts.get(m['rule'], 0) + 1
+    print(f"Wrote {len(findings)} findings ({len(matches)} rule hits) to {args.findings}")
+    for name, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {name}: {n}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
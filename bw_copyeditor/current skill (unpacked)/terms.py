@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+terms.py — Check term consistency and acronym use across the whole document.
+
+Inconsistent spellings ("pre-K," "PreK," "pre K") and acronym mistakes need
+the whole document in view, which a chunked model pass does not have. This
+script reads body text, footnotes and endnotes once and builds an index of:
+
+    - every word and two-word compound under a key that ignores case,
+      hyphens and spaces, with the forms it takes and where
+    - every acronym, with where it is defined ("Outcomes-based funding
+      (OBF)") and where it is used
+
+From the index it writes comment-only findings for:
+
+    - a term spelled with a hyphen, a space, or closed up in different
+      places ("health care" / "healthcare"), or capitalized in some places
+      and not others ("the State" / "the state")
+    - an acronym used before it is defined, defined twice, defined but used
+      once or not at all, or never defined
+
+Sentence-initial words, headings and proper names are not counted as case
+variants, and well-known acronyms (U.S.-style initialisms such as GPA or
+GDP) need no definition. --index writes the index as JSON so chunked passes
+can share it.
+
+Usage:
+    python terms.py <source.docx> <findings.jsonl> [--index FILE] [--append]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from apply_copyedits import (
+    build_findings, read_story_paragraphs, reviewable_paragraphs, write_findings,
+)
+from repetition import STOPWORDS
+from style_rules import protected_spans
+
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z’'-]*[A-Za-z]|[A-Za-z]")
+# Anything after which a capital letter is expected: sentence ends, colons,
+# opening brackets and quotes, list dashes
+CAPITAL_NEXT_RE = re.compile(r'[.!?:;(\[“"•]|\s[-–—]\s|^\s*-\s*$|-\s+$')
+
+ACRONYM_RE = re.compile(r"\b([A-Z][A-Z0-9]*[A-Z])(?:s|’s|'s|\d+)?\b")
+DEFINITION_RE = re.compile(
+    r"\(\s*(?:also known as |or |hereafter |hereafter, )?[\"“]?([A-Z][A-Z0-9]*[A-Z])s?[\"”]?\s*\)"
+)
+ROMAN_RE = re.compile(r'^[IVXLC]+$')
+
+# Initialisms readers know without a definition
+WELL_KNOWN = frozenset('''
+    US USA UK EU UN AM PM TV DC GPA GDP SAT ACT CEO CFO FAQ PDF ID OK NASA FBI CIA
+    AIDS HIV COVID STEM PTA AP IQ IT HR PR HTML URL MBA MM DD YYYY
+'''.split())
+
+# Shortest word looked at for variants
+MIN_TERM_LENGTH = 2
+
+
+def _key(low):
+    return low.replace('-', '').replace(' ', '')
+
+
+def _spelling(low):
+    """How a lowered form is joined: 'hyphenated', 'open' or 'closed'."""
+    if '-' in low:
+        return 'hyphenated'
+    return 'open' if ' ' in low else 'closed'
+
+
+def _is_acronym(word):
+    return len(word) > 1 and word.isupper()
+
+
+def _in_spans(pos, spans):
+    return any(a <= pos < b for a, b in spans)
+
+
+def _title_context(words, j):
+    """True when the nearest content word on either side is capitalized."""
+    for step in (-1, 1):
+        k = j + step
+        while 0 <= k < len(words) and words[k].group().lower() in STOPWORDS:
+            k += step
+        if 0 <= k < len(words) and words[k].group()[0].isupper():
+            return True
+    return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  INDEX
+# ═══════════════════════════════════════════════════════════════════════════
+
+def build_index(paragraphs):
+    """One pass over the reviewable paragraphs.
+
+    Returns (terms, acronyms):
+        terms    — key -> list of occurrences (para, start, end, form,
+                   case_counts), form being the surface text and case_counts
+                   False for sentence-initial, heading or proper-name uses
+        acronyms — acronym -> {'definitions': [(para, start, end)],
+                   'uses': [(para, start, end)]}
+    """
+    terms = {}
+    pairs = {}
+    acronyms = {}
+    for pi, para in reviewable_paragraphs(paragraphs):
+        if para['toc']:
+            continue
+        text = para['text']
+        heading = para['level'] is not None
+
+        skip = protected_spans(text)
+        defined = set()
+        for m in DEFINITION_RE.finditer(text):
+            entry = acronyms.setdefault(m.group(1), {'definitions': [], 'uses': []})
+            entry['definitions'].append((pi, m.start(), m.end()))
+            defined.add(m.start(1))
+        if not heading:
+            found = list(ACRONYM_RE.finditer(text))
+            for k, m in enumerate(found):
+                word = m.group(1)
+                # A run of capitals ("NOTE FOR EDITORS") is a banner, not acronyms
+                in_run = any(
+                    0 <= n < len(found) and text[min(m.end(), found[n].end()):
+                                                 max(m.start(), found[n].start())].isspace()
+                    for n in (k - 1, k + 1)
+                )
+                if (m.start(1) in defined or ROMAN_RE.match(word) or in_run
+                        or _in_spans(m.start(), skip)
+                        or text[max(0, m.start() - 1):m.start()] == '/'
+                        or text[m.end():m.end() + 1] == '/'):
+                    continue
+                entry = acronyms.setdefault(word, {'definitions': [], 'uses': []})
+                entry['uses'].append((pi, m.start(), m.end(1)))
+
+        words = [m for m in WORD_RE.finditer(text) if not _in_spans(m.start(), skip)]
+        for j, m in enumerate(words):
+            gap = text[words[j - 1].end() if j else 0:m.start()]
+            capital_expected = not j or bool(CAPITAL_NEXT_RE.search(gap))
+            word = m.group().replace('’', "'")
+            if len(word) < MIN_TERM_LENGTH:
+                continue
+            # Labels and names: "Period 2", "Utah State Board of Education"
+            labelled = text[m.end():m.end() + 2].strip()[:1].isdigit()
+            case_counts = not (
+                capital_expected or heading or para['part'] != 'document' or labelled
+                or _is_acronym(word) or _title_context(words, j)
+            )
+            terms.setdefault(_key(word.lower()), []).append(
+                (pi, m.start(), m.end(), word, case_counts)
+            )
+            if j and gap == ' ':
+                prev = words[j - 1].group().replace('’', "'")
+                pair = (prev.lower(), word.lower())
+                if ('-' not in prev and '-' not in word
+                        and not any(w in STOPWORDS or len(w) < 3 for w in pair)):
+                    pairs.setdefault(_key(''.join(pair)), []).append(
+                        (pi, words[j - 1].start(), m.end(), f'{prev} {word}', False)
+                    )
+
+    # A two-word form only matters if the term also appears as one word
+    for key, occurrences in pairs.items():
+        if key in terms:
+            terms[key].extend(occurrences)
+
+    # Capitals for emphasis ("Do NOT edit") are words, not acronyms
+    for acronym in list(acronyms):
+        entry = acronyms[acronym]
+        if not entry['definitions'] and any(
+            not _is_acronym(occ[3]) for occ in terms.get(_key(acronym.lower()), ())
+        ):
+            del acronyms[acronym]
+    return terms, acronyms
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FINDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _majority(occurrences, form_of):
+    counts = {}
+    for occ in occurrences:
+        form = form_of(occ)
+        counts[form] = counts.get(form, 0) + 1
+    # Ties go to the form seen first
+    best = max(counts.values())
+    for occ in occurrences:
+        if counts[form_of(occ)] == best:
+            return form_of(occ), counts
+    return None, counts
+
+
+def _match(para, start, end, category, comment, rule):
+    return {
+        'para': para, 'start': start, 'end': end, 'new': None,
+        'category': category, 'comment': comment, 'rule': rule,
+    }
+
+
+def term_findings(terms):
+    """Matches for spelling and capitalization variants of the same term."""
+    matches = []
+    for key, occurrences in terms.items():
+        occurrences.sort()
+        spellings = {_spelling(occ[3].lower()) for occ in occurrences}
+        if len(spellings) > 1:
+            usual, counts = _majority(occurrences, lambda o: o[3].lower())
+            for pi, start, end, form, _ in occurrences:
+                low = form.lower()
+                if _spelling(low) == _spelling(usual):
+                    continue
+                note = (' A compound modifier before a noun keeps its hyphen.'
+                        if 'hyphenated' in (_spelling(low), _spelling(usual)) else '')
+                matches.append(_match(
+                    pi, start, end, 'Bellwether Style',
+                    f"Bellwether Style: \"{form}\" is written \"{usual}\" "
+                    f"{counts[usual]} time{'s' if counts[usual] != 1 else ''} elsewhere; "
+                    f"use one form throughout.{note}",
+                    'term-spelling',
+                ))
+            continue
+
+        cased = [occ for occ in occurrences if occ[4]]
+        forms = {occ[3] for occ in cased}
+        if len(forms) > 1 and len({f.lower() for f in forms}) == 1:
+            usual, counts = _majority(cased, lambda o: o[3])
+            for pi, start, end, form, _ in cased:
+                if form == usual:
+                    continue
+                matches.append(_match(
+                    pi, start, end, 'Bellwether Style',
+                    f"Bellwether Style: \"{form}\" is written \"{usual}\" "
+                    f"{counts[usual]} time{'s' if counts[usual] != 1 else ''} elsewhere; "
+                    "capitalize it the same way throughout.",
+                    'term-case',
+                ))
+    return matches
+
+
+def acronym_findings(paragraphs, acronyms):
+    """Matches for acronyms used before definition, redefined, unused or undefined."""
+    matches = []
+    for acronym, entry in acronyms.items():
+        definitions = sorted(entry['definitions'])
+        uses = sorted(entry['uses'])
+        if not definitions:
+            # Citations name organizations without spelling them out
+            body = [u for u in uses if paragraphs[u[0]]['part'] == 'document']
+            if acronym not in WELL_KNOWN and body:
+                pi, start, end = body[0]
+                matches.append(_match(
+                    pi, start, end, 'AP Style',
+                    f"AP Style: \"{acronym}\" is not spelled out anywhere in the document; "
+                    "spell it out at first use unless readers will know it.",
+                    'acronym-undefined',
+                ))
+            continue
+
+        first = definitions[0]
+        body_def = paragraphs[first[0]]['part'] == 'document'
+        early = [u for u in uses if body_def and paragraphs[u[0]]['part'] == 'document'
+                 and u < first]
+        if early and acronym not in WELL_KNOWN:
+            pi, start, end = early[0]
+            matches.append(_match(
+                pi, start, end, 'AP Style',
+                f"AP Style: \"{acronym}\" is used here before it is spelled out later in "
+                "the document; spell it out at first use.",
+                'acronym-before-definition',
+            ))
+
+        for pi, start, end in definitions[1:]:
+            matches.append(_match(
+                pi, start, end, 'AP Style',
+                f"AP Style: \"{acronym}\" is already defined earlier; use the acronym alone.",
+                'acronym-redefined',
+            ))
+
+        later = [u for u in uses + definitions[1:] if u > first]
+        if len(later) <= 1:
+            pi, start, end = first
+            if later:
+                comment = (f"AP Style: \"{acronym}\" is used only once after it is defined; "
+                           "consider spelling it out there and dropping the acronym.")
+            else:
+                comment = (f"AP Style: \"{acronym}\" is defined but not used again; "
+                           "consider dropping the parenthetical.")
+            matches.append(_match(pi, start, end, 'AP Style', comment, 'acronym-unused'))
+    return matches
+
+
+def index_summary(paragraphs, terms, acronyms):
+    """The index as plain JSON: variant terms and every acronym."""
+    def where(pi):
+        return paragraphs[pi]['locator']
+
+    variants = {}
+    for key, occurrences in terms.items():
+        forms = {}
+        for occ in occurrences:
+            forms[occ[3]] = forms.get(occ[3], 0) + 1
+        spellings = {_spelling(f.lower()) for f in forms}
+        if len(spellings) > 1 or len({o[3] for o in occurrences if o[4]}) > 1:
+            variants[key] = forms
+    return {
+        'terms': dict(sorted(variants.items())),
+        'acronyms': {
+            acronym: {
+                'defined': [where(d[0]) for d in sorted(entry['definitions'])],
+                'uses': len(entry['uses']),
+                'first_use': where(min(entry['uses'])[0]) if entry['uses'] else None,
+            }
+            for acronym, entry in sorted(acronyms.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write term-consistency and acronym findings for a .docx."
+    )
+    parser.add_argument("source", help="source .docx")
+    parser.add_argument("findings", help="findings.jsonl to write")
+    parser.add_argument("--index", metavar="FILE",
+                        help="also write the term and acronym index as JSON")
+    parser.add_argument("--append", action="store_true",
+                        help="append to the findings file instead of overwriting it")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: source file not found: {args.source}")
+        return 1
+
+    paragraphs = read_story_paragraphs(args.source)
+    terms, acronyms = build_index(paragraphs)
+    variant_matches = term_findings(terms)
+    acronym_matches = acronym_findings(paragraphs, acronyms)
+    findings = build_findings(paragraphs, variant_matches + acronym_matches)
+    write_findings(findings, args.findings, append=args.append)
+
+    if args.index:
+        with open(args.index, 'w', encoding='utf-8') as f:
+            json.dump(index_summary(paragraphs, terms, acronyms), f,
+                      indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    print(f"Wrote {len(findings)} findings to {args.findings}")
+    print(f"  term variants: {len(variant_matches)}")
+    print(f"  acronyms: {len(acronym_matches)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+validate_docx.py — Structural checks for a generated .docx, without Word.
+
+Word reports most broken packages only as "unreadable content." This script
+catches the causes we have hit, in one streaming pass over each part (parts
+are never held as full trees, so large documents validate quickly):
+
+    - every part is well-formed XML and has a content type
+    - every internal relationship target exists
+    - revision IDs (w:ins, w:del, moves, property changes) are unique
+    - w:ins / w:del sit under a legal parent and hold only run-level content
+    - deleted runs use w:delText / w:delInstrText, other runs w:t / w:instrText
+    - comment IDs are unique; every commentRangeStart has a matching end and a
+      reference in the same part; every reference has a comment
+
+Usage:
+    python validate_docx.py <file.docx> [--quiet]
+
+Exits 1 if any error is found. Warnings (e.g. a comment nobody references)
+do not affect the exit code.
+"""
+
+import argparse
+import os
+import posixpath
+import sys
+import zipfile
+from collections import namedtuple
+
+from apply_copyedits import W, etree
+
+Problem = namedtuple('Problem', 'severity part message')
+
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+REVISIONS = {f'{{{W}}}{t}' for t in (
+    'ins', 'del', 'moveFrom', 'moveTo', 'rPrChange', 'pPrChange', 'sectPrChange',
+    'tblPrChange', 'tblPrExChange', 'trPrChange', 'tcPrChange', 'tblGridChange',
+    'numberingChange', 'cellIns', 'cellDel', 'cellMerge',
+)}
+RUN_REVISIONS = {f'{{{W}}}{t}' for t in ('ins', 'del', 'moveFrom', 'moveTo')}
+DELETED = {f'{{{W}}}del', f'{{{W}}}moveFrom'}
+
+# Containers a run-level w:ins/w:del may appear in
+REVISION_PARENTS = {f'{{{W}}}{t}' for t in (
+    'p', 'hyperlink', 'smartTag', 'customXml', 'sdtContent', 'fldSimple',
+    'ins', 'del', 'moveFrom', 'moveTo', 'dir', 'bdo',
+)}
+# Property containers where w:ins/w:del is an empty marker, not a container
+REVISION_MARKER_PARENTS = {f'{{{W}}}{t}' for t in ('rPr', 'trPr', 'numberingChange')}
+# What a run-level w:ins/w:del may contain (WordprocessingML children only)
+REVISION_CHILDREN = {f'{{{W}}}{t}' for t in (
+    'r', 'ins', 'del', 'moveFrom', 'moveTo', 'customXml', 'smartTag', 'sdt',
+    'dir', 'bdo', 'proofErr', 'permStart', 'permEnd', 'bookmarkStart',
+    'bookmarkEnd', 'commentRangeStart', 'commentRangeEnd', 'moveFromRangeStart',
+    'moveFromRangeEnd', 'moveToRangeStart', 'moveToRangeEnd',
+    'customXmlInsRangeStart', 'customXmlInsRangeEnd', 'customXmlDelRangeStart',
+    'customXmlDelRangeEnd', 'customXmlMoveFromRangeStart',
+    'customXmlMoveFromRangeEnd', 'customXmlMoveToRangeStart',
+    'customXmlMoveToRangeEnd',
+)}
+
+TEXT_TAG, DEL_TEXT_TAG = f'{{{W}}}t', f'{{{W}}}delText'
+INSTR_TAG, DEL_INSTR_TAG = f'{{{W}}}instrText', f'{{{W}}}delInstrText'
+ID = f'{{{W}}}id'
+
+
+def _resolve_target(rels_name, target):
+    """Package path a relationship target points to."""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    # word/_rels/document.xml.rels describes word/document.xml
+    base = posixpath.dirname(posixpath.dirname(rels_name))
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def check_package(z, problems):
+    """Content types for every part; every internal relationship target exists."""
+    names = [n for n in z.namelist() if not n.endswith('/')]
+    present = set(names)
+    if '[Content_Types].xml' not in present:
+        problems.append(Problem('error', '[Content_Types].xml', 'missing'))
+        return
+    ct_root = etree.fromstring(z.read('[Content_Types].xml'))
+    defaults = {
+        d.get('Extension', '').lower() for d in ct_root.findall(f'{{{CT_NS}}}Default')
+    }
+    overrides = {
+        o.get('PartName', '').lstrip('/').lower()
+        for o in ct_root.findall(f'{{{CT_NS}}}Override')
+    }
+    for name in names:
+        if name == '[Content_Types].xml':
+            continue
+        if name.lower() in overrides:
+            continue
+        ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+        # The xml Default is plain application/xml; Word ignores main parts
+        # (document, comments, ...) typed that way
+        if name.startswith('word/') and ext == 'xml':
+            problems.append(Problem('error', name, 'no content type override'))
+        elif ext not in defaults:
+            problems.append(Problem('error', name, 'no content type'))
+    lower = {n.lower() for n in present}
+    for part in sorted(overrides - lower):
+        problems.append(Problem('warning', part, 'content type override for a missing part'))
+
+    for name in names:
+        if not name.endswith('.rels'):
+            continue
+        try:
+            rels_root = etree.fromstring(z.read(name))
+        except etree.XMLSyntaxError:
+            continue  # reported by the streaming pass
+        for rel in rels_root.findall(f'{{{REL_NS}}}Relationship'):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = _resolve_target(name, rel.get('Target', ''))
+            if target not in present:
+                problems.append(Problem(
+                    'error', name, f"relationship {rel.get('Id')} targets missing part {target}"
+                ))
+
+
+def scan_part(z, name, state, problems):
+    """Stream one XML part, recording IDs and flagging local problems."""
+    stack = []           # (tag, opens a deletion) for each open element
+    deleted_depth = 0    # open w:del/w:moveFrom containers
+    ranges = state['ranges'].setdefault(name, {'start': [], 'end': [], 'ref': []})
+    try:
+        with z.open(name) as f:
+            for event, elem in etree.iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'end':
+                    deleted_depth -= stack.pop()[1]
+                    # Free finished elements so memory stays flat
+                    elem.clear(keep_tail=True)
+                    if elem.getparent() is not None:
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                    continue
+
+                parent = stack[-1][0] if stack else None
+                opens_deletion = False
+                if isinstance(tag, str):
+                    opens_deletion = _check_element(
+                        name, elem, tag, parent, deleted_depth, state, ranges, problems
+                    )
+                stack.append((tag, opens_deletion))
+                deleted_depth += opens_deletion
+    except etree.XMLSyntaxError as e:
+        problems.append(Problem('error', name, f"not well-formed XML: {e}"))
+
+
+def _check_element(name, elem, tag, parent, deleted_depth, state, ranges, problems):
+    """Checks for one start tag; returns True if it opens deleted content."""
+    in_w = tag.startswith(f'{{{W}}}')
+    opens_deletion = False
+
+    if tag in REVISIONS:
+        rid = elem.get(ID)
+        if rid is not None:
+            if rid in state['revision_ids']:
+                problems.append(Problem(
+                    'error', name, f"duplicate revision id {rid} "
+                    f"(also in {state['revision_ids'][rid]})"
+                ))
+            else:
+                state['revision_ids'][rid] = name
+
+    if tag in RUN_REVISIONS:
+        # Math and other non-WordprocessingML containers are not checked
+        if parent in REVISION_MARKER_PARENTS:
+            pass
+        elif parent is None or (parent.startswith(f'{{{W}}}') and parent not in REVISION_PARENTS):
+            problems.append(Problem(
+                'error', name, f"{_short(tag)} id={elem.get(ID)} inside {_short(parent)}"
+            ))
+        else:
+            opens_deletion = tag in DELETED
+    elif parent in RUN_REVISIONS and in_w and tag not in REVISION_CHILDREN:
+        problems.append(Problem('error', name, f"{_short(tag)} inside {_short(parent)}"))
+
+    if tag in (TEXT_TAG, INSTR_TAG) and deleted_depth:
+        problems.append(Problem(
+            'error', name, f"{_short(tag)} in a deleted run (use "
+            f"{'w:delText' if tag == TEXT_TAG else 'w:delInstrText'})"
+        ))
+    elif tag in (DEL_TEXT_TAG, DEL_INSTR_TAG) and not deleted_depth:
+        problems.append(Problem('error', name, f"{_short(tag)} outside a deletion"))
+
+    if tag == f'{{{W}}}commentRangeStart':
+        ranges['start'].append(elem.get(ID))
+    elif tag == f'{{{W}}}commentRangeEnd':
+        ranges['end'].append(elem.get(ID))
+    elif tag == f'{{{W}}}commentReference':
+        ranges['ref'].append(elem.get(ID))
+    elif tag == f'{{{W}}}comment' and name == 'word/comments.xml':
+        cid = elem.get(ID)
+        if cid in state['comment_ids']:
+            problems.append(Problem('error', name, f"duplicate comment id {cid}"))
+        state['comment_ids'].add(cid)
+    return opens_deletion
+
+
+def _short(tag):
+    if tag is None:
+        return 'document root'
+    return 'w:' + tag.rsplit('}', 1)[-1] if tag.startswith(f'{{{W}}}') else tag
+
+
+def check_comments(state, problems):
+    """Match comment ranges and references against comments.xml."""
+    referenced = set()
+    for name, r in state['ranges'].items():
+        starts, ends, refs = r['start'], r['end'], r['ref']
+        for label, ids in (('commentRangeStart', starts), ('commentRangeEnd', ends)):
+            seen = set()
+            for cid in ids:
+                if cid in seen:
+                    problems.append(Problem('error', name, f"duplicate {label} id={cid}"))
+                seen.add(cid)
+        for cid in sorted(set(starts) - set(ends), key=str):
+            problems.append(Problem('error', name, f"commentRangeStart id={cid} has no end"))
+        for cid in sorted(set(ends) - set(starts), key=str):
+            problems.append(Problem('error', name, f"commentRangeEnd id={cid} has no start"))
+        for cid in sorted(set(starts) - set(refs), key=str):
+            problems.append(Problem('error', name, f"comment range id={cid} has no commentReference"))
+        for cid in refs:
+            if cid not in state['comment_ids']:
+                problems.append(Problem('error', name, f"commentReference id={cid} has no comment"))
+        referenced.update(refs)
+    for cid in sorted(state['comment_ids'] - referenced, key=str):
+        problems.append(Problem('warning', 'word/comments.xml', f"comment id={cid} is never referenced"))
+
+
+def validate_docx(docx_path):
+    """Validate a .docx package; return a list of Problems (empty if clean)."""
+    problems = []
+    state = {'revision_ids': {}, 'comment_ids': set(), 'ranges': {}}
+    try:
+        z = zipfile.ZipFile(docx_path, 'r')
+    except zipfile.BadZipFile as e:
+        return [Problem('error', docx_path, f"not a ZIP package: {e}")]
+    with z:
+        check_package(z, problems)
+        for name in z.namelist():
+            if name.endswith('.xml') or name.endswith('.rels'):
+                scan_part(z, name, state, problems)
+        check_comments(state, problems)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a .docx package for structural errors.")
+    parser.add_argument("docx", help=".docx to validate")
+    parser.add_argument("--quiet", action="store_true", help="print errors only")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.docx):
+        print(f"Error: file not found: {args.docx}")
+        return 1
+
+    problems = validate_docx(args.docx)
+    errors = [p for p in problems if p.severity == 'error']
+    for p in problems:
+        if p.severity == 'error' or not args.quiet:
+            print(f"  {p.severity.upper()}: {p.part}: {p.message}")
+    warnings = len(problems) - len(errors)
+    print(f"{'OK' if not errors else 'INVALID'}: {len(errors)} error(s), {warnings} warning(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Tests for chunk_document.py chunk budgets and findings merge."""
+
+import json
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from chunk_document import (  # noqa: E402
+    build_chunks, estimate_tokens, merge_findings, split_document,
+)
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.mark.parametrize('max_tokens', [500, 2000, 8000])
+def test_chunks_stay_under_budget(paragraphs, max_tokens):
+    chunks = build_chunks(paragraphs, max_tokens)
+    for chunk in chunks:
+        assert sum(estimate_tokens(p['text']) for p, _ in chunk) <= max_tokens
+
+
+@pytest.mark.parametrize('max_tokens', [500, 2000])
+def test_every_paragraph_owned_once_in_order(paragraphs, max_tokens):
+    owned = [p['locator'] for chunk in build_chunks(paragraphs, max_tokens)
+             for p, is_overlap in chunk if not is_overlap]
+    assert owned == [p['locator'] for p in paragraphs if p['text'].strip()]
+
+
+def _write_chunk_findings(chunk_dir, chunk_id, findings):
+    path = os.path.join(chunk_dir, f'chunk_{chunk_id:03d}.findings.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        for finding in findings:
+            f.write(json.dumps(finding) + '\n')
+
+
+def test_merge_keeps_same_edit_in_other_paragraphs(tmp_path):
+    chunk_dir = str(tmp_path)
+    manifest = split_document(TEST1, chunk_dir, max_tokens=2000)
+    first, second = manifest['chunks'][:2]
+    overlap = next(p for p in second['paragraphs'] if p['overlap'])
+    repeated = {'type': 'tracked_change', 'category': 'style', 'comment': '',
+                'old_text': 'As a result', 'new_text': 'Consequently'}
+    seen_twice = {'type': 'comment_only', 'category': 'clarity', 'comment': 'Define.',
+                  'anchor_text': overlap['text'][:30]}
+    _write_chunk_findings(chunk_dir, first['id'], [repeated, seen_twice])
+    _write_chunk_findings(chunk_dir, second['id'], [repeated, seen_twice])
+
+    merged, dropped = merge_findings(chunk_dir)
+
+    assert dropped == 1
+    edits = [f for f in merged if f['type'] == 'tracked_change']
+    assert len(edits) == 2
+    corpus = '\n'.join(p['text'] for p in read_story_paragraphs(TEST1))
+    for edit in edits:
+        assert corpus.count(edit['old_text']) == 1
+        assert 'As a result' in edit['old_text']
+        assert edit['new_text'] == edit['old_text'].replace('As a result', 'Consequently')
@@ -0,0 +1,50 @@
+"""Tests for delta.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from delta import changed_paragraphs, delta_runs, render_delta  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.fixture()
+def revised(paragraphs):
+    """test1 with one body paragraph edited and a new one after it."""
+    new = [dict(p) for p in paragraphs]
+    edited = next(i for i, p in enumerate(new)
+                  if p['level'] is None and not p['toc'] and len(p['text'].split()) > 30)
+    new[edited]['text'] = 'In short, ' + new[edited]['text']
+    new.insert(edited + 1, dict(new[edited], text='A paragraph added in revision.'))
+    return new, edited
+
+
+def test_same_version_has_no_delta(paragraphs):
+    assert changed_paragraphs(paragraphs, paragraphs) == ({}, 0)
+
+
+def test_edited_and_added_paragraphs(paragraphs, revised):
+    new, edited = revised
+    status, deleted = changed_paragraphs(paragraphs, new)
+    assert status == {edited: 'changed', edited + 1: 'new'}
+    assert deleted == 0
+
+    runs = delta_runs(new, status)
+    assert len(runs) == 1
+    roles = dict(runs[0])
+    assert roles[edited] == 'changed' and roles[edited + 1] == 'new'
+    assert 'heading' in roles.values() and 'context' in roles.values()
+    markdown = render_delta(new, runs, 'old.docx', 'new.docx', deleted)
+    assert f"[{new[edited]['locator']}]" in markdown
+    assert 'A paragraph added in revision. <!-- new -->' in markdown
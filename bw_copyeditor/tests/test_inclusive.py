@@ -0,0 +1,40 @@
+"""Tests for inclusive.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from inclusive import find_lexicon_matches, find_lexicon_path, load_lexicon  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+def _found(paragraphs, lexicon):
+    return [(m['para'], paragraphs[m['para']]['text'][m['start']:m['end']], m['comment'])
+            for m in find_lexicon_matches(paragraphs, lexicon)]
+
+
+def test_deficit_language_flagged(paragraphs):
+    found = _found(paragraphs, load_lexicon(find_lexicon_path(), None))
+    assert found
+    assert all(comment.startswith('Inclusive Language') for _, _, comment in found)
+    assert any(text.startswith('low-income') and 'low-income households' in comment
+               for _, text, comment in found)
+
+
+def test_cached_lexicon_matches_the_same(paragraphs, tmp_path):
+    path = find_lexicon_path()
+    compiled = load_lexicon.__wrapped__(path, str(tmp_path))
+    assert [n.name for n in tmp_path.iterdir()][0].startswith('inclusive-')
+    cached = load_lexicon.__wrapped__(path, str(tmp_path))
+    assert _found(paragraphs, cached) == _found(paragraphs, compiled)
@@ -0,0 +1,60 @@
+"""Tests for outline.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import build_outline  # noqa: E402
+from outline import (  # noqa: E402
+    format_outline, outline_findings, outline_matches, read_outline, toc_matches,
+)
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_outline(TEST1)
+
+
+@pytest.fixture(scope='module')
+def outline(paragraphs):
+    return build_outline(paragraphs)
+
+
+def test_outline_nests_under_title(paragraphs, outline):
+    assert (outline[0]['level'], outline[0]['text']) == (0, 'Formulating Success')
+    for entry in outline[1:]:
+        parent = outline[entry['parent']]
+        assert parent['level'] < entry['level']
+        assert parent['para'] < entry['para'] < entry['end'] <= parent['end']
+    assert f"[{paragraphs[outline[1]['para']]['locator']}]" in format_outline(paragraphs,
+                                                                              outline)
+
+
+def test_inconsistent_heading_and_stale_toc_line(paragraphs, outline):
+    headings = outline_matches(paragraphs, outline)
+    assert [paragraphs[m['para']]['text'] for m in headings] == ['Questions to Consider']
+    assert 'closing punctuation' in headings[0]['comment']
+
+    contents = toc_matches(paragraphs, outline)
+    assert [paragraphs[m['para']]['text'][m['start']:m['end']] for m in contents] == [
+        'Design Considerations For Outcomes-Based Models']
+    assert paragraphs[contents[0]['para']]['toc']
+
+
+def test_findings_land_on_their_lines(paragraphs, outline):
+    findings, dropped = outline_findings(paragraphs, outline,
+                                         outline_matches(paragraphs, outline),
+                                         toc_matches(paragraphs, outline))
+    assert dropped == 0
+    heading, contents = findings
+    # The heading's text is also a contents line, so it is scoped to its section
+    assert heading['anchor_text'] == 'Questions to Consider'
+    assert heading['all_occurrences'] and heading['section'] == 'Questions to Consider'
+    corpus = '\n'.join(p['text'] for p in paragraphs)
+    assert corpus.count(contents['anchor_text']) == 1
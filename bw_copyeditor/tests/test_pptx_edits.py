@@ -0,0 +1,92 @@
+"""Tests for pptx_edits.py on a deck built from the test1 headings."""
+
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+HERE = os.path.dirname(__file__)
+SKILL = os.path.join(HERE, os.pardir, 'current skill (unpacked)')
+sys.path.insert(0, SKILL)
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from pptx_edits import deck_to_markdown  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+PML = 'application/vnd.openxmlformats-officedocument.presentationml'
+NS = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+      'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+      'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+OFFICE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _slide(title, body):
+    shapes = ''.join(
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{n}" name="Text {n}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+        f'<p:spPr/><p:txBody><a:bodyPr/><a:p><a:r><a:t>{_escape(text)}</a:t></a:r></a:p>'
+        f'</p:txBody></p:sp>'
+        for n, text in ((2, title), (3, body)))
+    return f'<p:sld {NS}><p:cSld><p:spTree>{shapes}</p:spTree></p:cSld></p:sld>'
+
+
+def build_deck(path, slides):
+    """Write a minimal deck with one slide per (title, body)."""
+    overrides = ''.join(
+        f'<Override PartName="/ppt/slides/slide{n}.xml" ContentType="{PML}.slide+xml"/>'
+        for n in range(1, len(slides) + 1))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml',
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/'
+                   'vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   f'<Override PartName="/ppt/presentation.xml" '
+                   f'ContentType="{PML}.presentation.main+xml"/>{overrides}</Types>')
+        z.writestr('_rels/.rels',
+                   f'<Relationships xmlns="{RELS}"><Relationship Id="rId1" '
+                   f'Type="{OFFICE}/officeDocument" Target="ppt/presentation.xml"/>'
+                   '</Relationships>')
+        ids = ''.join(f'<p:sldId id="{255 + n}" r:id="rId{n}"/>'
+                      for n in range(1, len(slides) + 1))
+        z.writestr('ppt/presentation.xml',
+                   f'<p:presentation {NS}><p:sldIdLst>{ids}</p:sldIdLst></p:presentation>')
+        rels = ''.join(f'<Relationship Id="rId{n}" Type="{OFFICE}/slide" '
+                       f'Target="slides/slide{n}.xml"/>' for n in range(1, len(slides) + 1))
+        z.writestr('ppt/_rels/presentation.xml.rels',
+                   f'<Relationships xmlns="{RELS}">{rels}</Relationships>')
+        for n, (title, body) in enumerate(slides, 1):
+            z.writestr(f'ppt/slides/slide{n}.xml', _slide(title, body))
+
+
+def test_deck_edit_and_comment(tmp_path):
+    paragraphs = read_story_paragraphs(TEST1)
+    slides = [(p['text'], paragraphs[i + 1]['text']) for i, p in enumerate(paragraphs)
+              if p['level'] == 1 and not p['toc'] and paragraphs[i + 1]['text']][:3]
+    deck, output = tmp_path / 'deck.pptx', tmp_path / 'out.pptx'
+    build_deck(deck, slides)
+    title = slides[1][0]
+    findings = tmp_path / 'findings.jsonl'
+    findings.write_text(json.dumps({
+        'type': 'tracked_change', 'category': 'Style', 'comment': 'Lowercase.',
+        'old_text': title, 'new_text': title.lower()}) + '\n', encoding='utf-8')
+
+    run = subprocess.run([sys.executable, os.path.join(SKILL, 'apply_copyedits.py'), str(deck),
+                          str(findings), str(output), '--deterministic'],
+                         capture_output=True, text=True)
+    assert run.returncode == 0, run.stdout + run.stderr
+
+    with zipfile.ZipFile(output) as z:
+        assert z.testzip() is None
+        comments = [n for n in z.namelist() if n.startswith('ppt/comments/')]
+        assert len(comments) == 1
+        assert title in z.read(comments[0]).decode('utf-8')
+    markdown = deck_to_markdown(str(output))
+    assert title.lower() in markdown and title not in markdown
+    assert slides[0][0] in markdown
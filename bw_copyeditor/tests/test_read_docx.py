@@ -0,0 +1,30 @@
+"""Tests for read_docx.py markdown rendering."""
+
+import os
+import re
+import sys
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from read_docx import docx_to_markdown  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+def test_headings_render_at_their_level():
+    lines = docx_to_markdown(TEST1).splitlines()
+    assert lines[0] == '# Formulating Success'
+    assert '# Introduction' in lines
+    assert ('## Outcomes-based funding models differ significantly from '
+            'traditional models.') in lines
+
+
+def test_locators_name_story_paragraphs_in_order():
+    paragraphs = read_story_paragraphs(TEST1)
+    order = {p['locator']: i for i, p in enumerate(paragraphs)}
+    locators = re.findall(r'^\[(\w+:\d+)\] ', docx_to_markdown(TEST1, locators=True), re.M)
+    assert locators
+    assert [order[loc] for loc in locators] == sorted(order[loc] for loc in locators)
+    assert any(loc.startswith('footnotes:') for loc in locators)
@@ -0,0 +1,49 @@
+"""Tests for readability.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from readability import (  # noqa: E402
+    DEFAULT_LONG_SENTENCE, analyze, document_totals, outlier_matches, section_metrics,
+)
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.fixture(scope='module')
+def analysis(paragraphs):
+    return analyze(paragraphs)
+
+
+def test_sections_follow_headings(analysis):
+    sections, rows = analysis
+    headings = [s['heading'] for s in sections]
+    assert headings[:2] == ['Formulating Success', 'Introduction']
+    totals = section_metrics(document_totals(sections))
+    assert totals['words'] == sum(s['words'] for s in sections) == sum(r['words'] for r in rows)
+    assert totals['longest_sentence'] == max(max(s['lengths']) for s in sections)
+    assert 0 < totals['grade'] < 25
+
+
+def test_long_sentences_flagged(paragraphs, analysis):
+    sections, rows = analysis
+    matches = outlier_matches(paragraphs, rows)
+    dense = {m['para'] for m in matches if m['rule'] == 'dense-paragraph'}
+    long = [(m['para'], m['start']) for m in matches if m['rule'] == 'long-sentence']
+    # A dense paragraph gets one comment in place of its long-sentence ones
+    assert long == [(r['para'], start) for r in rows if r['para'] not in dense
+                    for start, _, _ in r['long']]
+    assert all(count > DEFAULT_LONG_SENTENCE for r in rows for _, _, count in r['long'])
+    assert sum(len(r['long']) for r in rows) == sum(s['long'] for s in sections)
+    assert all(m['new'] is None and m['category'] == 'Clarity' for m in matches)
@@ -0,0 +1,44 @@
+"""Tests for repetition.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from repetition import find_repetitions  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.fixture(scope='module')
+def flagged(paragraphs):
+    return [(m, paragraphs[m['para']]['text'][m['start']:m['end']])
+            for m in find_repetitions(paragraphs)]
+
+
+def test_known_repeats_flagged(flagged):
+    texts = {text for _, text in flagged}
+    assert {'lack of clarity', 'harder to quantify', 'billion'} <= texts
+
+
+def test_second_use_is_flagged(paragraphs, flagged):
+    for m, text in flagged:
+        before = '\n'.join(p['text'] for p in paragraphs[:m['para']])
+        before += '\n' + paragraphs[m['para']]['text'][:m['start']]
+        assert text.lower() in before.lower()
+
+
+def test_topic_terms_and_comments(flagged):
+    assert 'funding' not in {text.lower() for _, text in flagged}
+    for m, _ in flagged:
+        assert m['new'] is None
+        assert m['comment'].startswith('Repetition: ')
@@ -0,0 +1,60 @@
+"""Tests for resolve_changes.py verify."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+SKILL = os.path.join(HERE, os.pardir, 'current skill (unpacked)')
+sys.path.insert(0, SKILL)
+
+from apply_copyedits import parse_findings, read_journal  # noqa: E402
+from resolve_changes import verify_output  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+FINDINGS = [
+    {'type': 'tracked_change', 'category': 'Style', 'comment': 'Tighter.',
+     'old_text': 'reward improvements. As a result, these',
+     'new_text': 'reward improvements. Consequently, these'},
+    {'type': 'tracked_change', 'category': 'Grammar', 'comment': 'Not in the text.',
+     'old_text': 'a sentence this report never contains', 'new_text': 'anything'},
+]
+
+
+@pytest.fixture(scope='module')
+def applied(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp('verify')
+    findings_path = tmp / 'findings.jsonl'
+    findings_path.write_text(''.join(json.dumps(f) + '\n' for f in FINDINGS))
+    output, journal = tmp / 'out.docx', tmp / 'edits.jsonl'
+    subprocess.run([sys.executable, os.path.join(SKILL, 'apply_copyedits.py'), TEST1,
+                    str(findings_path), str(output), '--deterministic',
+                    '--journal', str(journal)], capture_output=True)
+    return str(output), parse_findings(str(findings_path)), read_journal(str(journal))
+
+
+def test_failed_edit_reported_with_journal(applied):
+    output, findings, journal = applied
+    mismatches, missing = verify_output(TEST1, output, findings, journal)
+    assert mismatches == []
+    assert [(where, text) for where, _, text in missing] == [
+        ('failed', FINDINGS[1]['old_text'])]
+
+
+def test_edit_checked_where_journal_says(applied):
+    output, findings, journal = applied
+    journal = json.loads(json.dumps(journal))
+    journal[0]['edits'][0]['new'] += 'ly'
+    _, missing = verify_output(TEST1, output, findings, journal)
+    where = f"{journal[0]['edits'][0]['part']}:{journal[0]['edits'][0]['paragraph']}"
+    assert (where, 'Style', FINDINGS[0]['old_text']) in missing
+
+
+def test_failed_edit_reported_without_journal(applied):
+    output, findings, _ = applied
+    _, missing = verify_output(TEST1, output, findings)
+    assert missing == [(None, 'Grammar', 'anything')]
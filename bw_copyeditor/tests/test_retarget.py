@@ -0,0 +1,79 @@
+"""Regression tests for retarget.py span mapping and version alignment."""
+
+import os
+import sys
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from retarget import align_versions, offset_map, retarget, retarget_finding  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+def carry(finding, old, new):
+    return retarget_finding(finding, [old], [new], {0: 0}, new)
+
+
+def test_end_offset_stays_before_inserted_text():
+    convert = offset_map('teh budget', 'teh annual budget')
+    assert convert(3, end=True) == 3
+    assert convert(3) == 10
+    assert convert(10, end=True) == 17
+
+
+def test_change_survives_insertion_after_it():
+    finding = {'type': 'tracked_change', 'old_text': 'teh budget',
+               'new_text': 'the budget'}
+    status, moved = carry(finding, 'teh budget', 'teh annual budget')
+    assert status == 'retargeted'
+    assert 'teh' in moved['old_text']
+    assert moved['new_text'] == moved['old_text'].replace('teh', 'the')
+
+
+def test_insertion_orphaned_when_neighbours_change():
+    finding = {'type': 'tracked_change', 'old_text': 'funds colleges',
+               'new_text': 'funds all colleges'}
+    status, _ = carry(finding, 'funds colleges', 'funds many colleges')
+    assert status == 'orphaned'
+
+
+def test_finding_unchanged_when_paragraph_edited_elsewhere():
+    finding = {'type': 'tracked_change', 'old_text': 'funds colleges',
+               'new_text': 'funds all colleges'}
+    status, carried = carry(finding, 'The state funds colleges.',
+                            'Today the state funds colleges.')
+    assert status == 'unchanged'
+    assert carried == finding
+
+
+def test_insertion_retargeted_when_neighbours_kept():
+    finding = {'type': 'tracked_change', 'old_text': 'funds colleges and universities',
+               'new_text': 'funds all colleges and universities'}
+    status, moved = carry(finding, 'The state funds colleges and universities.',
+                          'The state funds colleges and some universities.')
+    assert status == 'retargeted'
+    assert 'funds colleges' in moved['old_text']
+    assert moved['new_text'] == moved['old_text'].replace('funds', 'funds all')
+
+
+def test_align_versions_on_test1():
+    old = read_story_paragraphs(TEST1)
+    new = [dict(p) for p in old]
+    edited = next(i for i, p in enumerate(new) if len(p['text'].split()) > 20)
+    new[edited]['text'] = 'In short, ' + new[edited]['text']
+    del new[edited + 1]
+    mapping = align_versions(old, new)
+    assert mapping[edited] == edited
+    assert edited + 1 not in mapping
+    assert mapping[edited + 2] == edited + 1
+
+
+def test_same_version_leaves_findings_unchanged():
+    findings = [{'type': 'tracked_change', 'category': 'Style', 'comment': '',
+                 'old_text': 'reward improvements. As a result, these',
+                 'new_text': 'reward improvements. Consequently, these'}]
+    kept, orphaned, counts = retarget(TEST1, TEST1, findings)
+    assert counts == {'unchanged': 1, 'retargeted': 0, 'orphaned': 0}
+    assert kept == findings and orphaned == []
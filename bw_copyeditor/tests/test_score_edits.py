@@ -0,0 +1,32 @@
+"""Tests for score_edits.py on the test1 benchmark."""
+
+import os
+import sys
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from score_edits import format_report, score  # noqa: E402
+
+FOLDER = os.path.join(HERE, 'test1_Formulating Success pub')
+SOURCE = os.path.join(FOLDER, 'test1.docx')
+HUMAN = os.path.join(FOLDER, 'test1_humans.docx')
+SHEET = os.path.join(FOLDER, 'test1_human edits.csv')
+SKILL = os.path.join(FOLDER, 'v2.1 results', 'output.docx')
+
+
+def test_benchmark_matches_itself():
+    result = score(HUMAN, HUMAN, SOURCE, SHEET)
+    assert result['skill']['total'] == result['human']['total']
+    assert result['unique'] == 0
+    assert result['matching_human'] == result['human']['total']
+
+
+def test_skill_output_scored_against_benchmark():
+    result = score(SKILL, HUMAN, SOURCE, SHEET)
+    assert result['matching_human'] + result['unique'] == result['skill']['total']
+    assert 0 < result['matching_human'] < result['skill']['total']
+    for taken, caught in result['recall'].values():
+        assert 0 <= caught <= taken
+    assert sum(taken for taken, _ in result['recall'].values()) == result['human']['accepted']
+    assert 'Edit Volume' in format_report(result)
@@ -0,0 +1,70 @@
+"""Tests for spelling.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from spelling import WORD_RE, load_dictionary, spelling_matches  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.fixture()
+def with_typo(paragraphs):
+    """test1 with one "institutions" misspelled."""
+    edited = [dict(p) for p in paragraphs]
+    i = next(i for i, p in enumerate(edited)
+             if p['level'] is None and 'institutions' in p['text'])
+    edited[i]['text'] = edited[i]['text'].replace('institutions', 'instituitons', 1)
+    return edited, i
+
+
+@pytest.fixture()
+def dictionary(paragraphs, tmp_path):
+    """A word list of test1's own vocabulary, compiled into tmp_path."""
+    words = {w.lower() for p in paragraphs for w in WORD_RE.findall(p['text'])}
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(sorted(words)), encoding='utf-8')
+    return load_dictionary([str(path)], str(tmp_path / 'cache'))
+
+
+def _changes(paragraphs, matches):
+    return [(m['para'], paragraphs[m['para']]['text'][m['start']:m['end']], m['new'])
+            for m in matches if m['new'] is not None]
+
+
+def test_clean_fixture_has_no_corrections(paragraphs, dictionary):
+    matches, checked = spelling_matches(paragraphs, dictionary)
+    assert checked > 1000
+    assert _changes(paragraphs, matches) == []
+
+
+def test_typo_corrected_with_dictionary(with_typo, dictionary):
+    paragraphs, i = with_typo
+    matches, _ = spelling_matches(paragraphs, dictionary)
+    assert _changes(paragraphs, matches) == [(i, 'instituitons', 'institutions')]
+
+
+def test_typo_corrected_from_document_vocabulary(with_typo):
+    paragraphs, i = with_typo
+    matches, _ = spelling_matches(paragraphs, None)
+    assert (i, 'instituitons', 'institutions') in _changes(paragraphs, matches)
+
+
+def test_compiled_dictionary_reused(paragraphs, dictionary, tmp_path):
+    cache = tmp_path / 'cache'
+    compiled = list(cache.iterdir())
+    assert len(compiled) == 1
+    again = load_dictionary([str(tmp_path / 'words.txt')], str(cache))
+    assert list(cache.iterdir()) == compiled
+    assert len(again) == len(dictionary) and 'institutions' in again
@@ -0,0 +1,62 @@
+"""Tests for structure.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from structure import (  # noqa: E402
+    anchored_findings, bracket_matches, captions, note_matches, numbering_matches,
+    read_structure,
+)
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def structure():
+    return read_structure(TEST1)
+
+
+def _flagged(paragraphs, matches):
+    return [(m['para'], paragraphs[m['para']]['text'][m['start']:m['end']]) for m in matches]
+
+
+def test_every_footnote_referenced_once(structure):
+    paragraphs, notes = structure
+    assert len(notes['footnotes']) > 20
+    assert note_matches(paragraphs, notes) == []
+
+
+def test_fixture_slips_found(structure):
+    paragraphs, _ = structure
+    assert any(text.endswith(')') for _, text in _flagged(paragraphs, bracket_matches(paragraphs)))
+    assert [(label, number) for _, label, number, _ in captions(paragraphs)
+            if label == 'Sidebar'] == [('Sidebar', '1'), ('Sidebar', None)]
+    (_, text), = _flagged(paragraphs, numbering_matches(paragraphs))
+    assert text.strip() == 'Sidebar'
+
+
+def test_unclosed_parenthesis_flagged(structure):
+    paragraphs, _ = structure
+    edited = [dict(p) for p in paragraphs]
+    i = next(i for i, p in enumerate(edited)
+             if p['level'] is None and not p['toc'] and len(p['text']) > 200
+             and not any(c in p['text'] for c in '()'))
+    edited[i]['text'] = edited[i]['text'][:100] + '(' + edited[i]['text'][100:]
+    assert any(m['para'] == i and m['start'] == 100 and 'never closed' in m['comment']
+               for m in bracket_matches(edited))
+
+
+def test_findings_anchor_uniquely(structure):
+    paragraphs, _ = structure
+    matches = bracket_matches(paragraphs) + numbering_matches(paragraphs)
+    findings, dropped = anchored_findings(paragraphs, matches)
+    corpus = '\n'.join(p['text'] for p in paragraphs)
+    assert len(findings) + dropped == len(matches)
+    for finding in findings:
+        assert finding['type'] == 'comment_only'
+        assert corpus.count(finding['anchor_text']) == 1
@@ -0,0 +1,42 @@
+"""Tests for style_rules.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import build_findings, read_story_paragraphs  # noqa: E402
+from style_rules import find_rule_matches  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+def test_known_issues_found(paragraphs):
+    hits = {(paragraphs[m['para']]['text'][m['start']:m['end']], m['new'])
+            for m in find_rule_matches(paragraphs)}
+    assert ('extant', 'existing') in hits
+    assert ('FOR SUPER COPY EDITORS', None) in hits
+    assert ('move the needle', None) in hits
+
+
+def test_contractions_only_for_publications(paragraphs):
+    def rules(deliverable):
+        return {m['rule'] for m in find_rule_matches(paragraphs, deliverable)}
+    assert 'contraction-not' in rules('publication')
+    assert 'contraction-not' not in rules('blog')
+
+
+def test_findings_target_unique_text(paragraphs):
+    corpus = '\n'.join(p['text'] for p in paragraphs)
+    findings = build_findings(paragraphs, find_rule_matches(paragraphs))
+    for finding in findings:
+        if finding['type'] == 'tracked_change':
+            assert corpus.count(finding['old_text']) == 1
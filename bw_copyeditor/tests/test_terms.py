@@ -0,0 +1,50 @@
+"""Tests for terms.py on the test1 fixture."""
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import read_story_paragraphs  # noqa: E402
+from terms import acronym_findings, build_index, term_findings  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+
+@pytest.fixture(scope='module')
+def paragraphs():
+    return read_story_paragraphs(TEST1)
+
+
+@pytest.fixture(scope='module')
+def index(paragraphs):
+    return build_index(paragraphs)
+
+
+def _text(paragraphs, m):
+    return paragraphs[m['para']]['text'][m['start']:m['end']]
+
+
+def test_acronym_definitions_and_uses(paragraphs, index):
+    _, acronyms = index
+    (para, start, end), = acronyms['IHE']['definitions']
+    assert 'IHE' in paragraphs[para]['text'][start:end]
+    assert all((p, s) > (para, start) for p, s, _ in acronyms['IHE']['uses'])
+
+
+def test_acronym_findings(paragraphs, index):
+    _, acronyms = index
+    found = {(m['rule'], _text(paragraphs, m)) for m in acronym_findings(paragraphs, acronyms)}
+    assert ('acronym-redefined', '(FTE)') in found
+    assert any(rule == 'acronym-unused' and 'OBF' in text for rule, text in found)
+    assert not any('IHE' in text for _, text in found)
+
+
+def test_inconsistent_spellings_flagged(paragraphs, index):
+    terms, _ = index
+    flagged = {_text(paragraphs, m): m['comment'] for m in term_findings(terms)}
+    assert 'multiyear' in flagged
+    assert '"multi-year"' in flagged['multiyear']
@@ -0,0 +1,47 @@
+"""Tests for validate_docx.py on the test1 fixture."""
+
+import os
+import sys
+import zipfile
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from validate_docx import validate_docx  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+
+BAD_REVISIONS = (b'<w:ins w:id="90001" w:author="A"><w:r><w:t>new</w:t></w:r></w:ins>'
+                 b'<w:del w:id="90001" w:author="A"><w:r><w:t>old</w:t></w:r></w:del>')
+
+
+def _copy_with(path, replace):
+    """Copy test1 to path, passing each entry's bytes through replace(name, data)."""
+    with zipfile.ZipFile(TEST1) as zin, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = replace(info.filename, zin.read(info.filename))
+            if data is not None:
+                zout.writestr(info, data)
+    return str(path)
+
+
+def test_fixture_is_clean():
+    assert validate_docx(TEST1) == []
+
+
+def test_revision_errors_reported(tmp_path):
+    def inject(name, data):
+        if name == 'word/document.xml':
+            return data.replace(b'</w:body>', b'<w:p>' + BAD_REVISIONS + b'</w:p></w:body>', 1)
+        return data
+    messages = [p.message for p in validate_docx(_copy_with(tmp_path / 'bad.docx', inject))
+                if p.severity == 'error']
+    assert any('90001' in m for m in messages)
+    assert any('w:t' in m for m in messages)
+
+
+def test_missing_part_reported(tmp_path):
+    path = _copy_with(tmp_path / 'missing.docx',
+                      lambda name, data: None if name == 'word/styles.xml' else data)
+    problems = validate_docx(path)
+    assert any(p.severity == 'error' and 'styles.xml' in p.message for p in problems)
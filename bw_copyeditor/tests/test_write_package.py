@@ -0,0 +1,40 @@
+"""Round-trip tests for apply_copyedits.write_package."""
+
+import os
+import sys
+import zipfile
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'current skill (unpacked)'))
+
+from apply_copyedits import etree, write_package  # noqa: E402
+from validate_docx import validate_docx  # noqa: E402
+
+TEST1 = os.path.join(HERE, 'test1_Formulating Success pub', 'test1.docx')
+DATE_TIME = (2020, 1, 1, 0, 0, 0)
+
+
+def _rewrite(tmp_path, workers):
+    work_dir = tmp_path / 'work'
+    with zipfile.ZipFile(TEST1) as z:
+        names = z.namelist()
+        z.extractall(work_dir)
+    parts = {'word/document.xml': etree.parse(str(work_dir / 'word' / 'document.xml'))}
+    output = tmp_path / f'out{workers}.docx'
+    write_package(str(output), str(work_dir), names, DATE_TIME, parts, workers=workers)
+    return output, names
+
+
+def test_package_round_trips(tmp_path):
+    output, names = _rewrite(tmp_path, workers=4)
+    with zipfile.ZipFile(output) as z:
+        assert z.testzip() is None
+        assert z.namelist() == names
+        assert {info.date_time for info in z.infolist()} == {DATE_TIME}
+    assert validate_docx(str(output)) == []
+
+
+def test_output_does_not_depend_on_workers(tmp_path):
+    serial, _ = _rewrite(tmp_path, workers=1)
+    parallel, _ = _rewrite(tmp_path, workers=4)
+    assert serial.read_bytes() == parallel.read_bytes()